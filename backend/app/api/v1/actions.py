@@ -5,6 +5,7 @@ from typing import List
 from uuid import UUID
 
 from ...database import get_db
+from ...instrumentation import query_budget
 from ...models import CookingAction
 from ...schemas import CookingActionResponse
 
@@ -12,6 +13,7 @@ router = APIRouter()
 
 
 @router.get("/", response_model=List[CookingActionResponse])
+@query_budget(1)
 async def list_actions(
     category: str = None,
     skip: int = 0,
@@ -29,6 +31,7 @@ async def list_actions(
 
 
 @router.get("/{action_id}", response_model=CookingActionResponse)
+@query_budget(1)
 async def get_action(action_id: UUID, db: Session = Depends(get_db)):
     """Get cooking action by ID"""
     action = db.query(CookingAction).filter(CookingAction.id == action_id).first()
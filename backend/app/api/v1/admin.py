@@ -0,0 +1,43 @@
+"""Admin API endpoints"""
+import hmac
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+
+from ...config import settings
+from ...database import get_db
+from ...instrumentation import query_budget
+from ...models import TaxonomyVersion
+from ...nlp.live import mark_version_seen, reload_all
+from ...schemas import TaxonomyReloadResponse
+
+router = APIRouter()
+
+
+def require_admin(x_admin_token: Optional[str] = Header(default=None)):
+    """Reject requests without the configured ADMIN_TOKEN (all requests if none is set)"""
+    if not settings.ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled")
+    if not x_admin_token or not hmac.compare_digest(x_admin_token, settings.ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+
+@router.post("/taxonomy/reload", response_model=TaxonomyReloadResponse, dependencies=[Depends(require_admin)])
+@query_budget(4)
+async def reload_taxonomy(db: Session = Depends(get_db)):
+    """
+    Rebuild the action matchers from the current taxonomy
+
+    Bumps the taxonomy version and reloads this worker right away; other
+    workers reload within NLP_TAXONOMY_POLL_SECONDS. Requests keep being
+    served from the previous matcher until the new one is swapped in.
+    """
+    version = TaxonomyVersion.bump(db)
+    db.commit()
+
+    mark_version_seen(version)
+    reloaded = await run_in_threadpool(reload_all)
+
+    return {"version": version, "reloaded": reloaded}
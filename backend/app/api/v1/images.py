@@ -0,0 +1,133 @@
+"""Image API endpoints - on-demand resizing of technique images"""
+import asyncio
+from pathlib import Path
+from typing import Dict, Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse
+from starlette.background import BackgroundTask
+from sqlalchemy.orm import Session
+
+from ...config import settings
+from ...database import get_db
+from ...images.cache import VariantCache
+from ...images.derivatives import FORMATS, resize_image
+from ...images.store import ImageStore
+from ...instrumentation import query_budget
+from ...models import CookingAction
+
+router = APIRouter()
+
+MEDIA_TYPES = {"webp": "image/webp", "jpeg": "image/jpeg"}
+
+# Variant cache and image store manifest (lazy loading)
+_cache = None
+_store = None
+
+
+class _ResizeLock:
+    """Lock for one cache key, with the number of requests holding or awaiting it"""
+    __slots__ = ("lock", "users")
+
+    def __init__(self):
+        self.lock = asyncio.Lock()
+        self.users = 0
+
+
+# One in-flight resize per cache key; an entry lives while any request uses it
+_resize_locks: Dict[str, _ResizeLock] = {}
+
+
+def get_cache() -> VariantCache:
+    """Lazy load the on-disk variant cache"""
+    global _cache
+    if _cache is None:
+        _cache = VariantCache(settings.IMAGE_CACHE_DIR, settings.IMAGE_CACHE_MAX_BYTES)
+    return _cache
+
+
+def get_store() -> ImageStore:
+    """Lazy load the image store manifest"""
+    global _store
+    if _store is None:
+        _store = ImageStore(Path(settings.STATIC_DIR) / "images" / "store")
+    return _store
+
+
+def _source_path(image_url: str) -> Optional[Path]:
+    """Map a /static/... image URL to its file under STATIC_DIR"""
+    if not image_url or not image_url.startswith("/static/"):
+        return None
+
+    static_dir = Path(settings.STATIC_DIR).resolve()
+    path = (static_dir / image_url[len("/static/"):]).resolve()
+    if static_dir not in path.parents or not path.is_file():
+        return None
+    return path
+
+
+@router.get("/{action_id}")
+@query_budget(1)
+async def get_action_image(
+    action_id: str,
+    w: int = Query(..., description="Target width in pixels (see IMAGE_ALLOWED_WIDTHS)"),
+    fmt: Literal["webp", "jpeg"] = "jpeg",
+    db: Session = Depends(get_db)
+):
+    """
+    Get a cooking action's image resized to a whitelisted width
+
+    The first request for a width/format resizes the source off the event
+    loop and stores it in the disk cache; later requests are served from it.
+    The variant stays pinned in the cache until the response has been sent.
+    """
+    allowed = settings.image_allowed_widths_list
+    if w not in allowed:
+        raise HTTPException(status_code=400, detail=f"Width must be one of {allowed}")
+
+    action = db.query(CookingAction).filter(CookingAction.id == action_id).first()
+    if not action:
+        raise HTTPException(status_code=404, detail="Cooking action not found")
+
+    _, ext = FORMATS[fmt]
+    store = get_store()
+    digest = store.digest_for_url(action.image_url)
+    if digest is not None:
+        # Store blobs never change, so the digest alone keys the variant
+        source = store.blob_path(digest)
+        key = f"{digest}-{w}w.{ext}"
+    else:
+        source = _source_path(action.image_url)
+        if source is None:
+            raise HTTPException(status_code=404, detail="Cooking action has no image")
+
+        # Key on the source's size and mtime so replaced images get fresh variants
+        stat = source.stat()
+        key = f"{source.stem}-{stat.st_mtime_ns:x}-{stat.st_size:x}-{w}w.{ext}"
+
+    cache = get_cache()
+    path = cache.get(key, pin=True)
+    if path is None:
+        entry = _resize_locks.get(key)
+        if entry is None:
+            entry = _resize_locks[key] = _ResizeLock()
+        entry.users += 1
+        try:
+            async with entry.lock:
+                path = cache.get(key, pin=True)
+                if path is None:
+                    path = await run_in_threadpool(
+                        cache.put, key, lambda dest: resize_image(source, dest, w, fmt), True
+                    )
+        finally:
+            entry.users -= 1
+            if entry.users == 0:
+                del _resize_locks[key]
+
+    return FileResponse(
+        path,
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Cache-Control": "public, max-age=86400"},
+        background=BackgroundTask(cache.unpin, key)
+    )
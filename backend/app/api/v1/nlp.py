@@ -1,37 +1,85 @@
 """NLP Testing API endpoints"""
+import logging
+
 from fastapi import APIRouter
+from fastapi.concurrency import run_in_threadpool
 
-from ...schemas import NLPExtractRequest, NLPExtractResponse
-from ...nlp import ActionExtractor, ActionMatcher
+from ...schemas import NLPBatchExtractRequest, NLPBatchExtractResponse, NLPExtractRequest, NLPExtractResponse
+from ...nlp import ActionExtractor, ActionMatcher, ExtractionBatcher
 from ...nlp.action_matcher import load_taxonomy_for_matcher
+from ...nlp.artifact import ArtifactError, load_matcher
+from ...nlp.live import LiveExtractor
 from ...config import settings
+from ...instrumentation import query_budget
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 
-# Initialize NLP components
-_extractor = None
 
-def get_extractor():
-    """Lazy load NLP extractor"""
-    global _extractor
-    if _extractor is None:
+def _build_matcher(use_artifact: bool) -> ActionMatcher:
+    """Matcher with taxonomy IDs, from the compiled artifact if it matches the taxonomy file"""
+    # The artifact is checked against the taxonomy file, so it is safe on reloads too
+    try:
+        return load_matcher(
+            settings.TAXONOMY_ARTIFACT_PATH,
+            ids="taxonomy",
+            fuzzy_max_distance=settings.NLP_FUZZY_MAX_DISTANCE,
+            taxonomy_path=settings.TAXONOMY_PATH
+        )
+    except ArtifactError as e:
+        logger.info("Taxonomy artifact unavailable (%s), parsing %s", e, settings.TAXONOMY_PATH)
         taxonomy_actions = load_taxonomy_for_matcher(settings.TAXONOMY_PATH)
-        matcher = ActionMatcher(taxonomy_actions)
-        _extractor = ActionExtractor(matcher, settings.SPACY_MODEL)
-    return _extractor
+        return ActionMatcher(taxonomy_actions, settings.NLP_FUZZY_MAX_DISTANCE)
+
+
+# NLP components (lazy loading, swapped on taxonomy reloads)
+_live = LiveExtractor("nlp", _build_matcher)
+
+
+def get_extractor() -> ActionExtractor:
+    """Current NLP extractor"""
+    return _live.get()
+
+
+def get_batcher() -> ExtractionBatcher:
+    """Micro-batching scheduler for single-text requests"""
+    return _live.batcher
 
 
 @router.post("/extract", response_model=NLPExtractResponse)
+@query_budget(0)
 async def extract_actions(request: NLPExtractRequest):
     """
     Test endpoint: Extract cooking actions from text
 
     This endpoint is for testing NLP extraction without creating a recipe.
+    Concurrent requests are batched together server-side.
     """
-    extractor = get_extractor()
-    extracted = extractor.extract_actions(request.text)
+    extraction = await get_batcher().extract(request.text)
 
     return {
         "text": request.text,
-        "extracted_actions": extracted
+        "extracted_actions": extraction.to_dicts()
+    }
+
+
+@router.post("/extract/batch", response_model=NLPBatchExtractResponse)
+@query_budget(0)
+async def extract_actions_batch(request: NLPBatchExtractRequest):
+    """
+    Extract cooking actions from many texts in one request
+
+    Texts are processed together (one spaCy nlp.pipe call for those that need
+    the full pipeline) and results are returned in input order.
+    """
+    extractor = get_extractor()
+    extracted = await run_in_threadpool(
+        extractor.extract_many, request.texts, settings.NLP_PIPE_BATCH_SIZE
+    )
+
+    return {
+        "results": [
+            {"text": text, "extracted_actions": extraction.to_dicts()}
+            for text, extraction in zip(request.texts, extracted)
+        ]
     }
@@ -1,62 +1,108 @@
 """Recipe API endpoints"""
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import or_, select
+from sqlalchemy.orm import Session, selectinload
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
 
 from ...database import get_db
-from ...models import Recipe, RecipeStep, CookingAction
-from ...schemas import RecipeCreate, RecipeResponse
-from ...nlp import ActionExtractor, ActionMatcher
+from ...instrumentation import query_budget
+from ...models import Recipe, RecipeStep, CookingAction, StepParse, TaxonomyVersion
+from ...schemas import RecipeCreate, RecipeImagesResponse, RecipeResponse
+from ...images.sprites import load_atlas
+from ...nlp import ActionExtractor, ActionMatcher, ExtractionBatcher
 from ...nlp.action_matcher import load_taxonomy_for_matcher
+from ...nlp.live import LiveExtractor
+from ...nlp.docstore import doc_to_bytes, pipeline_id, text_digest
+from ...nlp.packed import step_action_refs, store_step_actions
+from ...nlp.artifact import ArtifactError, load_matcher
 from ...config import settings
 import json
+import logging
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 
-# Initialize NLP components (lazy loading)
-_extractor = None
-
-def get_extractor(db: Session = None):
-    """Lazy load NLP extractor"""
-    global _extractor
-    if _extractor is None:
-        # Load actions from database to get real UUIDs
-        if db is None:
-            from ...database import SessionLocal
-            db = SessionLocal()
-            try:
-                actions_db = db.query(CookingAction).all()
-                taxonomy_actions = [
-                    {
-                        "id": action.id,  # Real UUID from database
-                        "canonical_name": action.canonical_name,
-                        "synonyms": action.synonyms or [],
-                        "category": action.category,
-                        "priority": action.priority or 1
-                    }
-                    for action in actions_db
-                ]
-            finally:
-                db.close()
-        else:
-            actions_db = db.query(CookingAction).all()
-            taxonomy_actions = [
-                {
-                    "id": action.id,
-                    "canonical_name": action.canonical_name,
-                    "synonyms": action.synonyms or [],
-                    "category": action.category,
-                    "priority": action.priority or 1
-                }
-                for action in actions_db
-            ]
+# Sprite atlas map from scripts/build_sprite_atlas.py (lazy loading)
+_atlas = None
+
+
+def get_atlas() -> Optional[dict]:
+    """Lazy load the technique sprite atlas map, if it has been built"""
+    global _atlas
+    if _atlas is None:
+        _atlas = load_atlas(Path(settings.STATIC_DIR) / "images" / "sprites" / "atlas.json")
+    return _atlas
+
+def _matcher_from_db() -> ActionMatcher:
+    """Build a matcher from CookingAction rows (no artifact compiled, or a reload)"""
+    from ...database import SessionLocal
+    db = SessionLocal()
+    try:
+        actions_db = db.query(CookingAction).all()
+    finally:
+        db.close()
+    taxonomy_actions = [
+        {
+            "id": action.id,  # Real UUID from database
+            "canonical_name": action.canonical_name,
+            "synonyms": action.synonyms or [],
+            "category": action.category,
+            "priority": action.priority or 1
+        }
+        for action in actions_db
+    ]
+    return ActionMatcher(taxonomy_actions, settings.NLP_FUZZY_MAX_DISTANCE)
+
+
+def _taxonomy_state() -> Tuple[int, List[str]]:
+    """Current TaxonomyVersion and every CookingAction ID"""
+    from ...database import SessionLocal
+    db = SessionLocal()
+    try:
+        return TaxonomyVersion.current(db), [str(action_id) for action_id, in db.query(CookingAction.id)]
+    finally:
+        db.close()
+
+
+def _build_matcher(use_artifact: bool) -> ActionMatcher:
+    """Matcher with database IDs"""
+    # Prefer the compiled taxonomy (scripts/compile_taxonomy.py), mapped with
+    # real database UUIDs; reloads read the database, which the artifact may
+    # not reflect yet
+    if use_artifact:
+        try:
+            # Compiled against this database, and not reseeded/reloaded since
+            version, action_ids = _taxonomy_state()
+            return load_matcher(
+                settings.TAXONOMY_ARTIFACT_PATH,
+                ids="database",
+                fuzzy_max_distance=settings.NLP_FUZZY_MAX_DISTANCE,
+                taxonomy_version=version,
+                database_ids=action_ids
+            )
+        except ArtifactError as e:
+            logger.info("Taxonomy artifact unavailable (%s), loading actions from database", e)
+    return _matcher_from_db()
+
+
+# NLP components (lazy loading, swapped on taxonomy reloads)
+_live = LiveExtractor("recipes", _build_matcher)
 
-        matcher = ActionMatcher(taxonomy_actions)
-        _extractor = ActionExtractor(matcher, settings.SPACY_MODEL)
-    return _extractor
+
+def get_extractor() -> ActionExtractor:
+    """Current NLP extractor"""
+    return _live.get()
+
+
+def get_batcher() -> ExtractionBatcher:
+    """Micro-batching scheduler shared by concurrent recipe creates"""
+    return _live.batcher
 
 
 @router.post("/", response_model=RecipeResponse, status_code=201)
+@query_budget(8)
 async def create_recipe(recipe_data: RecipeCreate, db: Session = Depends(get_db)):
     """
     Create a new recipe with automatic action extraction
@@ -64,7 +110,24 @@ async def create_recipe(recipe_data: RecipeCreate, db: Session = Depends(get_db)
     - Extracts cooking actions from each step using NLP
     - Returns enriched recipe with action details
     """
-    extractor = get_extractor(db)
+    texts = [step_data.instruction_text for step_data in recipe_data.steps]
+    docs = [None] * len(texts)
+    if settings.NLP_STORE_PARSES:
+        # Fully parse every step and keep the parse for later re-matching
+        extractor = get_extractor()
+        docs = await run_in_threadpool(extractor.parse, texts, settings.NLP_PIPE_BATCH_SIZE)
+        extracted_steps = [extractor.extract_from_doc(doc) for doc in docs]
+    else:
+        # Extract actions from every step in one go, batched with concurrent requests
+        extracted_steps = await get_batcher().extract_many(texts)
+
+    # Codes of the extracted actions, for packed storage
+    codes = None
+    if settings.NLP_PACK_STEP_ACTIONS:
+        action_ids = {action_id for extracted in extracted_steps for action_id in extracted.ids()}
+        codes = dict(
+            db.query(CookingAction.id, CookingAction.code).filter(CookingAction.id.in_(action_ids))
+        ) if action_ids else {}
 
     # Create recipe
     recipe = Recipe(
@@ -76,26 +139,19 @@ async def create_recipe(recipe_data: RecipeCreate, db: Session = Depends(get_db)
     db.flush()  # Get recipe ID
 
     # Create steps with action extraction
-    for step_data in recipe_data.steps:
-        # Extract actions from instruction text
-        extracted = extractor.extract_actions(step_data.instruction_text)
-
-        # Get action IDs as strings (SQLite compatibility)
-        action_ids = [action["action_id"] for action in extracted]
-
-        # Store confidence scores
-        confidence_data = {
-            action["action_id"]: action["confidence"]
-            for action in extracted
-        }
-
+    for step_data, extracted, doc in zip(recipe_data.steps, extracted_steps, docs):
         step = RecipeStep(
             recipe_id=recipe.id,
             step_number=step_data.step_number,
-            instruction_text=step_data.instruction_text,
-            extracted_actions=action_ids,
-            nlp_confidence=confidence_data
+            instruction_text=step_data.instruction_text
         )
+        store_step_actions(step, extracted, codes)
+        if doc is not None:
+            step.parse = StepParse(
+                text_sha256=text_digest(step_data.instruction_text),
+                pipeline=pipeline_id(extractor.nlp),
+                doc=doc_to_bytes(doc)
+            )
         db.add(step)
 
     db.commit()
@@ -106,9 +162,12 @@ async def create_recipe(recipe_data: RecipeCreate, db: Session = Depends(get_db)
 
 
 @router.get("/{recipe_id}", response_model=RecipeResponse)
+@query_budget(3)
 async def get_recipe(recipe_id: str, db: Session = Depends(get_db)):
     """Get recipe by ID with enriched action details"""
-    recipe = db.query(Recipe).filter(Recipe.id == recipe_id).first()
+    recipe = db.query(Recipe).options(
+        selectinload(Recipe.steps)
+    ).filter(Recipe.id == recipe_id).first()
 
     if not recipe:
         raise HTTPException(status_code=404, detail="Recipe not found")
@@ -116,15 +175,126 @@ async def get_recipe(recipe_id: str, db: Session = Depends(get_db)):
     return _enrich_recipe_response(recipe, db)
 
 
+@router.get("/{recipe_id}/images", response_model=RecipeImagesResponse)
+@query_budget(3)
+async def get_recipe_images(recipe_id: str, db: Session = Depends(get_db)):
+    """
+    Get the distinct technique images used by a recipe, in order of first use
+
+    Lets a client prefetch every step image up front; when a sprite atlas has
+    been built each image also carries its tile in one of sprite_sheets.
+    """
+    recipe = db.query(Recipe).options(
+        selectinload(Recipe.steps)
+    ).filter(Recipe.id == recipe_id).first()
+
+    if not recipe:
+        raise HTTPException(status_code=404, detail="Recipe not found")
+
+    actions_by_id = _load_step_actions([recipe], db)
+    atlas = get_atlas()
+
+    images = {}
+    for step in sorted(recipe.steps, key=lambda s: s.step_number):
+        for ref, _ in step_action_refs(step):
+            action = actions_by_id.get(ref)
+            if action is None or not (action.image_url or action.thumbnail_url):
+                continue
+            action_id = str(action.id)
+            if action_id in images:
+                if step.step_number not in images[action_id]["step_numbers"]:
+                    images[action_id]["step_numbers"].append(step.step_number)
+                continue
+
+            tile = atlas["tiles"].get(action.canonical_name) if atlas else None
+            images[action_id] = {
+                "action_id": action.id,
+                "canonical_name": action.canonical_name,
+                "image_url": action.image_url,
+                "thumbnail_url": action.thumbnail_url,
+                "image_variants": action.image_variants or [],
+                "image_width": action.image_width,
+                "image_height": action.image_height,
+                "image_placeholder": action.image_placeholder,
+                "step_numbers": [step.step_number],
+                "sprite": dict(
+                    tile, width=atlas["tile_width"], height=atlas["tile_height"]
+                ) if tile else None,
+            }
+
+    return {
+        "recipe_id": recipe.id,
+        "images": list(images.values()),
+        "sprite_sheets": atlas["sheets"] if atlas else [],
+    }
+
+
 @router.get("/", response_model=List[RecipeResponse])
-async def list_recipes(skip: int = 0, limit: int = 10, db: Session = Depends(get_db)):
-    """List all recipes with pagination"""
-    recipes = db.query(Recipe).offset(skip).limit(limit).all()
-    return [_enrich_recipe_response(recipe, db) for recipe in recipes]
+@query_budget(3)
+async def list_recipes(
+    skip: int = 0,
+    limit: int = 10,
+    action_id: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    List all recipes with pagination
+
+    Args:
+        action_id: Only recipes with a step extracted as this cooking action
+            (JSON-stored steps; served by a GIN index on PostgreSQL)
+    """
+    query = db.query(Recipe).options(selectinload(Recipe.steps))
+    if action_id:
+        query = query.filter(Recipe.id.in_(
+            select(RecipeStep.recipe_id).where(RecipeStep.has_actions(action_id))
+        ))
+    recipes = query.offset(skip).limit(limit).all()
 
+    actions_by_id = _load_step_actions(recipes, db)
+    return [_enrich_recipe_response(recipe, db, actions_by_id) for recipe in recipes]
 
-def _enrich_recipe_response(recipe: Recipe, db: Session) -> dict:
+
+def _load_step_actions(recipes: List[Recipe], db: Session) -> Dict[Union[str, int], CookingAction]:
+    """
+    Load every cooking action referenced by the recipes' steps in one query
+
+    Args:
+        recipes: Recipes with steps loaded
+        db: Database session
+
+    Returns:
+        Dict mapping action ID - and, for actions of packed steps, action
+        code - to CookingAction (see step_action_refs)
+    """
+    refs = {
+        ref
+        for recipe in recipes
+        for step in recipe.steps
+        for ref, _ in step_action_refs(step)
+    }
+    if not refs:
+        return {}
+    action_ids = [ref for ref in refs if isinstance(ref, str)]
+    codes = [ref for ref in refs if isinstance(ref, int)]
+
+    actions = db.query(CookingAction).filter(
+        or_(CookingAction.id.in_(action_ids), CookingAction.code.in_(codes))
+    ).all()
+    actions_by_ref: Dict[Union[str, int], CookingAction] = {str(action.id): action for action in actions}
+    actions_by_ref.update((action.code, action) for action in actions if action.code is not None)
+    return actions_by_ref
+
+
+def _enrich_recipe_response(
+    recipe: Recipe,
+    db: Session,
+    actions_by_id: Optional[Dict[Union[str, int], CookingAction]] = None
+) -> dict:
     """Enrich recipe response with cooking action details"""
+    if actions_by_id is None:
+        actions_by_id = _load_step_actions([recipe], db)
+
     recipe_dict = {
         "id": recipe.id,
         "title": recipe.title,
@@ -137,12 +307,9 @@ def _enrich_recipe_response(recipe: Recipe, db: Session) -> dict:
     for step in recipe.steps:
         # Get action details
         action_details = []
-        if step.extracted_actions:
-            actions = db.query(CookingAction).filter(
-                CookingAction.id.in_(step.extracted_actions)
-            ).all()
-
-            for action in actions:
+        for ref, confidence in step_action_refs(step):
+            action = actions_by_id.get(ref)
+            if action is not None:
                 action_details.append({
                     "id": str(action.id),
                     "canonical_name": action.canonical_name,
@@ -150,9 +317,13 @@ def _enrich_recipe_response(recipe: Recipe, db: Session) -> dict:
                     "category": action.category,
                     "image_url": action.image_url,
                     "thumbnail_url": action.thumbnail_url,
+                    "image_variants": action.image_variants or [],
+                    "image_width": action.image_width,
+                    "image_height": action.image_height,
+                    "image_placeholder": action.image_placeholder,
                     "attribution": action.attribution,
                     "license": action.license,
-                    "confidence": step.nlp_confidence.get(str(action.id), 1.0) if step.nlp_confidence else 1.0
+                    "confidence": confidence
                 })
 
         recipe_dict["steps"].append({
@@ -23,11 +23,41 @@ class Settings(BaseSettings):
     # NLP
     SPACY_MODEL: str = "en_core_web_sm"
     NLP_CONFIDENCE_THRESHOLD: float = 0.5
+    NLP_SCORE_WEIGHTS: str = "base:0.6,cooking_context:0.15,direct_object:0.15,sentence_initial:0.1,edit_distance:-0.1"
+    NLP_SCORE_DEBUG: bool = False  # Include per-feature contributions in extraction results
+    NLP_FAST_PATH: bool = True  # Match inflected forms from tokens; tag/parse only ambiguous steps
+    NLP_FUZZY_MAX_DISTANCE: int = 2  # Typo tolerance for unmatched verbs (0 disables)
+    NLP_BATCH_MAX_TEXTS: int = 256  # Texts per POST /nlp/extract/batch
+    NLP_BATCH_MAX_CHARS: int = 100_000  # Total characters per batch request
+    NLP_PIPE_BATCH_SIZE: int = 64  # spaCy nlp.pipe batch size
+    NLP_MICROBATCH_MAX_SIZE: int = 32  # Concurrent requests coalesced per batch (1 disables)
+    NLP_MICROBATCH_MAX_WAIT_MS: float = 2.0  # Longest a request waits for others to join its batch
+    NLP_STORE_PARSES: bool = False  # Keep each step's parse for re-matching (scripts/10_rematch_steps.py)
+    NLP_PACK_STEP_ACTIONS: bool = False  # Store new steps' actions packed (app.nlp.packed) instead of JSON
+    NLP_EXTRACTION_CACHE_SIZE: int = 1024  # Cached extraction results (0 disables)
+    NLP_TAXONOMY_POLL_SECONDS: float = 5.0  # How often workers check for taxonomy changes (0 disables)
+
+    # Server (python -m app.serve)
+    WEB_WORKERS: int = 0  # Worker processes sharing the preloaded NLP model (0 = CPU count)
+
+    # Admin endpoints (disabled unless a token is set)
+    ADMIN_TOKEN: Optional[str] = None
 
     # Images
     STATIC_DIR: str = "backend/static"
     IMAGES_DIR: str = "backend/static/images/techniques"
     PEXELS_API_KEY: Optional[str] = None  # For image download script
+    IMAGE_VARIANT_WIDTHS: str = "160,400,800"  # Comma-separated derivative widths
+    IMAGE_VARIANT_FORMATS: str = "webp,jpeg"
+    IMAGE_THUMBNAIL_WIDTH: int = 400  # Width used for CookingAction.thumbnail_url
+    IMAGE_ALLOWED_WIDTHS: str = "160,240,320,400,640,800,1200"  # On-demand resize whitelist
+    IMAGE_CACHE_DIR: str = "data/cache/images"
+    IMAGE_CACHE_MAX_BYTES: int = 256 * 1024 * 1024
+    IMAGE_OPTIMIZE_MIN_SSIM: float = 0.98  # Quality floor for scripts/optimize_images.py
+    IMAGE_OPTIMIZE_MAX_BYTES: int = 0  # Per-image byte budget (0 disables)
+
+    # Metrics
+    METRICS_ENABLED: bool = True
 
     # CORS (add production domains when deployed)
     CORS_ORIGINS: str = "http://localhost:3000,http://localhost:5173,https://*.vercel.app,https://*.onrender.com"
@@ -37,8 +67,30 @@ class Settings(BaseSettings):
         """Parse CORS origins from comma-separated string"""
         return [origin.strip() for origin in self.CORS_ORIGINS.split(",")]
 
+    @property
+    def image_variant_widths_list(self) -> list[int]:
+        """Parse derivative widths from comma-separated string"""
+        return sorted(int(w) for w in self.IMAGE_VARIANT_WIDTHS.split(",") if w.strip())
+
+    @property
+    def image_allowed_widths_list(self) -> list[int]:
+        """Parse on-demand resize widths from comma-separated string"""
+        return sorted(int(w) for w in self.IMAGE_ALLOWED_WIDTHS.split(",") if w.strip())
+
+    @property
+    def image_variant_formats_list(self) -> list[str]:
+        """Parse derivative formats from comma-separated string"""
+        return [fmt.strip() for fmt in self.IMAGE_VARIANT_FORMATS.split(",") if fmt.strip()]
+
+    @property
+    def nlp_score_weights_dict(self) -> dict[str, float]:
+        """Parse confidence feature weights from "name:weight" pairs"""
+        from .nlp.scoring import parse_weights
+        return parse_weights(self.NLP_SCORE_WEIGHTS)
+
     # Paths
     TAXONOMY_PATH: str = "data/taxonomy/cooking_actions_taxonomy.json"
+    TAXONOMY_ARTIFACT_PATH: str = "data/taxonomy/cooking_actions.rtax"  # scripts/compile_taxonomy.py
 
     class Config:
         env_file = ".env"
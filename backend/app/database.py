@@ -1,5 +1,5 @@
 """Database configuration and session management"""
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect, text
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.pool import StaticPool
 from contextlib import contextmanager
@@ -7,6 +7,8 @@ from typing import Generator
 import os
 from dotenv import load_dotenv
 
+from .instrumentation import instrument_engine
+
 load_dotenv()
 
 # Database URL from environment or use SQLite for development
@@ -33,6 +35,9 @@ else:
         max_overflow=20
     )
 
+# Query counting/timing for /metrics, debug headers and query budgets
+instrument_engine(engine)
+
 # Session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -73,11 +78,92 @@ def get_db_context():
 def init_db():
     """Initialize database tables"""
     from .models.base import Base
-    from .models import Recipe, RecipeStep, CookingAction
+    from .models import Recipe, RecipeStep, CookingAction, StepParse, TaxonomyVersion
 
     Base.metadata.create_all(bind=engine)
+    _add_missing_columns(Base.metadata)
+    _upgrade_json_columns(Base.metadata)
+    _add_missing_indexes(Base.metadata)
     print("Database tables created successfully!")
 
 
+def _add_missing_columns(metadata):
+    """
+    Add nullable columns that exist on the models but not in the database
+
+    create_all() only creates missing tables, so databases created before a
+    column was added to a model would otherwise never see it.
+
+    Args:
+        metadata: SQLAlchemy MetaData with all models registered
+    """
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table in metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing or not column.nullable:
+                    continue
+                column_type = column.type.compile(dialect=engine.dialect)
+                conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"))
+                print(f"Added column {table.name}.{column.name}")
+
+
+
+def _upgrade_json_columns(metadata):
+    """
+    Convert JSON columns to JSONB on PostgreSQL
+
+    Databases created before the models declared JSONB keep plain JSON
+    columns, which can't be GIN-indexed or queried with @>.
+
+    Args:
+        metadata: SQLAlchemy MetaData with all models registered
+    """
+    if engine.dialect.name != "postgresql":
+        return
+
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table in metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+
+            existing = {column["name"]: column["type"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing or column.type.compile(dialect=engine.dialect) != "JSONB":
+                    continue
+                if existing[column.name].compile(dialect=engine.dialect) == "JSON":
+                    conn.execute(text(
+                        f"ALTER TABLE {table.name} ALTER COLUMN {column.name} TYPE JSONB USING {column.name}::jsonb"
+                    ))
+                    print(f"Converted {table.name}.{column.name} to JSONB")
+
+
+def _add_missing_indexes(metadata):
+    """
+    Create indexes that exist on the models but not in the database
+
+    Like columns, indexes declared after a table was created are skipped by
+    create_all(). Dialect-specific indexes (ddl_if) are only created on
+    their dialect.
+
+    Args:
+        metadata: SQLAlchemy MetaData with all models registered
+    """
+    inspector = inspect(engine)
+    for table in metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+
+        existing = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing:
+                index.create(bind=engine, checkfirst=True)
+
+
 if __name__ == "__main__":
     init_db()
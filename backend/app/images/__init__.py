@@ -0,0 +1,17 @@
+from .derivatives import (
+    generate_derivatives,
+    load_image_index,
+    load_variant_index,
+    render_variants,
+    select_thumbnail,
+)
+from .store import ImageStore
+
+__all__ = [
+    "generate_derivatives",
+    "load_image_index",
+    "load_variant_index",
+    "render_variants",
+    "select_thumbnail",
+    "ImageStore",
+]
@@ -0,0 +1,260 @@
+"""
+Image Acquisition - Concurrent, rate-limited HTTP fetching for image downloaders
+
+One pooled httpx.AsyncClient is shared by all requests. Concurrency is
+bounded by a semaphore, each provider (Pexels API, Pexels CDN, Wikimedia...)
+has its own token bucket, transient failures are retried with exponential
+backoff, and downloads stream to a temp file that is renamed into place.
+"""
+import asyncio
+import os
+import random
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import httpx
+
+# (requests per second, burst) per provider
+DEFAULT_RATE_LIMITS: Dict[str, Tuple[float, int]] = {
+    "pexels": (3.0, 10),        # API: keep well inside the hourly quota
+    "pexels-cdn": (20.0, 20),   # images.pexels.com
+    "wikimedia": (5.0, 5),      # commons API and upload.wikimedia.org
+    "default": (10.0, 10),
+}
+
+RETRY_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+
+class AcquisitionError(Exception):
+    """Raised when a request fails after all retries"""
+    pass
+
+
+class TokenBucket:
+    """Async token bucket: `rate` tokens per second, up to `capacity` banked"""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        """Wait until a token is available and take it"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class AcquisitionEngine:
+    """
+    Shared async HTTP client for the image downloader scripts
+
+    Usage:
+        async with AcquisitionEngine(headers={"User-Agent": "..."}) as engine:
+            data = await engine.get_json("pexels", url, params=...)
+            await engine.download("pexels-cdn", image_url, dest_path)
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 8,
+        rate_limits: Optional[Dict[str, Tuple[float, int]]] = None,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 10.0,
+        timeout: float = 15.0,
+        headers: Optional[Dict[str, str]] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None
+    ):
+        """
+        Args:
+            max_concurrency: Max requests in flight (also the connection pool size)
+            rate_limits: Provider -> (requests/sec, burst); merged over DEFAULT_RATE_LIMITS
+            max_retries: Retries after the first attempt for transient failures
+            backoff_base: First retry delay in seconds (doubles each retry, with jitter)
+            backoff_max: Cap on a single retry delay
+            timeout: Per-request timeout in seconds
+            headers: Default headers for every request
+            transport: Custom httpx transport (e.g. to point at a stub server in tests)
+        """
+        self.max_concurrency = max_concurrency
+        self.rate_limits = dict(DEFAULT_RATE_LIMITS, **(rate_limits or {}))
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+        self.headers = headers or {}
+        self.transport = transport
+
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._buckets: Dict[str, TokenBucket] = {}
+
+    async def __aenter__(self):
+        self._client = httpx.AsyncClient(
+            headers=self.headers,
+            timeout=self.timeout,
+            follow_redirects=True,
+            limits=httpx.Limits(
+                max_connections=self.max_concurrency,
+                max_keepalive_connections=self.max_concurrency
+            ),
+            transport=self.transport
+        )
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self._client.aclose()
+        self._client = None
+
+    def _bucket(self, provider: str) -> TokenBucket:
+        bucket = self._buckets.get(provider)
+        if bucket is None:
+            rate, burst = self.rate_limits.get(provider, self.rate_limits["default"])
+            bucket = self._buckets[provider] = TokenBucket(rate, burst)
+        return bucket
+
+    def _retry_delay(self, attempt: int, response: Optional[httpx.Response]) -> float:
+        """Delay before the next attempt, honoring Retry-After when given"""
+        if response is not None:
+            retry_after = response.headers.get("Retry-After")
+            if retry_after and retry_after.isdigit():
+                return min(float(retry_after), self.backoff_max)
+        delay = min(self.backoff_base * (2 ** attempt), self.backoff_max)
+        return delay * (0.5 + random.random() / 2)
+
+    async def _with_retries(self, provider: str, url: str, send):
+        """
+        Run send() under the concurrency limit and rate limiter, retrying transient failures
+
+        Args:
+            provider: Rate limit bucket name
+            url: URL (for error messages)
+            send: Coroutine function performing one attempt; returns its result or
+                  raises httpx.HTTPStatusError / httpx.TransportError
+
+        Returns:
+            Result of the successful attempt
+        """
+        for attempt in range(self.max_retries + 1):
+            await self._bucket(provider).acquire()
+            response = None
+            try:
+                async with self._semaphore:
+                    return await send()
+            except httpx.HTTPStatusError as e:
+                response = e.response
+                if response.status_code not in RETRY_STATUS_CODES or attempt == self.max_retries:
+                    raise AcquisitionError(f"GET {url} failed: HTTP {response.status_code}") from e
+            except httpx.TransportError as e:
+                if attempt == self.max_retries:
+                    raise AcquisitionError(f"GET {url} failed: {e!r}") from e
+            await asyncio.sleep(self._retry_delay(attempt, response))
+
+    async def get_json(
+        self,
+        provider: str,
+        url: str,
+        params: Optional[Dict] = None,
+        headers: Optional[Dict[str, str]] = None
+    ):
+        """
+        GET a JSON document
+
+        Args:
+            provider: Rate limit bucket name
+            url: URL to fetch
+            params: Query parameters
+            headers: Extra headers for this request
+
+        Returns:
+            Decoded JSON
+
+        Raises:
+            AcquisitionError: If the request fails after all retries
+        """
+        async def send():
+            response = await self._client.get(url, params=params, headers=headers)
+            response.raise_for_status()
+            return response.json()
+
+        return await self._with_retries(provider, url, send)
+
+    async def download(
+        self,
+        provider: str,
+        url: str,
+        dest: Path,
+        headers: Optional[Dict[str, str]] = None
+    ) -> Path:
+        """
+        Stream a file to disk, replacing dest atomically once complete
+
+        Args:
+            provider: Rate limit bucket name
+            url: URL to fetch
+            dest: Destination path
+            headers: Extra headers for this request
+
+        Returns:
+            dest
+
+        Raises:
+            AcquisitionError: If the download fails after all retries
+        """
+        dest = Path(dest)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = dest.with_name(f".{dest.name}.{os.getpid()}.{id(dest):x}.part")
+
+        async def send():
+            try:
+                async with self._client.stream("GET", url, headers=headers) as response:
+                    response.raise_for_status()
+                    with open(tmp_path, "wb") as f:
+                        async for chunk in response.aiter_bytes(chunk_size=65536):
+                            f.write(chunk)
+                os.replace(tmp_path, dest)
+            finally:
+                if tmp_path.exists():
+                    tmp_path.unlink()
+            return dest
+
+        return await self._with_retries(provider, url, send)
+
+
+async def download_many(
+    engine: AcquisitionEngine,
+    provider: str,
+    jobs: Dict[str, Tuple[str, Path]]
+) -> Dict[str, Optional[str]]:
+    """
+    Download several files concurrently
+
+    Args:
+        engine: Open AcquisitionEngine
+        provider: Rate limit bucket name
+        jobs: Key -> (url, dest path)
+
+    Returns:
+        Key -> error message, or None if the download succeeded
+    """
+    async def run(url: str, dest: Path) -> Optional[str]:
+        try:
+            await engine.download(provider, url, dest)
+            return None
+        except AcquisitionError as e:
+            return str(e)
+
+    keys = list(jobs)
+    results = await asyncio.gather(*(run(*jobs[key]) for key in keys))
+    return dict(zip(keys, results))
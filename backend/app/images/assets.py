@@ -0,0 +1,137 @@
+"""
+Hashed Assets - Publish static files under content-hash filenames
+
+A published file gets a name that changes whenever its bytes change
+(dice-pexels.jpg -> dice-pexels.3f9a0c1d2e4b5a69.jpg), so it can be served
+with a far-future immutable Cache-Control header. assets/manifest.json maps
+each logical URL to the URL it was last published under; it is rewritten on
+every publish, so it is served for revalidation (no-cache) instead.
+"""
+import json
+import os
+import re
+import shutil
+from pathlib import Path
+from typing import Dict, Optional, Pattern
+
+from fastapi.staticfiles import StaticFiles
+
+from .derivatives import hash_file
+from .store import STORE_URL
+
+ASSETS_URL = "/static/assets"
+MANIFEST_NAME = "manifest.json"
+HASH_LENGTH = 16
+
+# Published file names (<stem>.<hash><ext>, also used by sprite sheets)
+ASSET_NAME = re.compile(rf"[^/]+\.[0-9a-f]{{{HASH_LENGTH}}}\.[A-Za-z0-9]+")
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+
+class ImmutableStaticFiles(StaticFiles):
+    """StaticFiles for fingerprinted files: adds a far-future immutable Cache-Control
+
+    Only names matching the fingerprinted pattern get the immutable header;
+    anything else in the directory (a manifest rewritten in place) is served
+    with "no-cache" so clients revalidate it. ETag / Last-Modified and 304
+    handling come from StaticFiles itself.
+    """
+
+    def __init__(self, *args, fingerprinted: Pattern, **kwargs):
+        """
+        Args:
+            fingerprinted: Pattern full-matching content-hashed file names
+        """
+        super().__init__(*args, **kwargs)
+        self.fingerprinted = fingerprinted
+
+    def file_response(self, full_path, *args, **kwargs):
+        response = super().file_response(full_path, *args, **kwargs)
+        name = os.path.basename(full_path)
+        if self.fingerprinted.fullmatch(name):
+            response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+        else:
+            response.headers["Cache-Control"] = REVALIDATE_CACHE_CONTROL
+        return response
+
+
+class AssetPublisher:
+    """Copies static files to content-hashed names and tracks them in a manifest"""
+
+    def __init__(self, static_dir: str):
+        """
+        Args:
+            static_dir: Directory served at /static (assets go in its assets/ subdir)
+        """
+        self.static_dir = Path(static_dir)
+        self.assets_dir = self.static_dir / "assets"
+        self.assets_dir.mkdir(parents=True, exist_ok=True)
+        self.manifest: Dict[str, str] = self._load_manifest()
+        # Reverse map so hashed URLs already stored in the DB can be traced back
+        self._logical_by_url = {url: logical for logical, url in self.manifest.items()}
+
+    def _load_manifest(self) -> Dict[str, str]:
+        path = self.assets_dir / MANIFEST_NAME
+        if not path.exists():
+            return {}
+        with open(path, "r") as f:
+            return json.load(f)
+
+    def save(self):
+        """Write the manifest atomically"""
+        path = self.assets_dir / MANIFEST_NAME
+        tmp_path = self.assets_dir / f".{MANIFEST_NAME}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, path)
+
+    def logical_url(self, url: Optional[str]) -> Optional[str]:
+        """
+        Map a (possibly hashed) URL back to the logical /static URL it came from
+
+        Args:
+            url: URL as stored on a model
+
+        Returns:
+            Logical URL (unchanged if the URL was never published)
+        """
+        if url is None:
+            return None
+        return self._logical_by_url.get(url, url)
+
+    def publish(self, logical_url: str) -> Optional[str]:
+        """
+        Publish the file behind a logical /static URL under its content hash
+
+        Args:
+            logical_url: URL like /static/images/techniques/dice-pexels.jpg
+
+        Returns:
+            Hashed URL under /static/assets, or None if the source is missing
+        """
+        if not logical_url.startswith("/static/"):
+            return None
+        source = self.static_dir / logical_url[len("/static/"):]
+        if not source.is_file():
+            return None
+
+        # Image store blobs are already named by their content hash
+        if logical_url.startswith(STORE_URL + "/"):
+            return logical_url
+
+        digest = hash_file(source)[:HASH_LENGTH]
+        filename = f"{source.stem}.{digest}{source.suffix}"
+        target = self.assets_dir / filename
+
+        if not target.exists():
+            # Copy rather than hard-link: sources are rewritten in place by the downloaders
+            tmp_path = self.assets_dir / f".{filename}.tmp"
+            shutil.copyfile(source, tmp_path)
+            os.replace(tmp_path, target)
+
+        url = f"{ASSETS_URL}/{filename}"
+        self.manifest[logical_url] = url
+        self._logical_by_url[url] = logical_url
+        return url
@@ -0,0 +1,138 @@
+"""
+Variant Cache - Size-bounded disk cache of resized images with LRU eviction
+"""
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+
+class VariantCache:
+    """
+    Disk cache of resized image files, evicting least recently used entries
+
+    Recency is tracked in memory and mirrored to file mtimes, so the LRU
+    order survives restarts (the directory is rescanned on construction).
+
+    Entries being served can be pinned (get/put with pin=True, then unpin)
+    so eviction skips them until the response is sent; the cache may run
+    over budget meanwhile. Pins are per process: another worker's cache
+    index can still remove the file.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int):
+        """
+        Initialize the cache, indexing any files already on disk
+
+        Args:
+            cache_dir: Directory holding cached variants
+            max_bytes: Total size budget; oldest entries are evicted beyond it
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._total_bytes = 0
+        self._pins: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+        files = [p for p in self.cache_dir.iterdir() if p.is_file() and not p.name.startswith(".")]
+        for path in sorted(files, key=lambda p: p.stat().st_mtime):
+            size = path.stat().st_size
+            self._entries[path.name] = size
+            self._total_bytes += size
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    def get(self, key: str, pin: bool = False) -> Optional[Path]:
+        """
+        Look up a cached file and mark it most recently used
+
+        Args:
+            key: Cache file name
+            pin: Keep the entry from being evicted until unpin(key)
+
+        Returns:
+            Path to the cached file, or None on a miss (nothing is pinned then)
+        """
+        with self._lock:
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+            if pin:
+                self._pins[key] = self._pins.get(key, 0) + 1
+
+        path = self.cache_dir / key
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            # Removed behind our back (another worker evicted it)
+            if pin:
+                self.unpin(key)
+            self._forget(key)
+            return None
+        return path
+
+    def put(self, key: str, write: Callable[[Path], None], pin: bool = False) -> Path:
+        """
+        Create a cache entry by calling write(path), then evict to fit the budget
+
+        Args:
+            key: Cache file name
+            write: Function that writes the file at the given path
+            pin: Keep the entry from being evicted until unpin(key)
+
+        Returns:
+            Path to the cached file
+        """
+        path = self.cache_dir / key
+        write(path)
+        size = path.stat().st_size
+
+        with self._lock:
+            if key in self._entries:
+                self._total_bytes -= self._entries[key]
+            self._entries[key] = size
+            self._entries.move_to_end(key)
+            self._total_bytes += size
+            if pin:
+                self._pins[key] = self._pins.get(key, 0) + 1
+            evicted = self._evict_locked(keep=key)
+
+        for name in evicted:
+            try:
+                os.remove(self.cache_dir / name)
+            except FileNotFoundError:
+                pass
+        return path
+
+    def unpin(self, key: str):
+        """Release a pin taken by get() or put()"""
+        with self._lock:
+            count = self._pins.get(key, 0) - 1
+            if count > 0:
+                self._pins[key] = count
+            else:
+                self._pins.pop(key, None)
+
+    def _evict_locked(self, keep: str) -> List[str]:
+        """Drop unpinned LRU entries until within budget (caller holds the lock)"""
+        evicted = []
+        for name in list(self._entries):
+            if self._total_bytes <= self.max_bytes:
+                break
+            if name == keep or name in self._pins:
+                continue
+            self._total_bytes -= self._entries.pop(name)
+            evicted.append(name)
+        return evicted
+
+    def _forget(self, key: str):
+        with self._lock:
+            size = self._entries.pop(key, None)
+            if size is not None:
+                self._total_bytes -= size
@@ -0,0 +1,397 @@
+"""
+Image Derivatives - Multi-resolution WebP/JPEG variants of technique images
+
+Each source image in static/images/techniques is resized to a set of widths
+and encoded in each output format. Work is spread over a process pool, and a
+manifest of source content hashes lets unchanged sources be skipped.
+"""
+import base64
+import hashlib
+import io
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from PIL import Image, ImageOps
+
+SOURCE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".webp"}
+
+# Pillow format name and file extension per output format
+FORMATS = {
+    "webp": ("WEBP", "webp"),
+    "jpeg": ("JPEG", "jpg"),
+}
+
+# Encoder options per output format
+ENCODER_OPTIONS = {
+    "webp": {"quality": 80, "method": 4},
+    "jpeg": {"quality": 82, "optimize": True},
+}
+
+# Inline low-quality placeholder (LQIP): tiny WebP, ~100-200 bytes base64
+PLACEHOLDER_WIDTH = 16
+PLACEHOLDER_OPTIONS = {"quality": 30}
+
+MANIFEST_NAME = "manifest.json"
+
+
+def hash_file(path: Path, chunk_size: int = 1 << 16) -> str:
+    """
+    Compute the sha256 of a file's contents
+
+    Args:
+        path: File to hash
+        chunk_size: Read size in bytes
+
+    Returns:
+        Hex digest
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def resize_image(source_path: Path, dest_path: Path, width: int, fmt: str) -> Dict:
+    """
+    Resize a single image to a width and format (never upscaling)
+
+    The output is written to a temp name and renamed into place.
+
+    Args:
+        source_path: Path to the source image
+        dest_path: Output file path
+        width: Target width in pixels
+        fmt: Output format (key of FORMATS)
+
+    Returns:
+        Dict with the output "width" and "height"
+    """
+    pil_format, _ = FORMATS[fmt]
+    dest_path = Path(dest_path)
+    with Image.open(source_path) as img:
+        img = ImageOps.exif_transpose(img).convert("RGB")
+        source_width, source_height = img.size
+        width = min(width, source_width)
+        height = max(1, round(source_height * width / source_width))
+        if width != source_width:
+            img = img.resize((width, height), Image.LANCZOS)
+
+        tmp_path = dest_path.with_name(f".{dest_path.name}.{os.getpid()}.tmp")
+        img.save(tmp_path, pil_format, **ENCODER_OPTIONS[fmt])
+        os.replace(tmp_path, dest_path)
+
+    return {"width": width, "height": height}
+
+
+def render_placeholder(img: Image.Image) -> str:
+    """
+    Encode a tiny blurred preview of an image as a data URI
+
+    Args:
+        img: RGB image
+
+    Returns:
+        data:image/webp;base64,... string
+    """
+    width, height = img.size
+    small = img.resize(
+        (PLACEHOLDER_WIDTH, max(1, round(height * PLACEHOLDER_WIDTH / width))),
+        Image.BILINEAR
+    )
+    buffer = io.BytesIO()
+    small.save(buffer, "WEBP", **PLACEHOLDER_OPTIONS)
+    return "data:image/webp;base64," + base64.b64encode(buffer.getvalue()).decode("ascii")
+
+
+def _write_variants(
+    img: Image.Image,
+    stem: str,
+    output: Path,
+    widths: Sequence[int],
+    formats: Sequence[str]
+) -> List[Dict]:
+    """Resize an opened RGB image to every width/format combination"""
+    source_width, source_height = img.size
+    target_widths = sorted({w for w in widths if w <= source_width}) or [source_width]
+
+    variants = []
+    for width in target_widths:
+        height = max(1, round(source_height * width / source_width))
+        resized = img if width == source_width else img.resize((width, height), Image.LANCZOS)
+
+        for fmt in formats:
+            pil_format, ext = FORMATS[fmt]
+            filename = f"{stem}-{width}w.{ext}"
+            path = output / filename
+
+            # Write to a temp name first so readers never see partial files
+            tmp_path = output / f".{filename}.tmp"
+            resized.save(tmp_path, pil_format, **ENCODER_OPTIONS[fmt])
+            os.replace(tmp_path, path)
+
+            variants.append({
+                "width": width,
+                "height": height,
+                "format": fmt,
+                "filename": filename,
+                "bytes": path.stat().st_size,
+            })
+
+    return variants
+
+
+def render_variants(
+    source_path: str,
+    output_dir: str,
+    widths: Sequence[int],
+    formats: Sequence[str]
+) -> List[Dict]:
+    """
+    Resize one source image to every width/format combination
+
+    Widths larger than the source are skipped (no upscaling); if every width
+    is larger, a single variant at the source width is produced instead.
+
+    Args:
+        source_path: Path to the source image
+        output_dir: Directory to write variants into
+        widths: Target widths in pixels
+        formats: Output formats (keys of FORMATS)
+
+    Returns:
+        List of variant dicts: {"width", "height", "format", "filename", "bytes"}
+    """
+    return render_source(source_path, output_dir, widths, formats)["variants"]
+
+
+def render_source(
+    source_path: str,
+    output_dir: str,
+    widths: Sequence[int],
+    formats: Sequence[str]
+) -> Dict:
+    """
+    Render variants plus intrinsic size and placeholder for one source image
+
+    Runs in a worker process, so arguments and results are plain data.
+
+    Args:
+        source_path: Path to the source image
+        output_dir: Directory to write variants into
+        widths: Target widths in pixels
+        formats: Output formats (keys of FORMATS)
+
+    Returns:
+        {"width", "height", "placeholder", "variants"} with variants as
+        returned by render_variants
+    """
+    source = Path(source_path)
+    output = Path(output_dir)
+    output.mkdir(parents=True, exist_ok=True)
+
+    with Image.open(source) as img:
+        img = ImageOps.exif_transpose(img).convert("RGB")
+        return {
+            "width": img.width,
+            "height": img.height,
+            "placeholder": render_placeholder(img),
+            "variants": _write_variants(img, source.stem, output, widths, formats),
+        }
+
+
+def _load_manifest(output_dir: Path) -> Dict:
+    path = output_dir / MANIFEST_NAME
+    if not path.exists():
+        return {}
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def _save_manifest(output_dir: Path, manifest: Dict):
+    path = output_dir / MANIFEST_NAME
+    tmp_path = output_dir / f".{MANIFEST_NAME}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def _is_current(entry: Optional[Dict], sha256: str, params: Dict, output_dir: Path) -> bool:
+    """Check whether a manifest entry still matches its source and settings"""
+    if not entry or entry.get("sha256") != sha256 or entry.get("params") != params:
+        return False
+    return all((output_dir / v["filename"]).exists() for v in entry.get("variants", []))
+
+
+def generate_derivatives(
+    source_dir: Path,
+    output_dir: Path,
+    widths: Sequence[int],
+    formats: Sequence[str],
+    workers: Optional[int] = None,
+    sources: Optional[Iterable[Path]] = None,
+    force: bool = False
+) -> Dict[str, Dict]:
+    """
+    Generate variants for every source image, skipping unchanged ones
+
+    Args:
+        source_dir: Directory of source images
+        output_dir: Directory for variants and the manifest
+        widths: Target widths in pixels
+        formats: Output formats (keys of FORMATS)
+        workers: Process pool size (default: CPU count)
+        sources: Specific source files to process (default: all in source_dir)
+        force: Regenerate even if the source hash is unchanged
+
+    Returns:
+        Manifest dict: {source filename: {"sha256", "params", "width", "height",
+        "placeholder", "variants", "status"}} where status is "generated",
+        "unchanged" or "failed"; a failed source keeps its previous entry
+        (and variants), if it had one, plus an "error"
+    """
+    source_dir = Path(source_dir)
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    params = {
+        "widths": sorted(widths),
+        "formats": list(formats),
+        "encoder": ENCODER_OPTIONS,
+        "placeholder": {"width": PLACEHOLDER_WIDTH, **PLACEHOLDER_OPTIONS},
+    }
+    manifest = _load_manifest(output_dir)
+
+    if sources is None:
+        sources = sorted(
+            p for p in source_dir.iterdir()
+            if p.is_file() and p.suffix.lower() in SOURCE_EXTENSIONS
+        )
+
+    pending = {}
+    for path in sources:
+        sha256 = hash_file(path)
+        entry = manifest.get(path.name)
+        if not force and _is_current(entry, sha256, params, output_dir):
+            entry["status"] = "unchanged"
+        else:
+            pending[path] = sha256
+
+    if pending:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                pool.submit(render_source, str(path), str(output_dir), widths, formats): path
+                for path in pending
+            }
+            for future in as_completed(futures):
+                path = futures[future]
+                try:
+                    rendered = future.result()
+                except Exception as e:
+                    # Keep serving the last good rendering (its sha256 no longer
+                    # matches, so the source is retried on the next run)
+                    previous = manifest.get(path.name) or {"sha256": None}
+                    manifest[path.name] = {**previous, "status": "failed", "error": str(e)}
+                    continue
+                manifest[path.name] = {
+                    "sha256": pending[path],
+                    "params": params,
+                    **rendered,
+                    "status": "generated",
+                }
+
+    _save_manifest(output_dir, {
+        name: {k: v for k, v in entry.items() if k not in ("status", "error")}
+        for name, entry in manifest.items()
+        if entry.get("sha256") is not None
+    })
+    return manifest
+
+
+def variant_records(variants: List[Dict], url_prefix: str) -> List[Dict]:
+    """
+    Convert manifest variants to the form stored on CookingAction.image_variants
+
+    Args:
+        variants: Variant dicts from render_variants
+        url_prefix: Public URL prefix of the variants directory
+
+    Returns:
+        List of {"url", "width", "height", "format"} sorted by width then format
+    """
+    records = [
+        {
+            "url": f"{url_prefix.rstrip('/')}/{v['filename']}",
+            "width": v["width"],
+            "height": v["height"],
+            "format": v["format"],
+        }
+        for v in variants
+    ]
+    records.sort(key=lambda r: (r["width"], r["format"]))
+    return records
+
+
+def load_image_index(output_dir: Path, url_prefix: str) -> Dict[str, Dict]:
+    """
+    Read the variants manifest once and index everything known per source filename
+
+    Args:
+        output_dir: Variants directory containing the manifest
+        url_prefix: Public URL prefix of the variants directory
+
+    Returns:
+        Dict mapping source filename to {"variants", "width", "height", "placeholder"}
+        (size and placeholder are None for entries rendered before they existed)
+    """
+    manifest = _load_manifest(Path(output_dir))
+    return {
+        name: {
+            "variants": variant_records(entry.get("variants", []), url_prefix),
+            "width": entry.get("width"),
+            "height": entry.get("height"),
+            "placeholder": entry.get("placeholder"),
+        }
+        for name, entry in manifest.items()
+    }
+
+
+def load_variant_index(output_dir: Path, url_prefix: str) -> Dict[str, List[Dict]]:
+    """
+    Read the variants manifest once and index variant records by source filename
+
+    Args:
+        output_dir: Variants directory containing the manifest
+        url_prefix: Public URL prefix of the variants directory
+
+    Returns:
+        Dict mapping source filename (e.g. "dice-pexels.jpg") to variant records
+    """
+    return {
+        name: entry["variants"]
+        for name, entry in load_image_index(output_dir, url_prefix).items()
+    }
+
+
+def select_thumbnail(variants: List[Dict], target_width: int, fmt: str = "jpeg") -> Optional[Dict]:
+    """
+    Pick the smallest variant at least target_width wide (or the widest available)
+
+    Args:
+        variants: Variant records
+        target_width: Desired display width in pixels
+        fmt: Preferred format (JPEG is the universally supported fallback)
+
+    Returns:
+        Variant record, or None if there are no variants
+    """
+    candidates = [v for v in variants if v["format"] == fmt] or list(variants)
+    if not candidates:
+        return None
+    wide_enough = [v for v in candidates if v["width"] >= target_width]
+    if wide_enough:
+        return min(wide_enough, key=lambda v: v["width"])
+    return max(candidates, key=lambda v: v["width"])
@@ -0,0 +1,261 @@
+"""
+Image Optimizer - Shrink source images to a byte budget or quality floor
+
+Each JPEG/WebP is re-encoded without EXIF (JPEG as progressive) at the
+quality found by binary search: the lowest quality whose SSIM against the
+original stays above a floor, and/or the highest quality that fits a byte
+budget. A file is only replaced when that saves a meaningful amount, and a
+manifest of output hashes lets already-optimized files be skipped, so runs
+are idempotent. Files are processed in a process pool.
+"""
+import io
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional
+
+import numpy as np
+from PIL import Image, ImageOps
+
+from .derivatives import SOURCE_EXTENSIONS, hash_file
+
+MANIFEST_NAME = ".optimized.json"
+
+QUALITY_RANGE = (40, 92)
+
+# Keep the original unless re-encoding saves at least this fraction
+MIN_SAVINGS = 0.05
+
+# Encoder settings per Pillow format (quality is searched)
+ENCODE_OPTIONS = {
+    "JPEG": {"optimize": True, "progressive": True},
+    "WEBP": {"method": 6},
+}
+
+# SSIM stabilizing constants for 8-bit data and window size
+_C1 = (0.01 * 255) ** 2
+_C2 = (0.03 * 255) ** 2
+SSIM_WINDOW = 7
+
+
+def _box_mean(x: np.ndarray, k: int) -> np.ndarray:
+    """Mean over every k x k window (valid region) via an integral image"""
+    c = np.pad(x, ((1, 0), (1, 0))).cumsum(axis=0).cumsum(axis=1)
+    return (c[k:, k:] - c[:-k, k:] - c[k:, :-k] + c[:-k, :-k]) / (k * k)
+
+
+def ssim(a: np.ndarray, b: np.ndarray, window: int = SSIM_WINDOW) -> float:
+    """
+    Mean structural similarity of two grayscale images
+
+    Args:
+        a: Reference image, 2D array of 0-255 values
+        b: Distorted image, same shape
+        window: Side of the uniform averaging window
+
+    Returns:
+        SSIM in [-1, 1] (1 = identical)
+    """
+    a = a.astype(np.float64)
+    b = b.astype(np.float64)
+    mu_a = _box_mean(a, window)
+    mu_b = _box_mean(b, window)
+    var_a = _box_mean(a * a, window) - mu_a ** 2
+    var_b = _box_mean(b * b, window) - mu_b ** 2
+    cov = _box_mean(a * b, window) - mu_a * mu_b
+    ssim_map = ((2 * mu_a * mu_b + _C1) * (2 * cov + _C2)) / (
+        (mu_a ** 2 + mu_b ** 2 + _C1) * (var_a + var_b + _C2)
+    )
+    return float(ssim_map.mean())
+
+
+def _encode(img: Image.Image, pil_format: str, quality: int, icc_profile: Optional[bytes]) -> bytes:
+    buffer = io.BytesIO()
+    options = dict(ENCODE_OPTIONS[pil_format], quality=quality)
+    if icc_profile:
+        options["icc_profile"] = icc_profile
+    img.save(buffer, pil_format, **options)
+    return buffer.getvalue()
+
+
+def _search(low: int, high: int, ok: Callable[[int], bool], want_max: bool) -> Optional[int]:
+    """
+    Binary search a quality range for a monotone predicate
+
+    Args:
+        low, high: Inclusive quality range
+        ok: Predicate, monotone in quality (true above or below some threshold)
+        want_max: Find the highest passing quality (else the lowest)
+
+    Returns:
+        Quality, or None if no quality passes
+    """
+    found = None
+    while low <= high:
+        mid = (low + high) // 2
+        if ok(mid):
+            found = mid
+            if want_max:
+                low = mid + 1
+            else:
+                high = mid - 1
+        elif want_max:
+            high = mid - 1
+        else:
+            low = mid + 1
+    return found
+
+
+def optimize_image(
+    path: str,
+    max_bytes: Optional[int] = None,
+    min_ssim: Optional[float] = None,
+    quality_range=QUALITY_RANGE,
+    min_savings: float = MIN_SAVINGS
+) -> Dict:
+    """
+    Re-encode one image in place at the smallest acceptable size
+
+    With both limits the smaller of the two qualities wins (the byte budget
+    is a hard cap). Runs in a worker process, so arguments and results are
+    plain data.
+
+    Args:
+        path: JPEG or WebP file
+        max_bytes: Byte budget for the output
+        min_ssim: Lowest acceptable SSIM against the current file
+        quality_range: (lowest, highest) quality to consider
+        min_savings: Fraction of the size that must be saved to replace the file
+
+    Returns:
+        {"before", "after", "quality", "ssim", "status"} where status is
+        "optimized", "kept" (not worth replacing) or "skipped" (unsupported format)
+    """
+    path = Path(path)
+    before = path.stat().st_size
+    result = {"before": before, "after": before, "quality": None, "ssim": None}
+
+    with Image.open(path) as img:
+        pil_format = img.format
+        icc_profile = img.info.get("icc_profile")
+        if pil_format not in ENCODE_OPTIONS:
+            return dict(result, status="skipped")
+        # Bake the EXIF orientation into the pixels, since EXIF is dropped
+        img = ImageOps.exif_transpose(img).convert("RGB")
+
+    reference = np.asarray(img.convert("L"))
+    encoded: Dict[int, bytes] = {}
+    scores: Dict[int, float] = {}
+
+    def encode(quality: int) -> bytes:
+        if quality not in encoded:
+            encoded[quality] = _encode(img, pil_format, quality, icc_profile)
+        return encoded[quality]
+
+    def similarity(quality: int) -> float:
+        if quality not in scores:
+            with Image.open(io.BytesIO(encode(quality))) as decoded:
+                scores[quality] = ssim(reference, np.asarray(decoded.convert("L")))
+        return scores[quality]
+
+    low, high = quality_range
+    quality = high
+    if min_ssim is not None:
+        quality = _search(low, high, lambda q: similarity(q) >= min_ssim, want_max=False) or high
+    if max_bytes is not None:
+        fitting = _search(low, high, lambda q: len(encode(q)) <= max_bytes, want_max=True)
+        quality = min(quality, fitting if fitting is not None else low)
+
+    data = encode(quality)
+    result.update(quality=quality, ssim=round(similarity(quality), 5))
+    if len(data) > before * (1 - min_savings):
+        return dict(result, status="kept")
+
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+    return dict(result, after=len(data), status="optimized")
+
+
+def _load_manifest(directory: Path) -> Dict:
+    path = directory / MANIFEST_NAME
+    if not path.exists():
+        return {}
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def _save_manifest(directory: Path, manifest: Dict):
+    path = directory / MANIFEST_NAME
+    tmp_path = directory / f".{MANIFEST_NAME}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def optimize_directory(
+    directory: Path,
+    max_bytes: Optional[int] = None,
+    min_ssim: Optional[float] = None,
+    workers: Optional[int] = None,
+    sources: Optional[Iterable[Path]] = None,
+    force: bool = False
+) -> Dict[str, Dict]:
+    """
+    Optimize every image in a directory, skipping files already processed
+
+    Args:
+        directory: Directory of images
+        max_bytes: Byte budget per image
+        min_ssim: SSIM floor
+        workers: Process pool size (default: CPU count)
+        sources: Specific files to process (default: all images in directory)
+        force: Re-process files the manifest says are done
+
+    Returns:
+        {filename: {"before", "after", "quality", "ssim", "status"}}; status is
+        "optimized", "kept", "skipped", "unchanged" (done on an earlier run)
+        or "failed"
+    """
+    directory = Path(directory)
+    params = {"max_bytes": max_bytes, "min_ssim": min_ssim, "quality_range": list(QUALITY_RANGE)}
+    manifest = _load_manifest(directory)
+
+    if sources is None:
+        sources = sorted(
+            p for p in directory.iterdir()
+            if p.is_file() and p.suffix.lower() in SOURCE_EXTENSIONS
+        )
+
+    results: Dict[str, Dict] = {}
+    pending = []
+    for path in sources:
+        entry = manifest.get(path.name)
+        if (
+            not force and entry
+            and entry.get("params") == params
+            and entry.get("sha256") == hash_file(path)
+        ):
+            size = path.stat().st_size
+            results[path.name] = {"before": size, "after": size, "status": "unchanged"}
+        else:
+            pending.append(path)
+
+    if pending:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                pool.submit(optimize_image, str(path), max_bytes, min_ssim): path
+                for path in pending
+            }
+            for future in as_completed(futures):
+                path = futures[future]
+                try:
+                    results[path.name] = future.result()
+                except Exception as e:
+                    results[path.name] = {"status": "failed", "error": str(e)}
+                    continue
+                manifest[path.name] = {"sha256": hash_file(path), "params": params}
+
+    _save_manifest(directory, manifest)
+    return results
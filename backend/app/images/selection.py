@@ -0,0 +1,237 @@
+"""
+Image Selection - Vectorized scoring and near-duplicate detection for candidates
+
+Candidate images are decoded once into a stacked grayscale NumPy array.
+Perceptual hashes (DCT pHash), sharpness (variance of the Laplacian),
+exposure and resolution scores are then computed for the whole batch with
+array operations, and the best candidate per action is picked while skipping
+images that are near-duplicates of one already chosen for another action
+(falling back to the best duplicate when nothing else is left).
+"""
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from PIL import Image, ImageOps
+
+# Side of the square grayscale thumbnail each candidate is analysed at
+ANALYSIS_SIZE = 256
+
+# pHash: DCT of a HASH_SIZE*4 square thumbnail, low-frequency HASH_SIZE^2 block
+HASH_SIZE = 8
+
+# Hamming distance (out of 64 bits) at or below which two images are near-duplicates
+DUPLICATE_DISTANCE = 10
+
+# Pixel count that earns a full resolution score (1600x1000)
+TARGET_PIXELS = 1600 * 1000
+
+DEFAULT_WEIGHTS = {"sharpness": 0.5, "exposure": 0.3, "resolution": 0.2}
+
+
+def _load_gray(path: Path) -> Tuple[np.ndarray, Tuple[int, int]]:
+    """Decode an image to a square float32 grayscale array plus its original size"""
+    with Image.open(path) as img:
+        size = img.size
+        # Let the JPEG decoder downscale while decoding (much faster for large photos)
+        img.draft("L", (ANALYSIS_SIZE * 2, ANALYSIS_SIZE * 2))
+        img = ImageOps.exif_transpose(img).convert("L")
+        img = img.resize((ANALYSIS_SIZE, ANALYSIS_SIZE), Image.BILINEAR)
+        return np.asarray(img, dtype=np.float32) / 255.0, size
+
+
+def load_images(paths: Sequence[Path], workers: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Decode images into one stacked array
+
+    Args:
+        paths: Image files
+        workers: Decoder threads (Pillow releases the GIL while decoding)
+
+    Returns:
+        (pixels, sizes): float32 array of shape (N, ANALYSIS_SIZE, ANALYSIS_SIZE)
+        with values in [0, 1], and int array of original (width, height), shape (N, 2)
+    """
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        loaded = list(pool.map(_load_gray, paths))
+    if not loaded:
+        empty = np.zeros((0, ANALYSIS_SIZE, ANALYSIS_SIZE), dtype=np.float32)
+        return empty, np.zeros((0, 2), dtype=np.int64)
+    pixels = np.stack([p for p, _ in loaded])
+    sizes = np.array([s for _, s in loaded], dtype=np.int64)
+    return pixels, sizes
+
+
+def _dct_matrix(n: int) -> np.ndarray:
+    """Orthonormal DCT-II basis as an n x n matrix"""
+    k = np.arange(n)[:, None]
+    i = np.arange(n)[None, :]
+    basis = np.cos(np.pi * (2 * i + 1) * k / (2 * n)) * np.sqrt(2.0 / n)
+    basis[0] /= np.sqrt(2.0)
+    return basis.astype(np.float32)
+
+
+def perceptual_hashes(pixels: np.ndarray) -> np.ndarray:
+    """
+    Compute 64-bit DCT perceptual hashes for a batch
+
+    Args:
+        pixels: (N, S, S) grayscale array, S divisible by HASH_SIZE * 4
+
+    Returns:
+        (N, 64) boolean array of hash bits
+    """
+    n = HASH_SIZE * 4
+    factor = pixels.shape[1] // n
+    # Box-downsample to n x n, then 2D DCT as D @ X @ D.T for every image at once
+    small = pixels.reshape(len(pixels), n, factor, n, factor).mean(axis=(2, 4))
+    dct = _dct_matrix(n)
+    coefficients = np.einsum("ij,njk,lk->nil", dct, small, dct)
+    low = coefficients[:, :HASH_SIZE, :HASH_SIZE].reshape(len(pixels), -1)
+    # Median excluding the DC term, which only encodes average brightness
+    median = np.median(low[:, 1:], axis=1, keepdims=True)
+    return low > median
+
+
+def hamming_distances(hashes: np.ndarray) -> np.ndarray:
+    """
+    Pairwise Hamming distances between hashes
+
+    Args:
+        hashes: (N, bits) boolean array
+
+    Returns:
+        (N, N) int array
+    """
+    bits = hashes.astype(np.int32)
+    # differing bits = ones(a) + ones(b) - 2 * shared ones
+    ones = bits.sum(axis=1)
+    return ones[:, None] + ones[None, :] - 2 * (bits @ bits.T)
+
+
+def sharpness_scores(pixels: np.ndarray) -> np.ndarray:
+    """Variance of the 4-neighbour Laplacian per image (higher = sharper)"""
+    laplacian = (
+        pixels[:, :-2, 1:-1] + pixels[:, 2:, 1:-1]
+        + pixels[:, 1:-1, :-2] + pixels[:, 1:-1, 2:]
+        - 4 * pixels[:, 1:-1, 1:-1]
+    )
+    return laplacian.var(axis=(1, 2))
+
+
+def exposure_scores(pixels: np.ndarray) -> np.ndarray:
+    """
+    Score how well exposed each image is, in [0, 1]
+
+    Penalizes mean brightness far from mid-grey and the fraction of clipped
+    (near-black or near-white) pixels.
+    """
+    mean = pixels.mean(axis=(1, 2))
+    clipped = ((pixels < 0.02) | (pixels > 0.98)).mean(axis=(1, 2))
+    return np.clip(1.0 - 2.0 * np.abs(mean - 0.5) - clipped, 0.0, 1.0)
+
+
+def resolution_scores(sizes: np.ndarray) -> np.ndarray:
+    """Pixel count relative to TARGET_PIXELS, capped at 1"""
+    return np.minimum(sizes.prod(axis=1) / TARGET_PIXELS, 1.0)
+
+
+def score_images(
+    pixels: np.ndarray,
+    sizes: np.ndarray,
+    weights: Optional[Dict[str, float]] = None
+) -> Dict[str, np.ndarray]:
+    """
+    Compute all quality scores for a batch
+
+    Sharpness is normalized by the batch maximum so that it is comparable
+    with the other [0, 1] scores.
+
+    Args:
+        pixels: (N, S, S) grayscale array from load_images
+        sizes: (N, 2) original sizes from load_images
+        weights: Weight per score (default DEFAULT_WEIGHTS)
+
+    Returns:
+        Dict of (N,) arrays: sharpness, exposure, resolution and total
+    """
+    weights = weights or DEFAULT_WEIGHTS
+    sharpness = sharpness_scores(pixels)
+    if len(sharpness) and sharpness.max() > 0:
+        sharpness = sharpness / sharpness.max()
+
+    scores = {
+        "sharpness": sharpness,
+        "exposure": exposure_scores(pixels),
+        "resolution": resolution_scores(sizes),
+    }
+    scores["total"] = sum(weights[name] * scores[name] for name in weights)
+    return scores
+
+
+def select_best(
+    actions: Sequence[str],
+    paths: Sequence[Path],
+    weights: Optional[Dict[str, float]] = None,
+    duplicate_distance: int = DUPLICATE_DISTANCE,
+    workers: Optional[int] = None
+) -> Dict[str, Dict]:
+    """
+    Pick the best candidate image for each action
+
+    Actions are assigned in order of their best candidate's score; a candidate
+    that is a near-duplicate of an image already chosen for another action is
+    skipped in favour of the action's next-best candidate. An action whose
+    candidates are all near-duplicates still gets an entry: its best candidate,
+    flagged "fallback" (the caller decides whether to use a shared image).
+
+    Args:
+        actions: Action name per candidate
+        paths: Image file per candidate (same order as actions)
+        weights: Score weights (default DEFAULT_WEIGHTS)
+        duplicate_distance: Max pHash Hamming distance counted as a duplicate
+        workers: Decoder threads
+
+    Returns:
+        Action -> {"index", "path", "scores", "duplicates", "fallback"} for
+        the chosen candidate; "duplicates" lists the other indexes dropped as
+        near-duplicates
+    """
+    pixels, sizes = load_images(paths, workers=workers)
+    scores = score_images(pixels, sizes, weights)
+    distances = hamming_distances(perceptual_hashes(pixels))
+    total = scores["total"]
+
+    by_action: Dict[str, List[int]] = {}
+    for index in np.argsort(-total, kind="stable"):
+        by_action.setdefault(actions[index], []).append(int(index))
+
+    def entry(index: int, fallback: bool) -> Dict:
+        return {
+            "index": index,
+            "path": paths[index],
+            "scores": {name: round(float(values[index]), 4) for name, values in scores.items()},
+            "fallback": fallback,
+        }
+
+    chosen: Dict[str, Dict] = {}
+    taken: List[int] = []
+    dropped: Dict[str, List[int]] = {}
+    # Best-scoring actions pick first, so contested images go where they score highest
+    for action in sorted(by_action, key=lambda a: -total[by_action[a][0]]):
+        for index in by_action[action]:
+            if taken and distances[index, taken].min() <= duplicate_distance:
+                dropped.setdefault(action, []).append(index)
+                continue
+            chosen[action] = entry(index, fallback=False)
+            taken.append(index)
+            break
+        else:
+            # Every candidate duplicates another action's image: best one, flagged
+            best = dropped[action].pop(0)
+            chosen[action] = entry(best, fallback=True)
+
+    for action, chosen_entry in chosen.items():
+        chosen_entry["duplicates"] = dropped.get(action, [])
+    return chosen
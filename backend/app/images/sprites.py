@@ -0,0 +1,115 @@
+"""
+Sprite Atlas - Pack technique thumbnails into a few shared images
+
+Each thumbnail is cover-cropped to a fixed tile and placed on a grid. Sheets
+are written under content-hashed names (served immutable from /static/assets)
+and a JSON map records each technique's sheet and tile coordinates, so a
+recipe page can draw every step icon from one cached request.
+"""
+import hashlib
+import io
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from PIL import Image, ImageOps
+
+from .assets import ASSETS_URL
+from .derivatives import ENCODER_OPTIONS, FORMATS
+
+TILE_WIDTH = 160
+TILE_HEIGHT = 120
+COLUMNS = 8
+MAX_ROWS = 8  # 64 tiles per sheet
+
+SHEET_PREFIX = "technique-sprites"
+
+
+def _sheet_layout(count: int, columns: int, max_rows: int) -> List[int]:
+    """Number of tiles on each sheet"""
+    per_sheet = columns * max_rows
+    return [min(per_sheet, count - start) for start in range(0, count, per_sheet)]
+
+
+def build_atlas(
+    tiles: Sequence[Tuple[str, Path]],
+    assets_dir: Path,
+    formats: Sequence[str] = ("webp", "jpeg"),
+    tile_size: Tuple[int, int] = (TILE_WIDTH, TILE_HEIGHT),
+    columns: int = COLUMNS,
+    max_rows: int = MAX_ROWS
+) -> Dict:
+    """
+    Pack images into sprite sheets
+
+    Args:
+        tiles: (key, image path) pairs, packed in the given order
+        assets_dir: Directory served at ASSETS_URL
+        formats: Sheet formats (keys of FORMATS)
+        tile_size: (width, height) of each tile
+        columns: Tiles per row
+        max_rows: Rows per sheet before starting another sheet
+
+    Returns:
+        Atlas map: {"tile_width", "tile_height",
+                    "sheets": [{"width", "height", "urls": {format: url}}],
+                    "tiles": {key: {"sheet", "x", "y"}}}
+    """
+    assets_dir = Path(assets_dir)
+    assets_dir.mkdir(parents=True, exist_ok=True)
+    tile_width, tile_height = tile_size
+
+    atlas = {"tile_width": tile_width, "tile_height": tile_height, "sheets": [], "tiles": {}}
+    start = 0
+    for sheet_index, count in enumerate(_sheet_layout(len(tiles), columns, max_rows)):
+        rows = -(-count // columns)
+        width = min(count, columns) * tile_width
+        height = rows * tile_height
+        sheet = Image.new("RGB", (width, height), "white")
+
+        for offset, (key, path) in enumerate(tiles[start:start + count]):
+            x = (offset % columns) * tile_width
+            y = (offset // columns) * tile_height
+            with Image.open(path) as img:
+                img = ImageOps.exif_transpose(img).convert("RGB")
+                sheet.paste(ImageOps.fit(img, tile_size, Image.LANCZOS), (x, y))
+            atlas["tiles"][key] = {"sheet": sheet_index, "x": x, "y": y}
+        start += count
+
+        urls = {}
+        for fmt in formats:
+            pil_format, ext = FORMATS[fmt]
+            buffer = io.BytesIO()
+            sheet.save(buffer, pil_format, **ENCODER_OPTIONS[fmt])
+            data = buffer.getvalue()
+            filename = f"{SHEET_PREFIX}.{hashlib.sha256(data).hexdigest()[:16]}.{ext}"
+            target = assets_dir / filename
+            if not target.exists():
+                tmp_path = assets_dir / f".{filename}.tmp"
+                tmp_path.write_bytes(data)
+                os.replace(tmp_path, target)
+            urls[fmt] = f"{ASSETS_URL}/{filename}"
+
+        atlas["sheets"].append({"width": width, "height": height, "urls": urls})
+
+    return atlas
+
+
+def save_atlas(atlas: Dict, path: Path):
+    """Write an atlas map atomically"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(atlas, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def load_atlas(path: Path) -> Optional[Dict]:
+    """Read an atlas map, or None if no atlas has been built"""
+    path = Path(path)
+    if not path.exists():
+        return None
+    with open(path, "r") as f:
+        return json.load(f)
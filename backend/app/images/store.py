@@ -0,0 +1,180 @@
+"""
+Image Store - Content-addressed storage for technique images
+
+Each distinct image is stored once as <sha256><ext>. manifest.json maps
+action -> source (pexels, curated, demo, real, ...) -> blob, so images are
+resolved with one manifest read instead of probing filename patterns, and
+identical files from different folders share a blob.
+"""
+import json
+import os
+import re
+import shutil
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .derivatives import SOURCE_EXTENSIONS, hash_file
+
+STORE_URL = "/static/images/store"
+MANIFEST_NAME = "manifest.json"
+
+# Blob file names (<sha256><ext>); only these are served immutable
+BLOB_NAME = re.compile(r"[0-9a-f]{64}\.[a-z0-9]+")
+
+# Preferred source when an action has images from several downloaders
+SOURCE_PRIORITY = ("pexels", "curated", "demo", "real")
+
+
+def parse_image_filename(filename: str) -> Optional[Tuple[str, str]]:
+    """
+    Split a downloader filename like stir-fry-pexels.jpg into (action, source)
+
+    Args:
+        filename: Image filename
+
+    Returns:
+        (action, source), or None if the name doesn't follow the pattern
+    """
+    stem = Path(filename).stem
+    if "-" not in stem:
+        return None
+    action, source = stem.rsplit("-", 1)
+    return action, source
+
+
+class ImageStore:
+    """Content-addressed image blobs plus an action -> source -> blob manifest"""
+
+    def __init__(self, store_dir: str):
+        """
+        Args:
+            store_dir: Directory holding blobs and manifest.json (served at STORE_URL)
+        """
+        self.store_dir = Path(store_dir)
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        manifest = self._load_manifest()
+        self.blobs: Dict[str, Dict] = manifest.get("blobs", {})
+        self.actions: Dict[str, Dict[str, str]] = manifest.get("actions", {})
+
+    def _load_manifest(self) -> Dict:
+        path = self.store_dir / MANIFEST_NAME
+        if not path.exists():
+            return {}
+        with open(path, "r") as f:
+            return json.load(f)
+
+    def save(self):
+        """Write the manifest atomically"""
+        path = self.store_dir / MANIFEST_NAME
+        tmp_path = self.store_dir / f".{MANIFEST_NAME}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"blobs": self.blobs, "actions": self.actions}, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, path)
+
+    def blob_filename(self, digest: str) -> str:
+        return f"{digest}{self.blobs[digest]['ext']}"
+
+    def blob_path(self, digest: str) -> Path:
+        return self.store_dir / self.blob_filename(digest)
+
+    def blob_url(self, digest: str) -> str:
+        return f"{STORE_URL}/{self.blob_filename(digest)}"
+
+    def digest_for_url(self, url: Optional[str]) -> Optional[str]:
+        """
+        Get the blob digest behind a store URL
+
+        Args:
+            url: URL as stored on a model
+
+        Returns:
+            Digest, or None if the URL isn't a known store blob
+        """
+        if not url or not url.startswith(STORE_URL + "/"):
+            return None
+        digest = Path(url).stem
+        return digest if digest in self.blobs else None
+
+    def add(self, path: Path, action: str, source: str) -> str:
+        """
+        Store a file (once per distinct content) and record it for an action/source
+
+        Args:
+            path: Image file to add
+            action: Cooking action canonical name
+            source: Where the image came from (pexels, curated, demo, real, ...)
+
+        Returns:
+            Blob digest
+        """
+        path = Path(path)
+        digest = hash_file(path)
+        if digest not in self.blobs:
+            self.blobs[digest] = {"ext": path.suffix.lower(), "bytes": path.stat().st_size}
+            target = self.blob_path(digest)
+            tmp_path = self.store_dir / f".{target.name}.tmp"
+            shutil.copyfile(path, tmp_path)
+            os.replace(tmp_path, target)
+        self.actions.setdefault(action, {})[source] = digest
+        return digest
+
+    def add_directory(self, directory: Path, overwrite: bool = True) -> List[Tuple[str, str, str]]:
+        """
+        Add every <action>-<source>.<ext> image in a directory
+
+        Args:
+            directory: Directory to scan
+            overwrite: Replace existing action/source entries (False: only fill gaps)
+
+        Returns:
+            (action, source, digest) for each file added
+        """
+        directory = Path(directory)
+        if not directory.is_dir():
+            return []
+
+        added = []
+        for path in sorted(directory.iterdir()):
+            if not path.is_file() or path.suffix.lower() not in SOURCE_EXTENSIONS:
+                continue
+            parsed = parse_image_filename(path.name)
+            if parsed is None:
+                continue
+            action, source = parsed
+            if not overwrite and source in self.actions.get(action, {}):
+                continue
+            added.append((action, source, self.add(path, action, source)))
+        return added
+
+    def resolve(self, action: str, priority: Tuple[str, ...] = SOURCE_PRIORITY) -> Optional[Tuple[str, str]]:
+        """
+        Pick the image for an action
+
+        Args:
+            action: Cooking action canonical name
+            priority: Sources to consider, most preferred first
+
+        Returns:
+            (source, digest), or None if the action has no image from those sources
+        """
+        sources = self.actions.get(action, {})
+        for source in priority:
+            if source in sources:
+                return source, sources[source]
+        return None
+
+    def prune(self) -> int:
+        """
+        Delete blobs no action refers to
+
+        Returns:
+            Number of blobs removed
+        """
+        referenced = {d for sources in self.actions.values() for d in sources.values()}
+        removed = 0
+        for digest in list(self.blobs):
+            if digest not in referenced:
+                self.blob_path(digest).unlink(missing_ok=True)
+                del self.blobs[digest]
+                removed += 1
+        return removed
@@ -0,0 +1,267 @@
+"""
+Instrumentation - Per-request SQL query tracking and query budgets
+
+SQLAlchemy cursor events count statements and DB time for the request being
+handled. The counts feed /metrics, are echoed as X-DB-Queries / X-DB-Time
+response headers in debug mode, and are checked against the query budget
+declared on each endpoint with @query_budget.
+"""
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterator, List, Optional
+
+from sqlalchemy import event
+from starlette.routing import Match
+
+from .metrics import (
+    DB_POOL_CHECKOUT_WAIT,
+    DB_QUERIES_PER_REQUEST,
+    DB_TIME_PER_REQUEST,
+    REQUEST_LATENCY,
+    REQUESTS_TOTAL,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class RequestStats:
+    """Mutable per-request counters shared with threadpool workers"""
+    __slots__ = ("db_queries", "db_time")
+
+    def __init__(self):
+        self.db_queries = 0
+        self.db_time = 0.0
+
+
+class QueryCounter:
+    """Counts every statement executed while active (see count_queries)"""
+    __slots__ = ("count", "statements")
+
+    def __init__(self):
+        self.count = 0
+        self.statements: List[str] = []
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised when an endpoint executes more queries than its declared budget"""
+    pass
+
+
+_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+_active_counters: List[QueryCounter] = []
+
+
+def current_request_stats() -> Optional[RequestStats]:
+    """Get stats for the request being handled, if any"""
+    return _request_stats.get()
+
+
+def instrument_engine(engine):
+    """
+    Attach query timing and pool checkout timing to a SQLAlchemy engine
+
+    Both survive engine.dispose() (see instrument_pool).
+
+    Args:
+        engine: SQLAlchemy Engine
+    """
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+        stats = _request_stats.get()
+        if stats is not None:
+            stats.db_queries += 1
+            stats.db_time += elapsed
+        for counter in _active_counters:
+            counter.count += 1
+            counter.statements.append(statement)
+
+    instrument_pool(engine)
+
+
+_timed_pool_classes: Dict[type, type] = {}
+
+
+def _timed_pool_class(pool_class: type) -> type:
+    """Subclass of a pool class whose connect() feeds DB_POOL_CHECKOUT_WAIT"""
+    timed = _timed_pool_classes.get(pool_class)
+    if timed is None:
+        def connect(self):
+            start = time.perf_counter()
+            try:
+                return pool_class.connect(self)
+            finally:
+                DB_POOL_CHECKOUT_WAIT.observe(time.perf_counter() - start)
+
+        timed = type(f"Timed{pool_class.__name__}", (pool_class,), {"connect": connect, "__timed__": True})
+        _timed_pool_classes[pool_class] = timed
+    return timed
+
+
+def instrument_pool(engine):
+    """
+    Time connection checkouts from an engine's pool
+
+    Pools have no "before checkout" event, so the pool's class is swapped for
+    a subclass timing connect(). Pool.recreate() builds the new pool from
+    self.__class__, so the timing survives engine.dispose(); only a pool
+    assigned to engine.pool from elsewhere needs this called again. Safe to
+    call more than once.
+
+    Args:
+        engine: SQLAlchemy Engine
+    """
+    pool = engine.pool
+    if not getattr(pool, "__timed__", False):
+        pool.__class__ = _timed_pool_class(type(pool))
+
+
+@contextmanager
+def count_queries() -> Iterator[QueryCounter]:
+    """
+    Count all SQL statements executed inside the block, on any thread
+
+    Yields:
+        QueryCounter updated as statements run
+    """
+    counter = QueryCounter()
+    _active_counters.append(counter)
+    try:
+        yield counter
+    finally:
+        _active_counters.remove(counter)
+
+
+def query_budget(max_queries: int) -> Callable:
+    """
+    Declare the maximum number of SQL statements an endpoint may execute
+
+    Place it below the router decorator:
+
+        @router.get("/{recipe_id}")
+        @query_budget(3)
+        async def get_recipe(...): ...
+
+    Args:
+        max_queries: Query budget for one request
+
+    Returns:
+        Decorator that tags the endpoint function
+    """
+    def decorator(func: Callable) -> Callable:
+        func.__query_budget__ = max_queries
+        return func
+    return decorator
+
+
+def get_query_budget(endpoint: Callable) -> Optional[int]:
+    """Get the query budget declared on an endpoint, if any"""
+    return getattr(endpoint, "__query_budget__", None)
+
+
+def assert_query_budget(client, method: str, url: str, budget: Optional[int] = None, **kwargs):
+    """
+    Test helper: make a request and fail if it exceeds its query budget
+
+    Args:
+        client: fastapi.testclient.TestClient for the app
+        method: HTTP method
+        url: Request path (query string allowed)
+        budget: Budget to enforce (default: the one declared on the endpoint)
+        **kwargs: Passed through to client.request (json=, params=, ...)
+
+    Returns:
+        The response
+
+    Raises:
+        QueryBudgetExceeded: If more statements ran than the budget allows
+    """
+    if budget is None:
+        path = url.split("?", 1)[0]
+        scope = {"type": "http", "method": method.upper(), "path": path}
+        for route in client.app.routes:
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                budget = get_query_budget(getattr(route, "endpoint", None))
+                break
+        if budget is None:
+            raise ValueError(f"No query budget declared for {method.upper()} {path}")
+
+    with count_queries() as counter:
+        response = client.request(method, url, **kwargs)
+
+    if counter.count > budget:
+        statements = "\n".join(f"  {s}" for s in counter.statements)
+        raise QueryBudgetExceeded(
+            f"{method.upper()} {url} executed {counter.count} queries "
+            f"(budget {budget}):\n{statements}"
+        )
+    return response
+
+
+class InstrumentationMiddleware:
+    """
+    ASGI middleware tracking per-request latency and DB usage
+
+    Args:
+        app: ASGI app
+        record_metrics: Record latency/DB histograms for /metrics
+        debug_headers: Add X-DB-Queries / X-DB-Time headers and warn on budget overruns
+    """
+
+    def __init__(self, app, record_metrics: bool = True, debug_headers: bool = False):
+        self.app = app
+        self.record_metrics = record_metrics
+        self.debug_headers = debug_headers
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if self.debug_headers:
+                    headers = list(message.get("headers", []))
+                    headers.append((b"x-db-queries", str(stats.db_queries).encode()))
+                    headers.append((b"x-db-time", f"{stats.db_time * 1000:.2f}".encode()))
+                    message = dict(message, headers=headers)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            _request_stats.reset(token)
+
+            # Use the route template, not the raw path, to bound label cardinality
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or "unmatched"
+            method = scope["method"]
+
+            if self.record_metrics:
+                REQUEST_LATENCY.labels(method, route_path).observe(elapsed)
+                REQUESTS_TOTAL.labels(method, route_path, str(status_code)).inc()
+                DB_QUERIES_PER_REQUEST.labels(route_path).observe(stats.db_queries)
+                DB_TIME_PER_REQUEST.labels(route_path).observe(stats.db_time)
+
+            if self.debug_headers:
+                budget = get_query_budget(getattr(route, "endpoint", None))
+                if budget is not None and stats.db_queries > budget:
+                    logger.warning(
+                        "%s %s executed %d queries (budget %d)",
+                        method, route_path, stats.db_queries, budget
+                    )
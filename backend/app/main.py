@@ -1,9 +1,15 @@
 """FastAPI application entry point"""
+import asyncio
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from fastapi.staticfiles import StaticFiles
 from .config import settings
 from .database import init_db
+from .metrics import REGISTRY, CONTENT_TYPE
+from .instrumentation import InstrumentationMiddleware
+from .images.assets import ASSET_NAME, ASSETS_URL, ImmutableStaticFiles
+from .images.store import BLOB_NAME, STORE_URL
 import os
 
 # Create FastAPI app
@@ -22,24 +28,55 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Mount static files
+# Per-route latency and DB usage (metrics, plus X-DB-* headers in debug mode)
+if settings.METRICS_ENABLED or settings.DEBUG:
+    app.add_middleware(
+        InstrumentationMiddleware,
+        record_metrics=settings.METRICS_ENABLED,
+        debug_headers=settings.DEBUG
+    )
+
+# Mount static files (fingerprinted assets first, so /static doesn't shadow them)
 if os.path.exists(settings.STATIC_DIR):
+    assets_dir = os.path.join(settings.STATIC_DIR, "assets")
+    store_dir = os.path.join(settings.STATIC_DIR, "images", "store")
+    os.makedirs(assets_dir, exist_ok=True)
+    os.makedirs(store_dir, exist_ok=True)
+    app.mount(ASSETS_URL, ImmutableStaticFiles(directory=assets_dir, fingerprinted=ASSET_NAME), name="assets")
+    app.mount(STORE_URL, ImmutableStaticFiles(directory=store_dir, fingerprinted=BLOB_NAME), name="image_store")
     app.mount("/static", StaticFiles(directory=settings.STATIC_DIR), name="static")
 
 # Import routers
-from .api.v1 import recipes, actions, nlp
+from .api.v1 import recipes, actions, nlp, images, admin
 
 # Include routers
 app.include_router(recipes.router, prefix=f"{settings.API_V1_PREFIX}/recipes", tags=["recipes"])
 app.include_router(actions.router, prefix=f"{settings.API_V1_PREFIX}/actions", tags=["actions"])
 app.include_router(nlp.router, prefix=f"{settings.API_V1_PREFIX}/nlp", tags=["nlp"])
+app.include_router(images.router, prefix=f"{settings.API_V1_PREFIX}/images", tags=["images"])
+app.include_router(admin.router, prefix=f"{settings.API_V1_PREFIX}/admin", tags=["admin"])
+
+# Background task reloading the matchers when the taxonomy version changes
+_taxonomy_watcher = None
 
 @app.on_event("startup")
 async def startup_event():
     """Initialize database on startup"""
+    global _taxonomy_watcher
     init_db()
+    if settings.NLP_TAXONOMY_POLL_SECONDS > 0:
+        from .nlp.live import watch_taxonomy_version
+        _taxonomy_watcher = asyncio.create_task(watch_taxonomy_version(settings.NLP_TAXONOMY_POLL_SECONDS))
     print(f"{settings.APP_NAME} v{settings.VERSION} started!")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop the taxonomy watcher and the extraction batchers"""
+    from .nlp.live import close_all
+    if _taxonomy_watcher is not None:
+        _taxonomy_watcher.cancel()
+    await close_all()
+
 @app.get("/")
 async def root():
     """Root endpoint"""
@@ -54,3 +91,9 @@ async def root():
 async def health_check():
     """Health check endpoint"""
     return {"status": "healthy"}
+
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        """Prometheus metrics endpoint"""
+        return PlainTextResponse(REGISTRY.render(), media_type=CONTENT_TYPE)
@@ -0,0 +1,311 @@
+"""
+Metrics - In-process Prometheus-style metrics registry
+
+Metrics are plain Python objects updated in place on the hot path; the
+Prometheus text exposition format is only produced when /metrics is scraped,
+so an unscraped process pays for a few additions and a bisect per observation.
+
+Every process has its own registry. Under app.serve each worker labels its
+samples with worker="<n>" (set_constant_labels), and a scrape is answered by
+whichever worker accepts the connection, so one scrape shows one worker's
+numbers.
+"""
+import threading
+from bisect import bisect_left
+from typing import Callable, Dict, List, Sequence, Tuple
+
+# Latency buckets in seconds (1ms .. 10s)
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Buckets for per-request query counts
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+# Buckets for texts per extraction batch
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Labels added to every sample of this process (see set_constant_labels)
+_constant_labels: Tuple[Tuple[str, str], ...] = ()
+
+
+def _format_value(value: float) -> str:
+    """Format a sample value the way Prometheus expects"""
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def set_constant_labels(**labels: str):
+    """
+    Add labels to every sample this process renders
+
+    Args:
+        labels: Label name -> value, e.g. worker="2"
+    """
+    global _constant_labels
+    _constant_labels = tuple((name, str(value)) for name, value in labels.items())
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    """Render a label set (after the constant labels) as {a="x",b="y"}"""
+    labels = list(_constant_labels) + list(zip(names, values))
+    if not labels:
+        return ""
+    pairs = []
+    for name, value in labels:
+        escaped = str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        pairs.append(f'{name}="{escaped}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+class _Metric:
+    """Base class for labelled metrics"""
+
+    type_name = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values: str):
+        """
+        Get the child metric for a label combination
+
+        Args:
+            values: Label values, in the order of labelnames
+
+        Returns:
+            Child metric (created on first use)
+        """
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {values}")
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def _default(self):
+        """Child used when the metric has no labels"""
+        return self.labels()
+
+    def collect(self) -> List[str]:
+        """Render this metric in Prometheus text format"""
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type_name}",
+        ]
+        for values, child in sorted(self._children.items()):
+            lines.extend(self._collect_child(values, child))
+        return lines
+
+    def _collect_child(self, values, child) -> List[str]:
+        raise NotImplementedError
+
+
+class _CounterChild:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self.value += amount
+
+
+class Counter(_Metric):
+    """Monotonically increasing counter"""
+
+    type_name = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0):
+        self._default().inc(amount)
+
+    def _collect_child(self, values, child) -> List[str]:
+        return [f"{self.name}{_format_labels(self.labelnames, values)} {_format_value(child.value)}"]
+
+
+class Gauge(_Metric):
+    """Gauge whose value is computed by a callback at scrape time"""
+
+    type_name = "gauge"
+
+    def __init__(self, name: str, documentation: str, fn: Callable[[], float]):
+        super().__init__(name, documentation)
+        self._fn = fn
+
+    def collect(self) -> List[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type_name}",
+            f"{self.name}{_format_labels((), ())} {_format_value(self._fn())}",
+        ]
+
+
+class _HistogramChild:
+    __slots__ = ("buckets", "counts", "sum", "_lock")
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        # One slot per bucket plus the +Inf overflow slot (non-cumulative)
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+
+class Histogram(_Metric):
+    """Fixed-bucket histogram"""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float):
+        self._default().observe(value)
+
+    def _collect_child(self, values, child) -> List[str]:
+        with child._lock:
+            counts = list(child.counts)
+            total_sum = child.sum
+
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float("inf"),), counts):
+            cumulative += count
+            labels = _format_labels(
+                self.labelnames + ("le",), tuple(values) + (_format_value(bound),)
+            )
+            lines.append(f"{self.name}_bucket{labels} {cumulative}")
+
+        labels = _format_labels(self.labelnames, values)
+        lines.append(f"{self.name}_sum{labels} {_format_value(total_sum)}")
+        lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Collection of metrics rendered together on scrape"""
+
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        """Render all registered metrics in Prometheus text format"""
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.collect())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+# HTTP
+REQUEST_LATENCY = REGISTRY.register(Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route",
+    ["method", "route"]
+))
+REQUESTS_TOTAL = REGISTRY.register(Counter(
+    "http_requests_total",
+    "HTTP requests by route and status code",
+    ["method", "route", "status"]
+))
+
+# NLP extraction
+EXTRACTOR_STAGE_SECONDS = REGISTRY.register(Histogram(
+    "extractor_stage_duration_seconds",
+    "Time spent per ActionExtractor stage (parse, match, score; batch = whole extract_batch call)",
+    ["stage"]
+))
+EXTRACTION_CACHE_HITS = REGISTRY.register(Counter(
+    "extraction_cache_hits_total",
+    "Extraction results served from the extractor cache"
+))
+EXTRACTION_CACHE_MISSES = REGISTRY.register(Counter(
+    "extraction_cache_misses_total",
+    "Extractions that had to run the NLP pipeline"
+))
+EXTRACTION_BATCH_SIZE = REGISTRY.register(Histogram(
+    "extraction_batch_size",
+    "Texts per ActionExtractor.extract_batch call",
+    buckets=BATCH_SIZE_BUCKETS
+))
+EXTRACTION_QUEUE_WAIT = REGISTRY.register(Histogram(
+    "extraction_queue_wait_seconds",
+    "Time a request waits in the micro-batching queue before its batch runs"
+))
+TAXONOMY_RELOADS_TOTAL = REGISTRY.register(Counter(
+    "taxonomy_reloads_total",
+    "Matcher rebuilds after a taxonomy change, by extractor and outcome",
+    ["extractor", "status"]
+))
+EXTRACTION_PATH_TOTAL = REGISTRY.register(Counter(
+    "extraction_path_total",
+    "Extractions by path: inflection table only (fast) or full spaCy pipeline (full)",
+    ["path"]
+))
+
+
+def _cache_hit_ratio() -> float:
+    hits = EXTRACTION_CACHE_HITS._default().value
+    total = hits + EXTRACTION_CACHE_MISSES._default().value
+    return hits / total if total else 0.0
+
+
+REGISTRY.register(Gauge(
+    "extraction_cache_hit_ratio",
+    "Fraction of extractions served from cache since startup",
+    _cache_hit_ratio
+))
+
+# Database
+DB_QUERIES_PER_REQUEST = REGISTRY.register(Histogram(
+    "http_request_db_queries",
+    "Number of SQL statements executed per request",
+    ["route"],
+    buckets=QUERY_COUNT_BUCKETS
+))
+DB_TIME_PER_REQUEST = REGISTRY.register(Histogram(
+    "http_request_db_duration_seconds",
+    "Total SQL execution time per request",
+    ["route"]
+))
+DB_POOL_CHECKOUT_WAIT = REGISTRY.register(Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting to check a connection out of the pool"
+))
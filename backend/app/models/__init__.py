@@ -1,5 +1,7 @@
 from .recipe import Recipe
 from .recipe_step import RecipeStep
 from .cooking_action import CookingAction
+from .step_parse import StepParse
+from .taxonomy_version import TaxonomyVersion
 
-__all__ = ["Recipe", "RecipeStep", "CookingAction"]
+__all__ = ["Recipe", "RecipeStep", "CookingAction", "StepParse", "TaxonomyVersion"]
@@ -1,14 +1,16 @@
-from sqlalchemy import Column, String, Text, Integer, JSON
+from sqlalchemy import Column, String, Text, Integer, func
 from .base import Base, UUIDMixin, TimestampMixin
+from .types import json_column_type
 
 class CookingAction(Base, UUIDMixin, TimestampMixin):
     """Cooking action taxonomy with image metadata"""
     __tablename__ = "cooking_actions"
 
     canonical_name = Column(String(100), unique=True, nullable=False, index=True)
-    synonyms = Column(JSON, default=list)  # JSON array of synonym strings (SQLite compatible)
+    synonyms = Column(json_column_type(), default=list)  # JSON array of synonym strings (SQLite compatible)
     description = Column(Text)
     category = Column(String(50), index=True)  # cutting-prep, mixing-combining, etc.
+    code = Column(Integer, unique=True, index=True)  # Small stable number used in packed step actions
 
     # Priority and difficulty
     priority = Column(Integer, default=1)  # 1=high, 3=low
@@ -18,10 +20,27 @@ class CookingAction(Base, UUIDMixin, TimestampMixin):
     wikimedia_file_id = Column(String(255))  # e.g., "File:Dicing_onions.jpg"
     image_url = Column(Text)  # Full URL to processed image
     thumbnail_url = Column(Text)  # Thumbnail URL
+    image_variants = Column(json_column_type())  # [{url, width, height, format}] resized derivatives
+    image_width = Column(Integer)  # Intrinsic size of image_url, for layout before load
+    image_height = Column(Integer)
+    image_placeholder = Column(Text)  # Tiny blurred preview as a data: URI
 
     # Attribution (required for CC licenses)
     attribution = Column(Text)  # Full attribution text
     license = Column(String(50))  # e.g., "CC-BY-SA-4.0"
 
+    @classmethod
+    def next_code(cls, db) -> int:
+        """Code for a new action: one above the highest assigned"""
+        return (db.query(func.max(cls.code)).scalar() or 0) + 1
+
+    def clear_image_derivatives(self):
+        """Drop everything derived from the current image (call when image_url changes)"""
+        self.thumbnail_url = None
+        self.image_variants = None
+        self.image_width = None
+        self.image_height = None
+        self.image_placeholder = None
+
     def __repr__(self):
         return f"<CookingAction(id={self.id}, name={self.canonical_name})>"
@@ -1,6 +1,7 @@
-from sqlalchemy import Column, String, Text, JSON
+from sqlalchemy import Column, String, Text
 from sqlalchemy.orm import relationship
 from .base import Base, UUIDMixin, TimestampMixin
+from .types import json_column_type
 
 class Recipe(Base, UUIDMixin, TimestampMixin):
     """Recipe model"""
@@ -9,7 +10,7 @@ class Recipe(Base, UUIDMixin, TimestampMixin):
     title = Column(String(255), nullable=False, index=True)
     description = Column(Text)
     author_id = Column(String(100))  # Future: link to user table
-    recipe_metadata = Column(JSON)  # Store servings, prep_time, cook_time, etc.
+    recipe_metadata = Column(json_column_type())  # Store servings, prep_time, cook_time, etc.
 
     # Relationships
     steps = relationship(
@@ -1,6 +1,7 @@
-from sqlalchemy import Column, Integer, Text, JSON, ForeignKey, String
+from sqlalchemy import Column, Integer, Text, ForeignKey, String, LargeBinary, Index
 from sqlalchemy.orm import relationship
 from .base import Base, UUIDMixin, TimestampMixin
+from .types import json_column_type, json_contains
 
 class RecipeStep(Base, UUIDMixin, TimestampMixin):
     """Recipe step model with extracted cooking actions"""
@@ -10,14 +11,48 @@ class RecipeStep(Base, UUIDMixin, TimestampMixin):
     step_number = Column(Integer, nullable=False)
     instruction_text = Column(Text, nullable=False)
 
-    # JSON array of extracted action IDs (SQLite compatible)
-    extracted_actions = Column(JSON, default=list)
+    # JSON array of extracted action IDs (SQLite compatible; JSONB with a GIN
+    # index on PostgreSQL, see has_actions). No column default: it would also
+    # replace the NULL that packed steps store here
+    extracted_actions = Column(json_column_type(none_as_null=True))
 
     # Store NLP confidence scores for each action
-    nlp_confidence = Column(JSON)  # {action_id: confidence_score}
+    nlp_confidence = Column(json_column_type(none_as_null=True))  # {action_id: confidence_score}
+
+    # Both of the above packed into one blob (app.nlp.packed); when set, the
+    # JSON columns are left empty
+    packed_actions = Column(LargeBinary)
 
     # Relationships
     recipe = relationship("Recipe", back_populates="steps")
 
+    # Stored parse for re-matching (only when NLP_STORE_PARSES is on)
+    parse = relationship("StepParse", uselist=False, cascade="all, delete-orphan")
+
+    __table_args__ = (
+        Index(
+            "ix_recipe_steps_extracted_actions",
+            extracted_actions,
+            postgresql_using="gin",
+            postgresql_ops={"extracted_actions": "jsonb_path_ops"}
+        ).ddl_if(dialect="postgresql"),
+    )
+
+    @classmethod
+    def has_actions(cls, *action_ids: str):
+        """
+        Filter for steps whose extracted actions include all of the given IDs
+
+        Uses the GIN index on PostgreSQL. Packed steps (packed_actions) are
+        not matched: their actions are not stored as JSON.
+
+        Args:
+            action_ids: CookingAction IDs
+
+        Returns:
+            SQL boolean expression
+        """
+        return json_contains(cls.extracted_actions, [str(action_id) for action_id in action_ids])
+
     def __repr__(self):
         return f"<RecipeStep(id={self.id}, recipe_id={self.recipe_id}, step={self.step_number})>"
@@ -0,0 +1,18 @@
+from sqlalchemy import Column, String, LargeBinary, ForeignKey
+from .base import Base, TimestampMixin
+
+class StepParse(Base, TimestampMixin):
+    """Serialized spaCy parse of a recipe step (see app.nlp.docstore)"""
+    __tablename__ = "step_parses"
+
+    step_id = Column(String(36), ForeignKey("recipe_steps.id", ondelete="CASCADE"), primary_key=True)
+
+    # Digest of the instruction text and the pipeline the parse was made from
+    text_sha256 = Column(String(64), nullable=False)
+    pipeline = Column(String(100), nullable=False)
+
+    # DocBin bytes
+    doc = Column(LargeBinary, nullable=False)
+
+    def __repr__(self):
+        return f"<StepParse(step_id={self.step_id}, pipeline={self.pipeline}, bytes={len(self.doc or b'')})>"
@@ -0,0 +1,35 @@
+from sqlalchemy import Column, Integer, update
+from .base import Base, TimestampMixin
+
+class TaxonomyVersion(Base, TimestampMixin):
+    """Single-row counter bumped whenever the cooking action taxonomy changes"""
+    __tablename__ = "taxonomy_version"
+
+    id = Column(Integer, primary_key=True, default=1)
+    version = Column(Integer, nullable=False, default=0)
+
+    @classmethod
+    def current(cls, db) -> int:
+        """Current taxonomy version (0 if it has never been bumped)"""
+        version = db.query(cls.version).filter(cls.id == 1).scalar()
+        return version or 0
+
+    @classmethod
+    def bump(cls, db) -> int:
+        """
+        Increment the version so every worker reloads its matchers
+
+        Args:
+            db: Session (the caller commits)
+
+        Returns:
+            New version
+        """
+        result = db.execute(update(cls).where(cls.id == 1).values(version=cls.version + 1))
+        if result.rowcount == 0:
+            db.add(cls(id=1, version=1))
+            db.flush()
+        return cls.current(db)
+
+    def __repr__(self):
+        return f"<TaxonomyVersion(version={self.version})>"
@@ -0,0 +1,56 @@
+"""
+Column Types - Dialect-aware JSON columns and JSON array containment
+
+JSON columns are JSONB on PostgreSQL, so they can be GIN-indexed and queried
+with @>, and plain JSON on SQLite. json_contains() renders as @> on
+PostgreSQL (served by a jsonb_path_ops GIN index) and as json_each()
+subqueries on SQLite.
+"""
+import json
+from typing import Iterable
+
+from sqlalchemy import JSON, Boolean, String, bindparam
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+
+
+def json_column_type(none_as_null: bool = False):
+    """
+    JSON column type: JSONB on PostgreSQL, JSON elsewhere
+
+    Args:
+        none_as_null: Store Python None as SQL NULL rather than JSON null
+    """
+    return JSON(none_as_null=none_as_null).with_variant(JSONB(none_as_null=none_as_null), "postgresql")
+
+
+class json_contains(FunctionElement):
+    """Whether a JSON array column contains every one of the given values"""
+    type = Boolean()
+    inherit_cache = True
+    name = "json_contains"
+
+    def __init__(self, column, values: Iterable):
+        """
+        Args:
+            column: JSON array column
+            values: Values (strings or numbers) that must all be in the array
+        """
+        super().__init__(column, bindparam(None, json.dumps(list(values)), type_=String()))
+
+
+@compiles(json_contains, "postgresql")
+def _json_contains_postgresql(element, compiler, **kw):
+    column, values = element.clauses
+    return f"{compiler.process(column, **kw)} @> CAST({compiler.process(values, **kw)} AS JSONB)"
+
+
+@compiles(json_contains)
+def _json_contains_default(element, compiler, **kw):
+    # SQLite: no value of the wanted array may be missing from the column
+    column, values = element.clauses
+    return (
+        f"(NOT EXISTS (SELECT 1 FROM json_each({compiler.process(values, **kw)}) AS wanted "
+        f"WHERE wanted.value NOT IN (SELECT value FROM json_each({compiler.process(column, **kw)}))))"
+    )
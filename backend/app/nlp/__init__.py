@@ -1,4 +1,6 @@
 from .extractor import ActionExtractor
 from .action_matcher import ActionMatcher
+from .scoring import ConfidenceScorer
+from .batching import ExtractionBatcher
 
-__all__ = ["ActionExtractor", "ActionMatcher"]
+__all__ = ["ActionExtractor", "ActionMatcher", "ConfidenceScorer", "ExtractionBatcher"]
@@ -1,22 +1,31 @@
 """
 Action Matcher - Maps extracted verbs to cooking actions using taxonomy
+
+Internally every action is a small integer index into action_ids (taxonomy
+order); the lookup tables and the extraction hot path only carry indexes, and
+action_id() turns one into the public ID when results leave the extractor.
 """
-from typing import Dict, List, Optional, Set
+from typing import Dict, List, Mapping, Optional, Sequence, Set, Tuple
 from uuid import UUID
 import json
 from pathlib import Path
 
+from .fuzzy import KNOWN_WORDS, SymSpellIndex
+from .inflections import FormEntry, build_inflection_table, fold_accents, inflect
+
 class ActionMatcher:
     """Maps lemmatized verbs to cooking actions using synonym matching"""
 
-    def __init__(self, cooking_actions: List[Dict]):
+    def __init__(self, cooking_actions: List[Dict], fuzzy_max_distance: int = 0):
         """
         Initialize action matcher with cooking actions from database
 
         Args:
             cooking_actions: List of cooking action dicts with id, canonical_name, synonyms
+            fuzzy_max_distance: Max edit distance for typo-tolerant matching (0 disables)
         """
-        self.action_map: Dict[str, UUID] = {}
+        self.action_ids: List[UUID] = []
+        self.action_map: Dict[str, int] = {}
         self.generic_verbs: Set[str] = {
             "put", "place", "let", "allow", "make", "get", "take",
             "add", "remove", "set", "use", "prepare", "cook"  # Too generic
@@ -24,36 +33,95 @@ class ActionMatcher:
 
         self._build_action_map(cooking_actions)
 
+        # Surface forms ("diced", "sautéing") for tokenizer-only matching
+        self.inflections: Dict[str, FormEntry] = build_inflection_table(
+            self.action_map, self.generic_verbs
+        )
+
+        # Symmetric-delete index over those forms for misspelled verbs
+        self.fuzzy: Optional[SymSpellIndex[FormEntry]] = None
+        if fuzzy_max_distance > 0:
+            self.enable_fuzzy(fuzzy_max_distance)
+
+        # Compiled artifact backing the tables, if loaded from one
+        self.artifact = None
+
+    @classmethod
+    def from_tables(
+        cls,
+        action_map: Mapping[str, int],
+        action_ids: Sequence[UUID],
+        inflections: Mapping[str, FormEntry],
+        generic_verbs: Set[str],
+        fuzzy: Optional[SymSpellIndex] = None
+    ) -> "ActionMatcher":
+        """
+        Create a matcher over prebuilt lookup tables (see app.nlp.artifact)
+
+        Args:
+            action_map: Name -> action index
+            action_ids: Action ID per action index
+            inflections: Surface form -> FormEntry
+            generic_verbs: Verbs that never match
+            fuzzy: Typo-tolerant index, if enabled
+
+        Returns:
+            ActionMatcher that reads the given tables in place
+        """
+        matcher = cls.__new__(cls)
+        matcher.action_map = action_map
+        matcher.action_ids = action_ids
+        matcher.generic_verbs = generic_verbs
+        matcher.inflections = inflections
+        matcher.fuzzy = fuzzy
+        matcher.artifact = None
+        return matcher
+
+    def enable_fuzzy(self, max_distance: int):
+        """Build the typo-tolerant index over the inflection table"""
+        generic_forms = {form for verb in self.generic_verbs for form, _ in inflect(verb)}
+        self.fuzzy = SymSpellIndex(
+            self.inflections.items(),
+            max_distance=max_distance,
+            known_words=KNOWN_WORDS | generic_forms,
+            group=lambda entry: entry.action
+        )
+
     def _build_action_map(self, cooking_actions: List[Dict]):
         """
-        Build lookup map from canonical names and synonyms to action IDs
+        Build lookup map from canonical names and synonyms to action indexes
 
         Args:
             cooking_actions: List of action dicts from database
         """
         for action in cooking_actions:
-            action_id = action["id"]
+            index = len(self.action_ids)
+            self.action_ids.append(action["id"])
 
             # Map canonical name
             canonical = action["canonical_name"].lower()
-            self.action_map[canonical] = action_id
+            self.action_map[canonical] = index
 
             # Map all synonyms
             for synonym in action.get("synonyms", []):
                 synonym_lower = synonym.lower()
                 # Store first matching action (priority given to first in taxonomy)
                 if synonym_lower not in self.action_map:
-                    self.action_map[synonym_lower] = action_id
+                    self.action_map[synonym_lower] = index
 
-    def match(self, lemma: str) -> Optional[UUID]:
+    def action_id(self, index: int) -> UUID:
+        """Public ID of an action index"""
+        return self.action_ids[index]
+
+    def match_index(self, lemma: str) -> Optional[int]:
         """
-        Match a lemmatized verb to a cooking action ID
+        Match a lemmatized verb to a cooking action index
 
         Args:
             lemma: Lemmatized verb from spaCy
 
         Returns:
-            Action UUID if matched, None otherwise
+            Action index if matched, None otherwise
         """
         lemma_lower = lemma.lower()
 
@@ -61,13 +129,57 @@ class ActionMatcher:
         if lemma_lower in self.generic_verbs:
             return None
 
-        # Direct match
-        if lemma_lower in self.action_map:
-            return self.action_map[lemma_lower]
+        # Direct match (multi-word actions like "bring to boil" would need
+        # phrase matching - simplified for MVP)
+        return self.action_map.get(lemma_lower)
 
-        # Handle multi-word actions (e.g., "bring to boil")
-        # This would require phrase matching - simplified for MVP
-        return None
+    def match(self, lemma: str) -> Optional[UUID]:
+        """
+        Match a lemmatized verb to a cooking action ID
+
+        Args:
+            lemma: Lemmatized verb from spaCy
+
+        Returns:
+            Action UUID if matched, None otherwise
+        """
+        index = self.match_index(lemma)
+        return None if index is None else self.action_ids[index]
+
+    def lookup_form(self, form: str) -> Optional[FormEntry]:
+        """
+        Look up an unlemmatized token in the inflection table
+
+        Args:
+            form: Token text as it appears in the step
+
+        Returns:
+            FormEntry (lemma, action index, kind) if the form inflects a known action
+        """
+        form_lower = form.lower()
+        entry = self.inflections.get(form_lower)
+        if entry is None and not form_lower.isascii():
+            entry = self.inflections.get(fold_accents(form_lower))
+        return entry
+
+    def match_fuzzy(self, word: str) -> Optional[Tuple[FormEntry, int]]:
+        """
+        Match a possibly misspelled word ("simer", "julliene")
+
+        Args:
+            word: Token text that had no exact match
+
+        Returns:
+            (FormEntry, edit distance) for the closest action form, or None
+            if fuzzy matching is off or nothing is close enough
+        """
+        if self.fuzzy is None:
+            return None
+        found = self.fuzzy.lookup(word)
+        if found is None:
+            return None
+        _, entry, distance = found
+        return entry, distance
 
     def match_phrase(self, phrase: str) -> Optional[UUID]:
         """
@@ -86,13 +198,13 @@ class ActionMatcher:
 
         # Try exact match first
         if normalized in self.action_map:
-            return self.action_map[normalized]
+            return self.action_ids[self.action_map[normalized]]
 
         # Try individual words
         words = normalized.split()
         for word in words:
             if word in self.action_map:
-                return self.action_map[word]
+                return self.action_ids[self.action_map[word]]
 
         return None
 
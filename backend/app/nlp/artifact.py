@@ -0,0 +1,495 @@
+"""
+Taxonomy Artifact - Compiled, memory-mapped matcher tables
+
+scripts/compile_taxonomy.py compiles the taxonomy (actions, names and
+synonyms, inflected forms, the fuzzy-match index, categories, priorities and
+taxonomy/database IDs) into one versioned binary file. Workers mmap it
+read-only and look names up in place: every table is an open-addressing hash
+table keyed by CRC32, so loading is a header parse and the pages are shared
+through the page cache by every process that maps the file.
+
+Layout (little endian):
+    header     magic "RTAX", format version (u16), fuzzy max distance (u8),
+               fuzzy prefix length (u8), source SHA-256 (32 bytes),
+               taxonomy version (u32, TaxonomyVersion when the database IDs
+               were read, NONE without them), section count (u32)
+    directory  per section: name (8 bytes), offset (u64), length (u64)
+    strings    count (u32), (offset u32, length u32) per string, UTF-8 blob
+    actions    count (u32), per action: taxonomy ID, database ID, canonical
+               name, category (string indexes), priority (u32), first
+               synonym and synonym count (indexes into "synonyms")
+    synonyms   u32 string indexes
+    generic    u32 string indexes of the generic verbs
+    names      hash table: name -> action index
+    forms      hash table: form -> (lemma string, action index, kind)
+    fzwords    hash table: word -> form string, or NONE for known words
+    fzdels     hash table: delete -> (first, count) in "fzlists"
+    fzlists    u32 string indexes
+"""
+import hashlib
+import mmap
+import struct
+import zlib
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Collection, Dict, Iterator, List, Optional, Tuple
+
+from .action_matcher import ActionMatcher
+from .fuzzy import PREFIX_LENGTH, SymSpellIndex
+from .inflections import BASE, GERUND, PAST, FormEntry
+
+MAGIC = b"RTAX"
+FORMAT_VERSION = 2
+
+NONE = 0xFFFFFFFF
+KINDS = (BASE, PAST, GERUND)
+
+_HEADER = struct.Struct("<4sHBB32sII")
+_SECTION = struct.Struct("<8sQQ")
+_U32 = struct.Struct("<I")
+_PAIR = struct.Struct("<II")
+_ACTION = struct.Struct("<IIIIIII")
+_FORM = struct.Struct("<IIB")
+
+
+class ArtifactError(Exception):
+    """Raised when an artifact is missing, corrupt or from another format version"""
+
+
+def file_sha256(path: Path) -> str:
+    """Hex SHA-256 of a file (used to tie an artifact to its source taxonomy)"""
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+
+# ---------------------------------------------------------------------------
+# Compilation
+# ---------------------------------------------------------------------------
+
+class _StringPool:
+    """Interned strings, written as one section"""
+
+    def __init__(self):
+        self.index: Dict[str, int] = {}
+        self.strings: List[str] = []
+
+    def add(self, text: Optional[str]) -> int:
+        if text is None:
+            return NONE
+        if text not in self.index:
+            self.index[text] = len(self.strings)
+            self.strings.append(text)
+        return self.index[text]
+
+    def encode(self) -> bytes:
+        blobs = [text.encode("utf-8") for text in self.strings]
+        header_size = 4 + _PAIR.size * len(blobs)
+        parts = [_U32.pack(len(blobs))]
+        offset = header_size
+        for blob in blobs:
+            parts.append(_PAIR.pack(offset, len(blob)))
+            offset += len(blob)
+        return b"".join(parts + blobs)
+
+
+def _hash_table(pool: _StringPool, items: List[Tuple[str, bytes]], record_size: int) -> bytes:
+    """
+    Encode a hash table section
+
+    Layout: slot count (u32), record size (u32), slots of (key string index,
+    record index), then the fixed-size records.
+    """
+    slot_count = 8
+    while slot_count < 2 * len(items):
+        slot_count *= 2
+
+    slots = [(NONE, NONE)] * slot_count
+    records = []
+    for key, record in items:
+        slot = zlib.crc32(key.encode("utf-8")) & (slot_count - 1)
+        while slots[slot][0] != NONE:
+            slot = (slot + 1) & (slot_count - 1)
+        slots[slot] = (pool.add(key), len(records))
+        records.append(record)
+
+    return b"".join(
+        [_PAIR.pack(slot_count, record_size)]
+        + [_PAIR.pack(*slot) for slot in slots]
+        + records
+    )
+
+
+def _u32_list(values: List[int]) -> bytes:
+    return _U32.pack(len(values)) + b"".join(_U32.pack(v) for v in values)
+
+
+def compile_taxonomy(
+    actions: List[Dict],
+    path: Path,
+    source_sha256: str,
+    fuzzy_max_distance: int = 2,
+    taxonomy_version: Optional[int] = None
+) -> Dict[str, int]:
+    """
+    Compile taxonomy actions into an artifact file (written atomically)
+
+    Tables are produced by a regular ActionMatcher, whose tables already hold
+    action indexes, so a matcher loaded from the artifact behaves exactly like
+    one built from the same actions.
+
+    Args:
+        actions: Action dicts as from load_taxonomy_for_matcher(), optionally
+            with "db_id" (CookingAction.id)
+        path: Output file
+        source_sha256: SHA-256 of the taxonomy JSON the actions came from
+        fuzzy_max_distance: Edit distance the fuzzy index is built for
+        taxonomy_version: TaxonomyVersion of the database the db_ids were
+            read from (None if there are none)
+
+    Returns:
+        Entry counts per table
+    """
+    matcher = ActionMatcher(actions, fuzzy_max_distance=fuzzy_max_distance)
+
+    pool = _StringPool()
+    synonyms: List[int] = []
+    action_records = []
+    for action in actions:
+        action_records.append(_ACTION.pack(
+            pool.add(str(action["id"])),
+            pool.add(str(action["db_id"]) if action.get("db_id") else None),
+            pool.add(action["canonical_name"]),
+            pool.add(action.get("category")),
+            action.get("priority") or 1,
+            len(synonyms),
+            len(action.get("synonyms", [])),
+        ))
+        synonyms.extend(pool.add(synonym) for synonym in action.get("synonyms", []))
+
+    names = _hash_table(pool, [
+        (name, _U32.pack(index)) for name, index in matcher.action_map.items()
+    ], _U32.size)
+    forms = _hash_table(pool, [
+        (form, _FORM.pack(pool.add(entry.lemma), entry.action, KINDS.index(entry.kind)))
+        for form, entry in matcher.inflections.items()
+    ], _FORM.size)
+
+    fz_words = fz_deletes = b""
+    fz_lists: List[int] = []
+    if matcher.fuzzy is not None:
+        fz_words = _hash_table(pool, [
+            (word, _U32.pack(NONE if entry is None else pool.add(word)))
+            for word, entry in matcher.fuzzy.words.items()
+        ], _U32.size)
+        delete_items = []
+        for delete, words in matcher.fuzzy.deletes.items():
+            delete_items.append((delete, _PAIR.pack(len(fz_lists), len(words))))
+            fz_lists.extend(pool.add(word) for word in words)
+        fz_deletes = _hash_table(pool, delete_items, _PAIR.size)
+
+    sections = [
+        (b"actions", _U32.pack(len(action_records)) + b"".join(action_records)),
+        (b"synonyms", _u32_list(synonyms)),
+        (b"generic", _u32_list([pool.add(verb) for verb in sorted(matcher.generic_verbs)])),
+        (b"names", names),
+        (b"forms", forms),
+        (b"fzwords", fz_words),
+        (b"fzdels", fz_deletes),
+        (b"fzlists", _u32_list(fz_lists)),
+    ]
+    # The pool is complete only once every table has been encoded
+    sections.insert(0, (b"strings", pool.encode()))
+
+    header = _HEADER.pack(
+        MAGIC, FORMAT_VERSION, fuzzy_max_distance, PREFIX_LENGTH,
+        bytes.fromhex(source_sha256), NONE if taxonomy_version is None else taxonomy_version, len(sections)
+    )
+    offset = len(header) + _SECTION.size * len(sections)
+    directory = []
+    for name, data in sections:
+        directory.append(_SECTION.pack(name, offset, len(data)))
+        offset += len(data)
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(header)
+        f.write(b"".join(directory))
+        for _, data in sections:
+            f.write(data)
+    tmp_path.replace(path)
+
+    return {
+        "actions": len(actions),
+        "names": len(matcher.action_map),
+        "forms": len(matcher.inflections),
+        "fuzzy_deletes": len(matcher.fuzzy.deletes) if matcher.fuzzy else 0,
+        "strings": len(pool.strings),
+        "bytes": offset,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Loading
+# ---------------------------------------------------------------------------
+
+class _MappedTable(Mapping):
+    """Read-only hash table section, looked up in place in the mapped file"""
+
+    def __init__(self, artifact: "TaxonomyArtifact", offset: int, decode):
+        self._artifact = artifact
+        self._buffer = artifact.buffer
+        self._decode = decode
+        self._slot_count, self._record_size = _PAIR.unpack_from(self._buffer, offset)
+        self._slots = offset + _PAIR.size
+        self._records = self._slots + _PAIR.size * self._slot_count
+        self._mask = self._slot_count - 1
+        self._length = None
+
+    def _find(self, key: str) -> Optional[int]:
+        encoded = key.encode("utf-8")
+        slot = zlib.crc32(encoded) & self._mask
+        string_bytes = self._artifact.string_bytes
+        while True:
+            key_index, record = _PAIR.unpack_from(self._buffer, self._slots + slot * _PAIR.size)
+            if key_index == NONE:
+                return None
+            if string_bytes(key_index) == encoded:
+                return record
+            slot = (slot + 1) & self._mask
+
+    def __getitem__(self, key: str):
+        record = self._find(key)
+        if record is None:
+            raise KeyError(key)
+        return self._decode(self._records + record * self._record_size)
+
+    def get(self, key: str, default=None):
+        record = self._find(key)
+        if record is None:
+            return default
+        return self._decode(self._records + record * self._record_size)
+
+    def __contains__(self, key) -> bool:
+        return isinstance(key, str) and self._find(key) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        for slot in range(self._slot_count):
+            key_index, _ = _PAIR.unpack_from(self._buffer, self._slots + slot * _PAIR.size)
+            if key_index != NONE:
+                yield self._artifact.string(key_index)
+
+    def __len__(self) -> int:
+        if self._length is None:
+            self._length = sum(1 for _ in self)
+        return self._length
+
+
+class TaxonomyArtifact:
+    """A compiled taxonomy mapped read-only into memory"""
+
+    def __init__(self, path: Path):
+        """
+        Map and validate an artifact
+
+        Args:
+            path: File written by compile_taxonomy()
+
+        Raises:
+            ArtifactError: If the file is missing or not a current-format artifact
+        """
+        self.path = Path(path)
+        try:
+            with open(self.path, "rb") as f:
+                self.buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as e:
+            raise ArtifactError(f"Cannot map taxonomy artifact {self.path}: {e}")
+
+        try:
+            magic, version, fuzzy_distance, prefix_length, digest, taxonomy_version, count = _HEADER.unpack_from(
+                self.buffer, 0
+            )
+        except struct.error:
+            raise ArtifactError(f"{self.path} is truncated")
+        if magic != MAGIC:
+            raise ArtifactError(f"{self.path} is not a taxonomy artifact")
+        if version != FORMAT_VERSION:
+            raise ArtifactError(f"{self.path} has format version {version}, expected {FORMAT_VERSION}")
+
+        self.version = version
+        self.fuzzy_max_distance = fuzzy_distance
+        self.fuzzy_prefix_length = prefix_length
+        self.source_sha256 = digest.hex()
+        self.taxonomy_version = None if taxonomy_version == NONE else taxonomy_version
+        self.sections: Dict[str, Tuple[int, int]] = {}
+        for i in range(count):
+            name, offset, length = _SECTION.unpack_from(self.buffer, _HEADER.size + i * _SECTION.size)
+            self.sections[name.rstrip(b"\0").decode("ascii")] = (offset, length)
+
+        self._strings = self.sections["strings"][0]
+        self._string_count, = _U32.unpack_from(self.buffer, self._strings)
+
+    def string_bytes(self, index: int) -> bytes:
+        """Raw UTF-8 bytes of a pooled string"""
+        offset, length = _PAIR.unpack_from(self.buffer, self._strings + 4 + index * _PAIR.size)
+        start = self._strings + offset
+        return self.buffer[start:start + length]
+
+    def string(self, index: int) -> Optional[str]:
+        """A pooled string, or None for the NONE index"""
+        if index == NONE:
+            return None
+        return self.string_bytes(index).decode("utf-8")
+
+    def _u32_list(self, section: str) -> List[int]:
+        offset, _ = self.sections[section]
+        count, = _U32.unpack_from(self.buffer, offset)
+        return list(struct.unpack_from(f"<{count}I", self.buffer, offset + 4))
+
+    def actions(self) -> List[Dict]:
+        """
+        Actions in taxonomy order
+
+        Returns:
+            Dicts with id (taxonomy ID), db_id, canonical_name, synonyms,
+            category and priority
+        """
+        offset, _ = self.sections["actions"]
+        count, = _U32.unpack_from(self.buffer, offset)
+        synonyms = self._u32_list("synonyms")
+        actions = []
+        for i in range(count):
+            taxonomy_id, db_id, name, category, priority, first, n = _ACTION.unpack_from(
+                self.buffer, offset + 4 + i * _ACTION.size
+            )
+            actions.append({
+                "id": self.string(taxonomy_id),
+                "db_id": self.string(db_id),
+                "canonical_name": self.string(name),
+                "synonyms": [self.string(s) for s in synonyms[first:first + n]],
+                "category": self.string(category),
+                "priority": priority,
+            })
+        return actions
+
+    def action_ids(self, ids: str = "taxonomy") -> List[Optional[str]]:
+        """
+        ID per action index
+
+        Args:
+            ids: "taxonomy" for taxonomy IDs or "database" for CookingAction IDs
+        """
+        offset, _ = self.sections["actions"]
+        count, = _U32.unpack_from(self.buffer, offset)
+        field = 0 if ids == "taxonomy" else 1
+        return [
+            self.string(_ACTION.unpack_from(self.buffer, offset + 4 + i * _ACTION.size)[field])
+            for i in range(count)
+        ]
+
+    def table(self, section: str, decode) -> Optional[_MappedTable]:
+        """Hash table section with a record decoder, or None if it is empty"""
+        offset, length = self.sections[section]
+        if not length:
+            return None
+        return _MappedTable(self, offset, decode)
+
+    def generic_verbs(self) -> List[str]:
+        """Verbs the matcher refuses to match"""
+        return [self.string(i) for i in self._u32_list("generic")]
+
+
+def load_matcher(
+    path: Path,
+    ids: str = "taxonomy",
+    fuzzy_max_distance: int = 0,
+    taxonomy_path: Optional[Path] = None,
+    taxonomy_version: Optional[int] = None,
+    database_ids: Optional[Collection[str]] = None
+) -> ActionMatcher:
+    """
+    Build an ActionMatcher whose tables live in a mapped artifact
+
+    Args:
+        path: Compiled artifact
+        ids: "taxonomy" or "database" - which action IDs matches return
+        fuzzy_max_distance: Typo tolerance (0 disables); the compiled index is
+            used when it was built for at least this distance
+        taxonomy_path: If given, reject the artifact unless it was compiled
+            from this exact file
+        taxonomy_version: If given, reject the artifact unless its database
+            IDs were read at this TaxonomyVersion (the database has been
+            reseeded or reloaded since otherwise)
+        database_ids: If given, reject the artifact unless every database ID
+            in it is one of these (it was compiled against another database
+            otherwise)
+
+    Returns:
+        ActionMatcher
+
+    Raises:
+        ArtifactError: If the artifact is unusable (missing, wrong version,
+            stale, or lacking database IDs when they are requested)
+    """
+    artifact = TaxonomyArtifact(path)
+    if taxonomy_path is not None and file_sha256(taxonomy_path) != artifact.source_sha256:
+        raise ArtifactError(f"{path} was compiled from a different {taxonomy_path}")
+
+    action_ids = artifact.action_ids(ids)
+    if any(action_id is None for action_id in action_ids):
+        raise ArtifactError(f"{path} has no {ids} IDs (recompile after seeding the database)")
+    if taxonomy_version is not None and artifact.taxonomy_version != taxonomy_version:
+        raise ArtifactError(
+            f"{path} was compiled at taxonomy version {artifact.taxonomy_version}, "
+            f"the database is at {taxonomy_version} (recompile it)"
+        )
+    if database_ids is not None:
+        known = {str(action_id) for action_id in database_ids}
+        missing = sum(1 for action_id in artifact.action_ids("database") if action_id not in known)
+        if missing:
+            raise ArtifactError(f"{path} refers to {missing} cooking actions missing from the database")
+
+    buffer = artifact.buffer
+    string = artifact.string
+
+    def decode_action(offset: int) -> int:
+        return _U32.unpack_from(buffer, offset)[0]
+
+    def decode_form(offset: int) -> FormEntry:
+        lemma, action, kind = _FORM.unpack_from(buffer, offset)
+        return FormEntry(string(lemma), action, KINDS[kind])
+
+    forms = artifact.table("forms", decode_form)
+
+    def decode_word(offset: int) -> Optional[FormEntry]:
+        form, = _U32.unpack_from(buffer, offset)
+        return None if form == NONE else forms[string(form)]
+
+    fuzzy_lists = artifact.sections["fzlists"][0] + 4
+
+    def decode_words(offset: int) -> List[str]:
+        first, count = _PAIR.unpack_from(buffer, offset)
+        return [string(i) for i in struct.unpack_from(f"<{count}I", buffer, fuzzy_lists + 4 * first)]
+
+    fuzzy = None
+    if 0 < fuzzy_max_distance <= artifact.fuzzy_max_distance and artifact.sections["fzwords"][1]:
+        fuzzy = SymSpellIndex.from_tables(
+            words=artifact.table("fzwords", decode_word),
+            deletes=artifact.table("fzdels", decode_words),
+            max_distance=fuzzy_max_distance,
+            prefix_length=artifact.fuzzy_prefix_length,
+            group=lambda entry: entry.action
+        )
+
+    matcher = ActionMatcher.from_tables(
+        action_map=artifact.table("names", decode_action),
+        action_ids=action_ids,
+        inflections=forms,
+        generic_verbs=set(artifact.generic_verbs()),
+        fuzzy=fuzzy
+    )
+    if fuzzy is None and fuzzy_max_distance > 0:
+        # Compiled for a smaller distance (or none): build the index in memory
+        matcher.enable_fuzzy(fuzzy_max_distance)
+    matcher.artifact = artifact
+    return matcher
@@ -0,0 +1,196 @@
+"""
+Micro-batching - Coalesce concurrent extraction requests into nlp.pipe batches
+
+Requests are queued with a future each. A single worker task per event loop
+takes the oldest request, collects whatever else arrives until max_wait has
+passed since that request was queued (or max_batch_size is reached), and runs
+the batch through ActionExtractor.extract_many in the threadpool. Requests
+that queued up while a batch was running have already waited, so they are
+dispatched immediately: the added latency is bounded by max_wait plus one
+batch, while throughput under load approaches that of client-side batching.
+
+Only one batch is in flight per batcher. The extractor is also called
+directly (the batch endpoint, parse() for stored parses, copies made by a
+taxonomy reload), so it serializes calls into its spaCy pipeline itself; a
+batch waits for those rather than running next to them.
+
+close() stops the worker at shutdown; requests it has not answered fail with
+BatcherClosedError rather than waiting forever.
+"""
+import asyncio
+from typing import List, Optional, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+
+from ..metrics import EXTRACTION_QUEUE_WAIT
+from .extractor import ActionExtractor
+from .results import Extraction
+
+DEFAULT_MAX_BATCH_SIZE = 32
+DEFAULT_MAX_WAIT_MS = 2.0
+
+
+class BatcherClosedError(Exception):
+    """Raised to requests still waiting when their batcher is closed"""
+    pass
+
+
+class ExtractionBatcher:
+    """Dynamic batching scheduler in front of an ActionExtractor"""
+
+    def __init__(
+        self,
+        extractor: ActionExtractor,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        max_wait_ms: float = DEFAULT_MAX_WAIT_MS,
+        pipe_batch_size: int = 64
+    ):
+        """
+        Args:
+            extractor: Extractor that runs the batches
+            max_batch_size: Most texts per batch (1 disables batching)
+            max_wait_ms: Longest a request waits for others to join its batch
+            pipe_batch_size: spaCy nlp.pipe batch size within a batch
+        """
+        self.extractor = extractor
+        self.max_batch_size = max(max_batch_size, 1)
+        self.max_wait = max(max_wait_ms, 0.0) / 1000
+        self.pipe_batch_size = pipe_batch_size
+
+        # (text, future, enqueue time) per request; rebuilt if the loop changes
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # Requests of the batch being collected or run
+        self._batch: List[Tuple] = []
+
+    async def extract(self, text: str) -> Extraction:
+        """
+        Extract actions from one text as part of the next batch
+
+        Args:
+            text: Recipe instruction text
+
+        Returns:
+            Same result as ActionExtractor.extract
+        """
+        return (await self.extract_many([text]))[0]
+
+    async def extract_many(self, texts: List[str]) -> List[Extraction]:
+        """
+        Queue several texts at once (e.g. the steps of one recipe)
+
+        Args:
+            texts: Recipe instruction texts
+
+        Returns:
+            One Extraction per text, in input order
+        """
+        if not texts:
+            return []
+        queue = self._ensure_worker()
+        loop = self._loop
+
+        futures = []
+        for text in texts:
+            future = loop.create_future()
+            queue.put_nowait((text, future, loop.time()))
+            futures.append(future)
+        return list(await asyncio.gather(*futures))
+
+    def _ensure_worker(self) -> asyncio.Queue:
+        """Start the worker on the running loop (again, if the loop changed or it died)"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run(self._queue))
+        return self._queue
+
+    async def close(self):
+        """
+        Stop the worker and fail the requests it has not answered
+
+        Call at shutdown, on the loop the batcher ran on. Requests still
+        queued or in the batch being run raise BatcherClosedError (a batch
+        already in the threadpool finishes there, unused). A later extract()
+        starts a new worker.
+        """
+        worker, queue, batch = self._worker, self._queue, self._batch
+        # A worker on another loop is left to that loop
+        if worker is None or self._loop is not asyncio.get_running_loop():
+            return
+        self._worker = self._queue = self._loop = None
+        self._batch = []
+
+        worker.cancel()
+        try:
+            await worker
+        except asyncio.CancelledError:
+            pass
+
+        futures = [future for _, future, _ in batch]
+        while not queue.empty():
+            futures.append(queue.get_nowait()[1])
+        for future in futures:
+            if not future.done():
+                future.set_exception(BatcherClosedError("Extraction batcher closed"))
+
+    async def _run(self, queue: asyncio.Queue):
+        """Worker: collect a batch, run it, repeat"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await queue.get()]
+            self._batch = batch
+            deadline = batch[0][2] + self.max_wait
+
+            while len(batch) < self.max_batch_size:
+                if not queue.empty():
+                    batch.append(queue.get_nowait())
+                    continue
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            await self._dispatch(batch, loop)
+            self._batch = []
+
+    async def _dispatch(self, batch: List[Tuple], loop: asyncio.AbstractEventLoop):
+        """Run one batch and resolve its futures"""
+        # Skip requests whose client has gone away
+        batch = [item for item in batch if not item[1].done()]
+        if not batch:
+            return
+
+        now = loop.time()
+        for _, _, queued_at in batch:
+            EXTRACTION_QUEUE_WAIT.observe(now - queued_at)
+
+        try:
+            results = await run_in_threadpool(
+                self.extractor.extract_many, [text for text, _, _ in batch], self.pipe_batch_size
+            )
+        except Exception as e:
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future, _), extraction in zip(batch, results):
+            if not future.done():
+                future.set_result(extraction)
+
+
+def batcher_from_settings(extractor: ActionExtractor) -> ExtractionBatcher:
+    """Wrap an extractor using NLP_MICROBATCH_MAX_SIZE, NLP_MICROBATCH_MAX_WAIT_MS and NLP_PIPE_BATCH_SIZE"""
+    from ..config import settings
+    return ExtractionBatcher(
+        extractor,
+        max_batch_size=settings.NLP_MICROBATCH_MAX_SIZE,
+        max_wait_ms=settings.NLP_MICROBATCH_MAX_WAIT_MS,
+        pipe_batch_size=settings.NLP_PIPE_BATCH_SIZE
+    )
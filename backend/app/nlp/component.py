@@ -0,0 +1,283 @@
+"""
+Cooking Actions Component - spaCy pipeline component tagging cooking actions
+
+Registered as the "cooking_actions" factory. It matches verbs against an
+ActionMatcher, scores them with a ConfidenceScorer and stores one ActionMatch
+record per action, deduplicated and sorted by confidence, in
+doc._.action_matches, with the matcher's ID table in doc._.action_ids. Both
+live in the Doc's user data, so they go through nlp.pipe and DocBin
+(store_user_data=True) like any other annotation.
+
+doc._.actions offers the same results as spans, built on access: each span's
+label is the matched lemma and it carries span._.action_id,
+span._.confidence and, in debug mode, span._.contributions.
+
+Matching is done against the ActionMatcher rather than a token-pattern
+Matcher because it also covers inflection tables, typo-tolerant lookups and
+memory-mapped taxonomies. Callers that swap matchers at runtime pass their own
+via component_cfg={"cooking_actions": {"matcher": ..., "scorer": ...}}.
+"""
+import time
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from spacy.language import Language
+from spacy.tokens import Doc, Span
+
+from .action_matcher import ActionMatcher
+from .inflections import BASE, is_verb_position
+from .results import ActionMatch
+from .scoring import ConfidenceScorer
+from ..metrics import EXTRACTOR_STAGE_SECONDS
+
+COMPONENT_NAME = "cooking_actions"
+
+_MATCH_SECONDS = EXTRACTOR_STAGE_SECONDS.labels("match")
+_SCORE_SECONDS = EXTRACTOR_STAGE_SECONDS.labels("score")
+
+
+def _action_spans(doc: Doc) -> List[Span]:
+    """doc._.actions: the doc's matches as spans"""
+    return [doc.char_span(match[3], match[4], label=match[1]) for match in doc._.action_matches or ()]
+
+
+def _span_match(span: Span) -> Optional[ActionMatch]:
+    """The match a span from doc._.actions stands for"""
+    for match in span.doc._.action_matches or ():
+        # Tuples again after a DocBin round trip
+        if match[3] == span.start_char and match[4] == span.end_char:
+            return ActionMatch(*match)
+    return None
+
+
+def _span_action_id(span: Span):
+    match = _span_match(span)
+    return None if match is None else str(span.doc._.action_ids[match.action])
+
+
+def _span_field(field: str):
+    def getter(span: Span):
+        match = _span_match(span)
+        return None if match is None else getattr(match, field)
+    return getter
+
+
+for _name in ("action_matches", "action_ids"):
+    if not Doc.has_extension(_name):
+        Doc.set_extension(_name, default=None)
+if not Doc.has_extension("actions"):
+    Doc.set_extension("actions", getter=_action_spans)
+if not Span.has_extension("action_id"):
+    Span.set_extension("action_id", getter=_span_action_id)
+for _name in ("confidence", "contributions"):
+    if not Span.has_extension(_name):
+        Span.set_extension(_name, getter=_span_field(_name))
+
+
+class CookingActionsComponent:
+    """Pipeline component writing cooking action spans (see module docstring)"""
+
+    def __init__(self, nlp: Language, name: str = COMPONENT_NAME):
+        self.name = name
+        self.matcher: Optional[ActionMatcher] = None
+        self.scorer: Optional[ConfidenceScorer] = None
+
+    def set_matcher(self, matcher: ActionMatcher, scorer: ConfidenceScorer):
+        """
+        Set the default matcher and scorer
+
+        Args:
+            matcher: ActionMatcher with a loaded taxonomy
+            scorer: Confidence scorer
+        """
+        self.matcher = matcher
+        self.scorer = scorer
+
+    def __call__(
+        self,
+        doc: Doc,
+        matcher: Optional[ActionMatcher] = None,
+        scorer: Optional[ConfidenceScorer] = None
+    ) -> Doc:
+        """
+        Tag the cooking actions of a tagged (and ideally parsed) doc
+
+        Args:
+            doc: Doc with POS tags and lemmas
+            matcher: Matcher for this call (default: set_matcher's)
+            scorer: Scorer for this call (default: set_matcher's)
+
+        Returns:
+            The doc, with doc._.action_matches set
+        """
+        matcher = matcher or self.matcher
+        scorer = scorer or self.scorer
+        if matcher is None or scorer is None:
+            raise ValueError(f"{self.name}: call set_matcher() before using the component")
+
+        start = time.perf_counter()
+        candidates = self._match_verbs(doc, matcher)
+        _MATCH_SECONDS.observe(time.perf_counter() - start)
+        self._set_matches(doc, candidates, matcher, scorer, parsed=doc.has_annotation("DEP"))
+        return doc
+
+    def pipe(
+        self,
+        stream: Iterable[Doc],
+        batch_size: int = 128,
+        matcher: Optional[ActionMatcher] = None,
+        scorer: Optional[ConfidenceScorer] = None
+    ) -> Iterator[Doc]:
+        """Tag a stream of docs (see __call__); used by nlp.pipe"""
+        for doc in stream:
+            yield self(doc, matcher=matcher, scorer=scorer)
+
+    def annotate_tokens(
+        self,
+        doc: Doc,
+        matcher: Optional[ActionMatcher] = None,
+        scorer: Optional[ConfidenceScorer] = None
+    ) -> bool:
+        """
+        Tag a tokenizer-only doc from the inflection table, if it's unambiguous
+
+        Args:
+            doc: Tokenized doc with sentence boundaries
+            matcher: Matcher for this call (default: set_matcher's)
+            scorer: Scorer for this call (default: set_matcher's)
+
+        Returns:
+            True if the doc was tagged; False if a match needs POS tags, in
+            which case the doc is left untouched for the full pipeline
+        """
+        matcher = matcher or self.matcher
+        scorer = scorer or self.scorer
+
+        start = time.perf_counter()
+        candidates = self._match_forms(doc, matcher)
+        _MATCH_SECONDS.observe(time.perf_counter() - start)
+        if candidates is None:
+            return False
+        self._set_matches(doc, candidates, matcher, scorer, parsed=False)
+        return True
+
+    def _set_matches(
+        self,
+        doc: Doc,
+        candidates: List[Tuple],
+        matcher: ActionMatcher,
+        scorer: ConfidenceScorer,
+        parsed: bool
+    ):
+        """
+        Score candidates and store the best match per action
+
+        Args:
+            doc: Doc the candidates come from
+            candidates: (sentence, token, lemma, action index, edits) tuples
+            matcher: Matcher the action indexes refer to
+            scorer: Confidence scorer
+            parsed: Whether the doc has a dependency parse
+        """
+        start = time.perf_counter()
+        best: Dict[int, ActionMatch] = {}
+        sentence_features: Dict[int, Dict[str, float]] = {}
+
+        for sent, verb, lemma, action, edits in candidates:
+            if sent.start not in sentence_features:
+                sentence_features[sent.start] = scorer.sentence_features(sent)
+            confidence, contributions = scorer.score(
+                verb, sent, sentence_features[sent.start], parsed=parsed, edits=edits
+            )
+
+            # Only keep actions that clear the threshold, once each (highest confidence)
+            if not scorer.accepts(confidence):
+                continue
+            if action in best and best[action].confidence >= confidence:
+                continue
+            best[action] = ActionMatch(
+                action, lemma, confidence, verb.idx, verb.idx + len(verb), contributions
+            )
+
+        doc._.action_matches = tuple(sorted(best.values(), key=lambda match: match.confidence, reverse=True))
+        doc._.action_ids = matcher.action_ids
+        _SCORE_SECONDS.observe(time.perf_counter() - start)
+
+    @staticmethod
+    def _match_forms(doc: Doc, matcher: ActionMatcher) -> Optional[List[Tuple]]:
+        """
+        Match tokens of an untagged doc against the inflection table
+
+        Args:
+            doc: Tokenized doc with sentence boundaries
+            matcher: ActionMatcher
+
+        Returns:
+            (sentence, token, lemma, action index, edits) candidates, or None if
+            any match is ambiguous without part-of-speech tags, or a sentence
+            with words in it matched nothing (its verb may be a form the table
+            lacks, e.g. an irregular one, which only the lemmatizer finds)
+        """
+        candidates = []
+        for sent in doc.sents:
+            found = len(candidates)
+            has_words = False
+            for token in sent:
+                has_words = has_words or token.is_alpha
+                entry = matcher.lookup_form(token.text)
+                if entry is not None:
+                    if not is_verb_position(token, sent, entry.kind):
+                        return None
+                    candidates.append((sent, token, entry.lemma, entry.action, 0))
+                # Only try to correct words standing where an imperative would
+                elif (
+                    matcher.fuzzy is not None
+                    and token.is_alpha and not token.is_stop
+                    and is_verb_position(token, sent, BASE)
+                ):
+                    fuzzy = matcher.match_fuzzy(token.text)
+                    if fuzzy is not None:
+                        entry, edits = fuzzy
+                        candidates.append((sent, token, entry.lemma, entry.action, edits))
+            if has_words and len(candidates) == found:
+                return None
+        return candidates
+
+    @staticmethod
+    def _match_verbs(doc: Doc, matcher: ActionMatcher) -> List[Tuple]:
+        """
+        Match the lemmas of tagged verbs against the taxonomy
+
+        Args:
+            doc: Doc processed by the tagger
+            matcher: ActionMatcher
+
+        Returns:
+            (sentence, token, lemma, action index, edits) candidates
+        """
+        candidates = []
+        for sent in doc.sents:
+            for verb in sent:
+                if verb.pos_ != "VERB":
+                    continue
+
+                # Get lemmatized form
+                lemma = verb.lemma_.lower()
+
+                # Try to match single verb
+                action = matcher.match_index(lemma)
+                if action is not None:
+                    candidates.append((sent, verb, lemma, action, 0))
+                    continue
+
+                # Fall back to typo-tolerant matching on the surface form
+                fuzzy = matcher.match_fuzzy(verb.text)
+                if fuzzy is not None:
+                    entry, edits = fuzzy
+                    candidates.append((sent, verb, entry.lemma, entry.action, edits))
+        return candidates
+
+
+@Language.factory(COMPONENT_NAME)
+def create_cooking_actions(nlp: Language, name: str) -> CookingActionsComponent:
+    """Factory for the "cooking_actions" pipe (call set_matcher() on it before use)"""
+    return CookingActionsComponent(nlp, name)
@@ -0,0 +1,57 @@
+"""
+Doc Store - Compact serialized parses for re-matching without spaCy
+
+A step's parse is stored as a single-doc DocBin holding only what the
+matching and scoring layers read (lemmas, coarse tags, the dependency tree and
+sentence boundaries), so a taxonomy change can be applied to every step with
+ActionExtractor.extract_from_doc instead of running the pipeline again.
+
+Each stored parse records the digest of the text it was made from and the
+pipeline that made it; a parse whose text or pipeline has changed is stale
+and must be re-parsed.
+"""
+import hashlib
+from typing import Optional
+
+from spacy.tokens import Doc, DocBin
+
+# Token attributes kept in a stored parse (ORTH and whitespace are always kept)
+DOC_ATTRS = ["LEMMA", "POS", "DEP", "HEAD", "SENT_START"]
+
+
+def text_digest(text: str) -> str:
+    """SHA-256 hex digest of an instruction text"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def pipeline_id(nlp) -> str:
+    """Identify a spaCy pipeline by package name and version (e.g. "en_core_web_sm-3.7.1")"""
+    meta = nlp.meta
+    return f"{meta.get('lang', 'xx')}_{meta.get('name', 'pipeline')}-{meta.get('version', '0.0.0')}"
+
+
+def doc_to_bytes(doc: Doc) -> bytes:
+    """
+    Serialize a parsed doc
+
+    Args:
+        doc: Doc processed by the full pipeline
+
+    Returns:
+        DocBin bytes with DOC_ATTRS only
+    """
+    return DocBin(attrs=DOC_ATTRS, docs=[doc]).to_bytes()
+
+
+def doc_from_bytes(data: bytes, vocab) -> Optional[Doc]:
+    """
+    Restore a doc serialized with doc_to_bytes
+
+    Args:
+        data: Stored bytes
+        vocab: Vocab of the pipeline that will match against the doc
+
+    Returns:
+        The doc, or None if the data holds no doc
+    """
+    return next(DocBin().from_bytes(data).get_docs(vocab), None)
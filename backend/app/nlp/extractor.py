@@ -1,23 +1,65 @@
 """
 Action Extractor - Extract cooking actions from recipe text using spaCy + rules
+
+A thin adapter over the "cooking_actions" pipeline component
+(app.nlp.component): it adds the component to the loaded pipeline, tries the
+tokenizer-only fast path first and caches results. Results stay compact
+ActionMatch records (app.nlp.results) until a caller converts them; only
+extract_actions/extract_batch return the public dict form.
 """
+import copy
 import spacy
-from typing import List, Dict, Optional
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Dict, Optional, Tuple
 from uuid import UUID
+from spacy.pipeline import Sentencizer
 from .action_matcher import ActionMatcher
+from .component import COMPONENT_NAME, CookingActionsComponent
+from .results import ActionMatch, Extraction
+from .scoring import ConfidenceScorer, scorer_from_settings
+from ..metrics import (
+    EXTRACTOR_STAGE_SECONDS, EXTRACTION_BATCH_SIZE, EXTRACTION_CACHE_HITS, EXTRACTION_CACHE_MISSES,
+    EXTRACTION_PATH_TOTAL
+)
+
+_PARSE_SECONDS = EXTRACTOR_STAGE_SECONDS.labels("parse")
+_BATCH_SECONDS = EXTRACTOR_STAGE_SECONDS.labels("batch")
+_FAST_PATH = EXTRACTION_PATH_TOTAL.labels("fast")
+_FULL_PATH = EXTRACTION_PATH_TOTAL.labels("full")
 
 class ActionExtractor:
     """Extract cooking actions from recipe step text using hybrid spaCy + rule-based approach"""
 
-    def __init__(self, action_matcher: ActionMatcher, model_name: str = "en_core_web_sm"):
+    def __init__(
+        self,
+        action_matcher: ActionMatcher,
+        model_name: str = "en_core_web_sm",
+        cache_size: int = 0,
+        scorer: Optional[ConfidenceScorer] = None,
+        fast_path: bool = True
+    ):
         """
         Initialize the action extractor
 
         Args:
             action_matcher: ActionMatcher instance with loaded taxonomy
             model_name: spaCy model to use (default: en_core_web_sm)
+            cache_size: Max number of extraction results to cache by text (0 disables)
+            scorer: Confidence scorer (default: built from the NLP_* settings)
+            fast_path: Match tokens against the inflection table first and only
+                run the tagger/parser when a match is ambiguous
         """
         self.action_matcher = action_matcher
+        self.scorer = scorer or scorer_from_settings()
+        self.fast_path = fast_path
+        self._sentencizer = Sentencizer()
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, Tuple[ActionMatch, ...]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        # spaCy pipelines are not thread-safe: one call at a time, cache hits excepted
+        self._pipeline_lock = threading.Lock()
         try:
             self.nlp = spacy.load(model_name)
         except OSError:
@@ -26,12 +68,64 @@ class ActionExtractor:
                 f"Please install it with: python -m spacy download {model_name}"
             )
 
-        # Context words that indicate cooking (boosts confidence)
-        self.cooking_context_words = {
-            "ingredient", "food", "mixture", "pan", "bowl", "pot", "oven",
-            "heat", "oil", "water", "sauce", "until", "minutes", "seconds",
-            "hot", "cold", "warm", "golden", "brown", "tender", "soft"
-        }
+        if COMPONENT_NAME in self.nlp.pipe_names:
+            self.component: CookingActionsComponent = self.nlp.get_pipe(COMPONENT_NAME)
+        else:
+            self.component = self.nlp.add_pipe(COMPONENT_NAME, last=True)
+        self.component.set_matcher(action_matcher, self.scorer)
+
+    def with_matcher(self, action_matcher: ActionMatcher) -> "ActionExtractor":
+        """
+        Copy of this extractor using another matcher
+
+        The copy shares the loaded spaCy pipeline (and the lock serializing
+        calls into it) and scorer but starts with an empty result cache.
+        Calls already running on this extractor keep using its matcher, so
+        swapping the reference is enough to reload a taxonomy.
+
+        Args:
+            action_matcher: Matcher built from the updated taxonomy
+
+        Returns:
+            New ActionExtractor
+        """
+        clone = copy.copy(self)
+        clone.action_matcher = action_matcher
+        clone._cache = OrderedDict()
+        clone._cache_lock = threading.Lock()
+        return clone
+
+    def extract(self, text: str) -> Extraction:
+        """
+        Extract cooking actions from recipe step text, as compact records
+
+        Args:
+            text: Recipe step instruction text
+
+        Returns:
+            Extraction (see app.nlp.results); call its ids(), confidences() or
+            to_dicts() where the result leaves the application
+        """
+        # Preprocess text
+        text = self._preprocess(text)
+
+        matches = self._cache_get(text)
+        if matches is None:
+            with self._pipeline_lock:
+                start = time.perf_counter()
+                doc = self._annotate_tokens(text) if self.fast_path else None
+                if doc is None:
+                    # Ambiguous (or fast path off): process with the full spaCy pipeline
+                    doc = self.nlp(text, component_cfg=self._make_component_cfg())
+                    _FULL_PATH.inc()
+                else:
+                    _FAST_PATH.inc()
+                _PARSE_SECONDS.observe(time.perf_counter() - start)
+
+            matches = doc._.action_matches
+            self._cache_put(text, matches)
+
+        return Extraction(matches, self.action_matcher.action_ids)
 
     def extract_actions(self, text: str) -> List[Dict]:
         """
@@ -47,115 +141,179 @@ class ActionExtractor:
                     "action_id": UUID,
                     "matched_text": str,
                     "confidence": float,
-                    "position": {"start": int, "end": int}
+                    "position": {"start": int, "end": int},
+                    "contributions": {feature: float}  # only when the scorer is in debug mode
                 }
             ]
         """
-        # Preprocess text
-        text = self._preprocess(text)
+        return self.extract(text).to_dicts()
 
-        # Process with spaCy
-        doc = self.nlp(text)
+    def extract_many(self, texts: List[str], batch_size: int = 64) -> List[Extraction]:
+        """
+        Extract cooking actions from many texts at once, as compact records
 
-        # Extract verbs
-        verbs = [token for token in doc if token.pos_ == "VERB"]
+        Cached and unambiguous texts are answered without the tagger; the rest
+        go through a single nlp.pipe() call. Repeated texts are processed once.
 
-        matched_actions = []
+        Args:
+            texts: Recipe step instruction texts
+            batch_size: spaCy pipe batch size
 
-        for verb in verbs:
-            # Get lemmatized form
-            lemma = verb.lemma_.lower()
+        Returns:
+            One Extraction per text, in input order
+        """
+        texts = [self._preprocess(text) for text in texts]
+        results: Dict[str, Optional[Tuple[ActionMatch, ...]]] = {}
+        to_parse: List[str] = []
+
+        start = time.perf_counter()
+        to_annotate: List[str] = []
+        for text in texts:
+            if text in results:
+                continue
+            cached = self._cache_get(text)
+            results[text] = cached
+            if cached is None:
+                to_annotate.append(text)
+
+        if to_annotate:
+            with self._pipeline_lock:
+                for text in to_annotate:
+                    doc = self._annotate_tokens(text) if self.fast_path else None
+                    if doc is None:
+                        to_parse.append(text)
+                    else:
+                        _FAST_PATH.inc()
+                        results[text] = doc._.action_matches
+                        self._cache_put(text, results[text])
+
+                docs = self.nlp.pipe(to_parse, batch_size=batch_size, component_cfg=self._make_component_cfg())
+                for text, doc in zip(to_parse, docs):
+                    _FULL_PATH.inc()
+                    results[text] = doc._.action_matches
+                    self._cache_put(text, results[text])
+
+        _BATCH_SECONDS.observe(time.perf_counter() - start)
+        EXTRACTION_BATCH_SIZE.observe(len(texts))
+
+        # Records are immutable, so repeated texts can share them
+        action_ids = self.action_matcher.action_ids
+        return [Extraction(results[text], action_ids) for text in texts]
+
+    def extract_batch(self, texts: List[str], batch_size: int = 64) -> List[List[Dict]]:
+        """
+        Extract cooking actions from many texts at once (see extract_many)
 
-            # Try to match single verb
-            action_id = self.action_matcher.match(lemma)
+        Args:
+            texts: Recipe step instruction texts
+            batch_size: spaCy pipe batch size
 
-            if action_id:
-                confidence = self._calculate_confidence(verb, doc)
+        Returns:
+            One list of extracted actions per text (see extract_actions), in
+            input order
+        """
+        return [extraction.to_dicts() for extraction in self.extract_many(texts, batch_size)]
 
-                # Only include if confidence above threshold
-                if confidence > 0.5:
-                    matched_actions.append({
-                        "action_id": str(action_id),
-                        "matched_text": lemma,
-                        "confidence": confidence,
-                        "position": {
-                            "start": verb.idx,
-                            "end": verb.idx + len(verb.text)
-                        }
-                    })
+    def parse(self, texts: List[str], batch_size: int = 64) -> List:
+        """
+        Run the full pipeline over texts, bypassing the fast path and cache
 
-        # Deduplicate and sort by confidence
-        deduplicated = self._deduplicate(matched_actions)
+        Args:
+            texts: Recipe step instruction texts (preprocessed here)
+            batch_size: spaCy pipe batch size
 
-        return deduplicated
+        Returns:
+            One parsed Doc per text, for extract_from_doc or the doc store
+        """
+        texts = [self._preprocess(text) for text in texts]
+        with self._pipeline_lock:
+            return list(self.nlp.pipe(texts, batch_size=batch_size, component_cfg=self._make_component_cfg()))
 
-    def _preprocess(self, text: str) -> str:
+    def extract_from_doc(self, doc) -> Extraction:
         """
-        Clean and normalize text
+        Extract cooking actions from an already parsed doc
+
+        Only the cooking_actions component runs, so a stored parse
+        (app.nlp.docstore) can be re-matched against a changed taxonomy
+        without the rest of the pipeline.
 
         Args:
-            text: Raw recipe step text
+            doc: Doc from parse() or doc_from_bytes()
 
         Returns:
-            Cleaned text
+            Extraction (see extract)
         """
-        # Basic cleaning
-        text = text.strip()
+        doc = self.component(doc, self.action_matcher, self.scorer)
+        return Extraction(doc._.action_matches, self.action_matcher.action_ids)
 
-        # Remove extra whitespace
-        text = " ".join(text.split())
+    def _make_component_cfg(self) -> Dict[str, Dict]:
+        """
+        Per-call component settings pinning this extractor's matcher and scorer
 
-        return text
+        A fresh dict every call: nlp.pipe adds its batch size to it.
+        """
+        return {COMPONENT_NAME: {"matcher": self.action_matcher, "scorer": self.scorer}}
+
+    def _annotate_tokens(self, text: str):
+        """Fast path: tokenize, split sentences and tag from the inflection table"""
+        doc = self._sentencizer(self.nlp.make_doc(text))
+        if self.component.annotate_tokens(doc, self.action_matcher, self.scorer):
+            return doc
+        return None
 
-    def _calculate_confidence(self, verb_token, doc) -> float:
+    def _cache_get(self, text: str) -> Optional[Tuple[ActionMatch, ...]]:
         """
-        Calculate confidence score based on context
+        Look up a cached extraction result
 
         Args:
-            verb_token: spaCy token for the verb
-            doc: spaCy doc object
+            text: Preprocessed step text
 
         Returns:
-            Confidence score (0.0 to 1.0)
+            The cached matches, or None on a miss (or if caching is off)
         """
-        score = 1.0
+        if not self.cache_size:
+            return None
+
+        with self._cache_lock:
+            cached = self._cache.get(text)
+            if cached is not None:
+                self._cache.move_to_end(text)
+
+        if cached is None:
+            EXTRACTION_CACHE_MISSES.inc()
+            return None
 
-        # Boost confidence if cooking context words nearby
-        sentence_words = {token.text.lower() for token in verb_token.sent}
-        if sentence_words & self.cooking_context_words:
-            score *= 1.2
+        EXTRACTION_CACHE_HITS.inc()
+        return cached
 
-        # Check if verb has direct object (common in cooking instructions)
-        has_dobj = any(child.dep_ == "dobj" for child in verb_token.children)
-        if has_dobj:
-            score *= 1.1
+    def _cache_put(self, text: str, matches: Tuple[ActionMatch, ...]):
+        """Store an extraction result, evicting the least recently used entry"""
+        if not self.cache_size:
+            return
 
-        # Cap at 1.0
-        return min(score, 1.0)
+        with self._cache_lock:
+            self._cache[text] = matches
+            self._cache.move_to_end(text)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
 
-    def _deduplicate(self, actions: List[Dict]) -> List[Dict]:
+    def _preprocess(self, text: str) -> str:
         """
-        Remove duplicate actions, keeping highest confidence
+        Clean and normalize text
 
         Args:
-            actions: List of extracted actions
+            text: Raw recipe step text
 
         Returns:
-            Deduplicated list, sorted by confidence descending
+            Cleaned text
         """
-        seen = {}
-
-        for action in actions:
-            action_id = action["action_id"]
-
-            if action_id not in seen or action["confidence"] > seen[action_id]["confidence"]:
-                seen[action_id] = action
+        # Basic cleaning
+        text = text.strip()
 
-        # Sort by confidence (highest first)
-        result = list(seen.values())
-        result.sort(key=lambda x: x["confidence"], reverse=True)
+        # Remove extra whitespace
+        text = " ".join(text.split())
 
-        return result
+        return text
 
     def extract_with_phrases(self, text: str) -> List[Dict]:
         """
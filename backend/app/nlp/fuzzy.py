@@ -0,0 +1,216 @@
+"""
+Fuzzy Matching - Typo-tolerant lookup with a symmetric-delete index
+
+Every dictionary word is indexed under each string obtained by deleting up
+to max_distance characters from it (SymSpell). A query generates its own
+deletes and looks them up, which finds every word within the edit distance
+using dict lookups only; candidates are then verified with a bounded
+Damerau-Levenshtein distance. Deletes are taken from a fixed-length prefix
+to keep the index small.
+
+Common recipe words that are one or two edits away from an action ("heat" /
+"beat", "rice" / "dice", "skillet" / "fillet") are indexed too, mapped to None,
+so correctly spelled words are never "corrected" into an action.
+"""
+from typing import Callable, Generic, Hashable, Iterable, List, Mapping, Optional, Set, Tuple, TypeVar
+
+T = TypeVar("T")
+
+DEFAULT_MAX_DISTANCE = 2
+PREFIX_LENGTH = 7
+
+# Shorter words get fewer edits ("stir" is 1 edit from "star", "steer"...)
+MIN_LENGTH_FOR_DISTANCE = {1: 4, 2: 7}
+
+# Correctly spelled recipe words close to an action name
+KNOWN_WORDS = {
+    "baker", "balance", "bare", "base", "basting", "batches", "bear", "beet", "beets",
+    "best", "blaze", "boast", "boat", "boiler", "bold", "boss", "bowl", "bowls", "branch",
+    "breaking", "bringing", "broiler", "browned", "browning", "cake", "cakes", "care",
+    "chilled", "chilling", "chip", "chips", "coach", "coast", "coating", "cold", "cone",
+    "cooking", "cooling", "core", "cored", "crate", "crates", "creamy", "crop", "cups",
+    "deduce", "deglaze", "dimmer", "done", "drained", "draining", "dream", "drill",
+    "fatten", "fear", "feel", "filled", "filling", "flash", "flipped", "flipping",
+    "foaming", "foil", "food", "foods", "found", "gaze", "gear", "gold", "gone", "graze",
+    "greased", "greasing", "grizzle", "hare", "hear", "heat", "heated", "heating", "heats",
+    "hold", "just", "keeping", "kneed", "lake", "late", "lice", "loss", "make", "mashing",
+    "meat", "meats", "melting", "mice", "minutes", "mixer", "more", "moss", "must", "near",
+    "nice", "none", "nuts", "oils", "part", "parts", "patting", "peach", "peaches", "pear",
+    "pears", "place", "placed", "places", "placing", "platter", "pouch", "pouring",
+    "praise", "pressed", "pressing", "produce", "raise", "raisins", "rare", "rate",
+    "reaches", "reel", "reserving", "ribs", "rice", "rill", "rinsing", "ripe", "roach",
+    "rolling", "round", "rounds", "rust", "sake", "salted", "sauce", "sauces", "scooped",
+    "scooping", "seal", "sealed", "seam", "seat", "shaking", "shed", "shimmer", "shop",
+    "sifting", "since", "sizzling", "skillet", "slate", "smash", "smoking", "soaking",
+    "soil", "sound", "spice", "spices", "spin", "splash", "spreading", "spreads", "star",
+    "stead", "steak", "steaks", "steamer", "stem", "stems", "sticking", "stirrer", "store",
+    "stored", "summer", "take", "team", "test", "thawing", "threads", "toil", "tone",
+    "topping", "tops", "trip", "tube", "turn", "wake", "warming", "west", "whiskey",
+    "whisky", "wince", "wound", "wrapped", "wrapping", "year", "zone"
+}
+
+
+def edit_distance(a: str, b: str, max_distance: int) -> int:
+    """
+    Optimal string alignment distance, giving up past max_distance
+
+    Args:
+        a, b: Strings to compare
+        max_distance: Largest distance of interest
+
+    Returns:
+        Distance, or max_distance + 1 if it exceeds max_distance
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+
+    previous2: List[int] = []
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        row_min = i
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                value = min(value, previous2[j - 2] + 1)
+            current[j] = value
+            row_min = min(row_min, value)
+        if row_min > max_distance:
+            return max_distance + 1
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+def _deletes(word: str, max_distance: int) -> Set[str]:
+    """All strings reachable from word by deleting up to max_distance characters"""
+    results = {word}
+    frontier = {word}
+    for _ in range(max_distance):
+        next_frontier = set()
+        for item in frontier:
+            for i in range(len(item)):
+                next_frontier.add(item[:i] + item[i + 1:])
+        results |= next_frontier
+        frontier = next_frontier
+    return results
+
+
+def allowed_distance(word: str, max_distance: int) -> int:
+    """Edit budget for a word of this length (short words get fewer edits)"""
+    allowed = 0
+    for distance, min_length in MIN_LENGTH_FOR_DISTANCE.items():
+        if len(word) >= min_length:
+            allowed = distance
+    return min(allowed, max_distance)
+
+
+class SymSpellIndex(Generic[T]):
+    """Symmetric-delete index from words to values"""
+
+    def __init__(
+        self,
+        entries: Iterable[Tuple[str, T]],
+        max_distance: int = DEFAULT_MAX_DISTANCE,
+        known_words: Iterable[str] = KNOWN_WORDS,
+        prefix_length: int = PREFIX_LENGTH,
+        group: Callable[[T], Hashable] = lambda value: value
+    ):
+        """
+        Args:
+            entries: (word, value) pairs; the first value for a word wins
+            max_distance: Largest edit distance to support
+            known_words: Correctly spelled words that must not be corrected
+            prefix_length: Only this many leading characters are indexed
+            group: Key under which values count as the same answer when
+                several words tie (e.g. forms of one action)
+        """
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+        self.group = group
+        self.words: Mapping[str, Optional[T]] = {}
+        self.deletes: Mapping[str, List[str]] = {}
+
+        for word, value in entries:
+            self._add(word.lower(), value)
+        for word in known_words:
+            self._add(word.lower(), None)
+
+    @classmethod
+    def from_tables(
+        cls,
+        words: Mapping[str, Optional[T]],
+        deletes: Mapping[str, List[str]],
+        max_distance: int = DEFAULT_MAX_DISTANCE,
+        prefix_length: int = PREFIX_LENGTH,
+        group: Callable[[T], Hashable] = lambda value: value
+    ) -> "SymSpellIndex[T]":
+        """
+        Wrap prebuilt tables (e.g. mapped from a compiled taxonomy artifact)
+
+        Args:
+            words: Word -> value (None for known non-matching words)
+            deletes: Delete string -> words it was derived from
+            max_distance: Edit distance to search (at most the one the
+                tables were built for)
+            prefix_length: Prefix length the tables were built with
+            group: See __init__
+        """
+        index = cls((), max_distance=max_distance, known_words=(), prefix_length=prefix_length, group=group)
+        index.words = words
+        index.deletes = deletes
+        return index
+
+    def _add(self, word: str, value: Optional[T]):
+        if word in self.words:
+            return
+        self.words[word] = value
+        for delete in _deletes(word[:self.prefix_length], self.max_distance):
+            self.deletes.setdefault(delete, []).append(word)
+
+    def lookup(self, word: str) -> Optional[Tuple[str, T, int]]:
+        """
+        Find the closest indexed word
+
+        A tie between an action and a known word, or between values in
+        different groups, is treated as no match.
+
+        Args:
+            word: Query word
+
+        Returns:
+            (matched word, value, distance), or None
+        """
+        word = word.lower()
+        if word in self.words:
+            value = self.words[word]
+            return (word, value, 0) if value is not None else None
+
+        max_distance = allowed_distance(word, self.max_distance)
+        if not max_distance:
+            return None
+
+        best_distance = max_distance + 1
+        best: List[str] = []
+        seen: Set[str] = set()
+        for delete in _deletes(word[:self.prefix_length], max_distance):
+            for candidate in self.deletes.get(delete, ()):
+                if candidate in seen:
+                    continue
+                seen.add(candidate)
+                distance = edit_distance(word, candidate, min(best_distance, max_distance))
+                if distance > max_distance:
+                    continue
+                if distance < best_distance:
+                    best_distance, best = distance, [candidate]
+                elif distance == best_distance:
+                    best.append(candidate)
+
+        if not best:
+            return None
+        values = [self.words[candidate] for candidate in best]
+        if any(value is None for value in values):
+            return None
+        if len({self.group(value) for value in values}) > 1:
+            return None
+        return best[0], values[0], best_distance
@@ -0,0 +1,179 @@
+"""
+Inflection Table - Surface forms of taxonomy verbs for tokenizer-only matching
+
+Every single-word taxonomy name is expanded into its regular inflections
+("dice" -> "dices", "diced", "dicing"), plus accent-folded spellings
+("sautéed" -> "sauteed"). Each form records its lemma, action ID and kind, so
+a step can be matched from tokens alone; the tagger is only needed when a
+form could just as well be a noun ("zest", "rest", "plate") and its position
+doesn't settle it.
+"""
+import unicodedata
+from typing import Dict, Iterable, NamedTuple, Tuple
+
+# Form kinds
+BASE = "base"  # bare verb or 3rd person -s: also a noun in many cases
+PAST = "past"  # -ed participle ("diced onions" is still the dice action)
+GERUND = "gerund"  # -ing form
+
+# Irregular forms the suffix rules don't produce
+IRREGULAR_FORMS = {
+    "beat": [("beaten", PAST)],
+    "tear": [("tore", PAST), ("torn", PAST)],
+    "cut": [("cut", PAST)],
+    "shred": [("shred", PAST)],
+}
+
+VOWELS = set("aeiou")
+
+# Words after which a bare form starts a new imperative ("then dice ...")
+CLAUSE_STARTERS = {"then", "next", "finally", "first", "and", "or", ",", ";", ":", "&"}
+
+# Words that can follow an imperative verb but not a noun in a list
+# ("and simmer until ...", "and dice the ...")
+VERB_FOLLOWERS = {
+    "the", "a", "an", "it", "them", "everything", "all", "each", "your",
+    "until", "for", "in", "into", "over", "with", "on", "gently", "well",
+    "briefly", "lightly", "thoroughly", "occasionally", "together", "off", "up"
+}
+
+# Determiners that turn a gerund into a noun ("the filling", "a dusting")
+DETERMINERS = {"the", "a", "an", "some", "this", "that", "your", "its"}
+
+
+class FormEntry(NamedTuple):
+    """One surface form in the inflection table"""
+    lemma: str
+    action: int  # Index into ActionMatcher.action_ids
+    kind: str
+
+
+def fold_accents(text: str) -> str:
+    """Strip combining accents ("sauté" -> "saute")"""
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+def inflect(verb: str) -> Iterable[Tuple[str, str]]:
+    """
+    Generate regular inflections of a verb
+
+    Over-generation is harmless (forms like "saute" -> "sauted" simply never
+    occur in text), so every plausible spelling rule is applied.
+
+    Args:
+        verb: Lowercase base form
+
+    Returns:
+        (form, kind) pairs, starting with the verb itself
+    """
+    # Taxonomy synonyms are sometimes already inflected ("diced")
+    if verb.endswith("ing"):
+        yield verb, GERUND
+    elif verb.endswith("ed"):
+        yield verb, PAST
+    else:
+        yield verb, BASE
+    last = verb[-1]
+
+    if verb.endswith(("s", "sh", "ch", "x", "z")):
+        yield verb + "es", BASE
+    elif last == "y" and len(verb) > 1 and verb[-2] not in VOWELS:
+        yield verb[:-1] + "ies", BASE
+    else:
+        yield verb + "s", BASE
+
+    if last == "e":
+        yield verb + "d", PAST
+        yield verb[:-1] + "ing", GERUND
+    elif last == "y" and len(verb) > 1 and verb[-2] not in VOWELS:
+        yield verb[:-1] + "ied", PAST
+        yield verb + "ing", GERUND
+    else:
+        yield verb + "ed", PAST
+        yield verb + "ing", GERUND
+        # Consonant doubling after a short vowel ("stir" -> "stirred")
+        if len(verb) >= 3 and last not in VOWELS | {"w", "x", "y"} \
+                and verb[-2] in VOWELS and verb[-3] not in VOWELS:
+            yield verb + last + "ed", PAST
+            yield verb + last + "ing", GERUND
+
+    yield from IRREGULAR_FORMS.get(verb, [])
+
+
+def build_inflection_table(action_map: Dict[str, int], generic_verbs: Iterable[str]) -> Dict[str, FormEntry]:
+    """
+    Expand a matcher's action map into a surface form table
+
+    Generated forms never override a name that is itself in the taxonomy, so
+    "bone" stays with debone even though it could be generated from another
+    entry.
+
+    Args:
+        action_map: Lowercase taxonomy name -> action index (ActionMatcher.action_map)
+        generic_verbs: Names the matcher refuses to match
+
+    Returns:
+        Lowercase surface form -> FormEntry
+    """
+    generic = set(generic_verbs)
+    names = [
+        (name, action) for name, action in action_map.items()
+        if " " not in name and name not in generic
+    ]
+
+    table: Dict[str, FormEntry] = {}
+    for name, action in names:
+        for form, kind in inflect(name):
+            entry = FormEntry(name, action, kind)
+            table.setdefault(form, entry)
+            table.setdefault(fold_accents(form), entry)
+
+    for name, action in names:
+        entry = table[name]
+        if entry.action != action:
+            table[name] = FormEntry(name, action, next(iter(inflect(name)))[1])
+
+    for form in generic:
+        table.pop(form, None)
+    return table
+
+
+def _previous_word(token, sent_start: int):
+    """Previous token in the sentence, skipping -ly adverbs ("then gently fold")"""
+    i = token.i - 1
+    doc = token.doc
+    while i >= sent_start and doc[i].lower_.endswith("ly") and doc[i].is_alpha:
+        i -= 1
+    return doc[i] if i >= sent_start else None
+
+
+def is_verb_position(token, sent, kind: str) -> bool:
+    """
+    Decide from position alone whether a matched form is used as a verb
+
+    Args:
+        token: Token of a tokenizer-only Doc (no tags needed)
+        sent: Sentence Span containing it
+        kind: FormEntry.kind of the token's form
+
+    Returns:
+        True if it's a verb, False if only the tagger can tell
+    """
+    previous = _previous_word(token, sent.start)
+
+    if kind == PAST:
+        return True
+    if kind == GERUND:
+        return previous is None or previous.lower_ not in DETERMINERS
+
+    # Bare form: an imperative starts the sentence or a new clause
+    if previous is None or previous.is_digit:
+        return True
+    if previous.lower_ not in CLAUSE_STARTERS:
+        return False
+    if previous.is_alpha and previous.lower_ not in ("and", "or"):
+        return True  # "then dice ..."
+    # After "and" or a comma it may be one more noun in a list
+    following = token.nbor(1) if token.i + 1 < sent.end else None
+    return following is not None and following.lower_ in VERB_FOLLOWERS
@@ -0,0 +1,169 @@
+"""
+Live Extractors - Hot-reloadable taxonomy with atomic matcher swaps
+
+Each API router owns a LiveExtractor: the current ActionExtractor plus the
+function that builds its matcher. A reload builds the new matcher off the hot
+path and replaces the extractor reference in a single assignment (see
+ActionExtractor.with_matcher), so requests never take a lock and calls that
+are already running finish on the snapshot they started with.
+
+Workers learn about taxonomy changes through the TaxonomyVersion row:
+POST /api/v1/admin/taxonomy/reload (or scripts/5_seed_database.py) bumps it,
+and watch_taxonomy_version() in every worker polls it and reloads when it
+moves.
+"""
+import asyncio
+import logging
+import threading
+from typing import Callable, List, Optional
+
+from fastapi.concurrency import run_in_threadpool
+
+from ..config import settings
+from ..metrics import TAXONOMY_RELOADS_TOTAL
+from .action_matcher import ActionMatcher
+from .batching import ExtractionBatcher, batcher_from_settings
+from .extractor import ActionExtractor
+
+logger = logging.getLogger(__name__)
+
+# Every LiveExtractor in this process, for reload_all()
+_registry: List["LiveExtractor"] = []
+
+# Taxonomy version this process last reloaded for
+_seen_version: Optional[int] = None
+
+
+class LiveExtractor:
+    """Current extractor (and its batcher) for one router, swapped on reload"""
+
+    def __init__(self, name: str, build_matcher: Callable[[bool], ActionMatcher]):
+        """
+        Args:
+            name: Label for logs and metrics (e.g. "recipes")
+            build_matcher: Builds a matcher; its argument says whether the
+                compiled artifact may be used (True on first load, False on
+                reloads, which must read the taxonomy's source of truth)
+        """
+        self.name = name
+        self.build_matcher = build_matcher
+        self._extractor: Optional[ActionExtractor] = None
+        self._batcher: Optional[ExtractionBatcher] = None
+        self._build_lock = threading.Lock()
+        _registry.append(self)
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the extractor has been built yet"""
+        return self._extractor is not None
+
+    def get(self) -> ActionExtractor:
+        """Current extractor (built on first use)"""
+        extractor = self._extractor
+        if extractor is None:
+            with self._build_lock:
+                if self._extractor is None:
+                    self._extractor = ActionExtractor(
+                        self.build_matcher(True),
+                        settings.SPACY_MODEL,
+                        cache_size=settings.NLP_EXTRACTION_CACHE_SIZE,
+                        fast_path=settings.NLP_FAST_PATH
+                    )
+                extractor = self._extractor
+        return extractor
+
+    @property
+    def batcher(self) -> ExtractionBatcher:
+        """Micro-batching scheduler in front of the current extractor"""
+        if self._batcher is None:
+            self._batcher = batcher_from_settings(self.get())
+        return self._batcher
+
+    def reload(self) -> bool:
+        """
+        Rebuild the matcher and swap in an extractor that uses it
+
+        Blocking: call from a worker thread. An extractor that was never
+        loaded is left alone (its first get() reads the current taxonomy).
+
+        Returns:
+            True if a new extractor was swapped in
+        """
+        if self._extractor is None:
+            return False
+
+        matcher = self.build_matcher(False)
+        extractor = self._extractor.with_matcher(matcher)
+        self._extractor = extractor
+        if self._batcher is not None:
+            self._batcher.extractor = extractor
+        return True
+
+
+def reload_all() -> List[str]:
+    """
+    Reload every loaded LiveExtractor in this process (blocking)
+
+    A failed rebuild keeps the previous matcher in service.
+
+    Returns:
+        Names of the extractors that were reloaded
+    """
+    reloaded = []
+    for live in _registry:
+        try:
+            if live.reload():
+                reloaded.append(live.name)
+                TAXONOMY_RELOADS_TOTAL.labels(live.name, "ok").inc()
+        except Exception:
+            logger.exception("Reloading the %s taxonomy failed; keeping the current matcher", live.name)
+            TAXONOMY_RELOADS_TOTAL.labels(live.name, "error").inc()
+    return reloaded
+
+
+async def close_all():
+    """Stop every extraction batcher in this process (call at shutdown)"""
+    for live in _registry:
+        if live._batcher is not None:
+            await live._batcher.close()
+
+
+def _current_version() -> int:
+    from ..database import SessionLocal
+    from ..models import TaxonomyVersion
+
+    db = SessionLocal()
+    try:
+        return TaxonomyVersion.current(db)
+    finally:
+        db.close()
+
+
+def mark_version_seen(version: int):
+    """Record that this process has reloaded for a version (e.g. after an admin reload)"""
+    global _seen_version
+    _seen_version = version
+
+
+async def watch_taxonomy_version(interval: float):
+    """
+    Poll the taxonomy version and reload this process's matchers when it moves
+
+    Args:
+        interval: Seconds between polls
+    """
+    global _seen_version
+    while True:
+        try:
+            version = await run_in_threadpool(_current_version)
+            if _seen_version is None:
+                _seen_version = version
+            elif version != _seen_version:
+                _seen_version = version
+                reloaded = await run_in_threadpool(reload_all)
+                logger.info("Taxonomy version %d: reloaded %s", version, ", ".join(reloaded) or "nothing")
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Checking the taxonomy version failed")
+        await asyncio.sleep(interval)
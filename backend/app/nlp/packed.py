@@ -0,0 +1,157 @@
+"""
+Packed Step Actions - Compact binary encoding of a step's extraction results
+
+RecipeStep.packed_actions replaces the extracted_actions JSON array (36-char
+UUIDs) and the nlp_confidence dict (the same UUIDs again as keys) with one
+small blob: actions are referred to by CookingAction.code, a small stable
+integer, confidences are quantized to the scorer's own precision (4 decimal
+places, so nothing is lost) and each action keeps the span it was matched on.
+
+Layout (little endian):
+    header   format version (u8), action count (u8)
+    actions  per action, highest confidence first: action code (u16),
+             confidence * 10000 (u16), span start (u16), span length (u8);
+             start NO_SPAN when the span is unknown (rows converted from JSON)
+             or does not fit
+"""
+import struct
+from typing import Dict, Iterable, List, Mapping, NamedTuple, Optional, Tuple, Union
+
+from .results import Extraction
+
+FORMAT_VERSION = 1
+CONFIDENCE_SCALE = 10000
+NO_SPAN = 0xFFFF
+MAX_CODE = 0xFFFF
+MAX_ACTIONS = 0xFF
+
+_HEADER = struct.Struct("<BB")
+_ACTION = struct.Struct("<HHHB")
+
+
+class PackedAction(NamedTuple):
+    """One action decoded from a packed step"""
+    code: int  # CookingAction.code
+    confidence: float
+    start: Optional[int]  # Character offsets of the match, if known
+    end: Optional[int]
+
+
+def pack_actions(actions: Iterable[Tuple[int, float, Optional[int], Optional[int]]]) -> bytes:
+    """
+    Encode a step's actions
+
+    Args:
+        actions: (code, confidence, start, end) per action, in result order;
+            start/end may be None
+
+    Returns:
+        Packed bytes
+
+    Raises:
+        ValueError: If a code is out of range or there are too many actions
+    """
+    records = []
+    for code, confidence, start, end in actions:
+        if not 0 <= code <= MAX_CODE:
+            raise ValueError(f"Action code {code} does not fit in a packed step")
+        if start is None or end is None or start >= NO_SPAN or not 0 <= end - start <= 0xFF:
+            start, end = NO_SPAN, NO_SPAN
+        quantized = round(min(max(confidence, 0.0), 1.0) * CONFIDENCE_SCALE)
+        records.append(_ACTION.pack(code, quantized, start, end - start))
+    if len(records) > MAX_ACTIONS:
+        raise ValueError(f"{len(records)} actions do not fit in a packed step")
+    return _HEADER.pack(FORMAT_VERSION, len(records)) + b"".join(records)
+
+
+def unpack_actions(data: bytes) -> List[PackedAction]:
+    """
+    Decode a packed step
+
+    Args:
+        data: Bytes from pack_actions()
+
+    Returns:
+        PackedAction per action, in stored order
+
+    Raises:
+        ValueError: If the data is from another format version
+    """
+    version, count = _HEADER.unpack_from(data)
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Packed step has format version {version}, expected {FORMAT_VERSION}")
+    return [
+        PackedAction(code, quantized / CONFIDENCE_SCALE, None, None) if start == NO_SPAN
+        else PackedAction(code, quantized / CONFIDENCE_SCALE, start, start + length)
+        for code, quantized, start, length in _ACTION.iter_unpack(data[_HEADER.size:_HEADER.size + count * _ACTION.size])
+    ]
+
+
+def pack_extraction(extraction: Extraction, codes: Mapping[str, Optional[int]]) -> Optional[bytes]:
+    """
+    Encode an extraction result for RecipeStep.packed_actions
+
+    Args:
+        extraction: Extractor result with database action IDs
+        codes: Action ID -> CookingAction.code
+
+    Returns:
+        Packed bytes, or None if an action has no code yet (store JSON then)
+    """
+    actions = []
+    for match in extraction.matches:
+        code = codes.get(str(extraction.action_ids[match.action]))
+        if code is None:
+            return None
+        actions.append((code, match.confidence, match.start, match.end))
+    return pack_actions(actions)
+
+
+def step_action_refs(step) -> List[Tuple[Union[str, int], float]]:
+    """
+    A step's actions, whichever way they are stored
+
+    Args:
+        step: RecipeStep (or a row with its three action columns)
+
+    Returns:
+        (action reference, confidence) per action: the CookingAction.code
+        (int) for packed steps, the action ID (str) for JSON ones
+    """
+    data = step.packed_actions
+    if data is not None:
+        version, count = _HEADER.unpack_from(data)
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Packed step has format version {version}, expected {FORMAT_VERSION}")
+        return [
+            (code, quantized / CONFIDENCE_SCALE)
+            for code, quantized, _, _ in _ACTION.iter_unpack(data[_HEADER.size:_HEADER.size + count * _ACTION.size])
+        ]
+    confidence: Dict[str, float] = step.nlp_confidence or {}
+    return [(action_id, confidence.get(action_id, 1.0)) for action_id in step.extracted_actions or []]
+
+
+def store_step_actions(step, extraction: Extraction, codes: Optional[Mapping[str, Optional[int]]] = None) -> bool:
+    """
+    Set a step's actions, packed if possible
+
+    Args:
+        step: RecipeStep
+        extraction: Extractor result with database action IDs
+        codes: Action ID -> CookingAction.code to pack with; None (or an
+            action without a code) stores the JSON columns instead
+
+    Returns:
+        True if the stored actions changed
+    """
+    packed = pack_extraction(extraction, codes) if codes is not None else None
+    if packed is not None:
+        values = (None, None, packed)
+    else:
+        # Action IDs as strings (SQLite compatibility) and their confidence scores
+        values = (extraction.ids(), extraction.confidences(), None)
+
+    if (step.extracted_actions, step.nlp_confidence, step.packed_actions) == values:
+        return False
+    step.extracted_actions, step.nlp_confidence, step.packed_actions = values
+    return True
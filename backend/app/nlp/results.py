@@ -0,0 +1,58 @@
+"""
+Extraction Results - Compact records for the extraction hot path
+
+The component and extractor pass around immutable ActionMatch tuples that
+refer to actions by their integer index in the matcher's action_ids table.
+Nothing is converted to public IDs or result dicts until a caller asks for
+them (Extraction.ids, confidences, to_dicts), which happens once, at the API
+or database boundary.
+"""
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+
+class ActionMatch(NamedTuple):
+    """One extracted action"""
+    action: int  # Index into the matcher's action_ids
+    lemma: str
+    confidence: float
+    start: int  # Character offsets of the matched token
+    end: int
+    contributions: Optional[Dict[str, float]] = None  # Only when the scorer is in debug mode
+
+
+class Extraction(NamedTuple):
+    """Actions extracted from one text, with the ID table their indexes refer to"""
+    matches: Tuple[ActionMatch, ...]
+    action_ids: Sequence
+
+    def ids(self) -> List[str]:
+        """Action IDs, highest confidence first"""
+        action_ids = self.action_ids
+        return [str(action_ids[match.action]) for match in self.matches]
+
+    def confidences(self) -> Dict[str, float]:
+        """Action ID -> confidence"""
+        action_ids = self.action_ids
+        return {str(action_ids[match.action]): match.confidence for match in self.matches}
+
+    def to_dicts(self) -> List[Dict]:
+        """
+        Public result form (see ActionExtractor.extract_actions)
+
+        Returns:
+            One dict per action with action_id, matched_text, confidence,
+            position and, in debug mode, contributions
+        """
+        action_ids = self.action_ids
+        actions = []
+        for match in self.matches:
+            action = {
+                "action_id": str(action_ids[match.action]),
+                "matched_text": match.lemma,
+                "confidence": match.confidence,
+                "position": {"start": match.start, "end": match.end}
+            }
+            if match.contributions is not None:
+                action["contributions"] = match.contributions
+            actions.append(action)
+        return actions
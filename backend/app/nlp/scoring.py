@@ -0,0 +1,152 @@
+"""
+Confidence Scoring - Weighted features for extracted cooking actions
+
+Sentence-level features are computed once per sentence and shared by every
+verb in it; token-level features only look at the verb's own children, so
+scoring a step is linear in its length. The confidence is a weighted sum of
+features, clipped to [0, 1].
+"""
+from typing import Dict, Optional, Set, Tuple
+
+# Context words that indicate cooking
+COOKING_CONTEXT_WORDS = {
+    "ingredient", "food", "mixture", "pan", "bowl", "pot", "oven",
+    "heat", "oil", "water", "sauce", "until", "minutes", "seconds",
+    "hot", "cold", "warm", "golden", "brown", "tender", "soft"
+}
+
+# Weight per feature; "base" is the score of a matched verb with no evidence
+DEFAULT_WEIGHTS = {
+    "base": 0.6,
+    "cooking_context": 0.15,  # sentence mentions cookware, heat, timing...
+    "direct_object": 0.15,    # verb has a direct object ("dice the onion")
+    "sentence_initial": 0.1,  # imperative at the start of the sentence
+    "edit_distance": -0.1,    # per typo corrected by fuzzy matching
+}
+
+DEFAULT_THRESHOLD = 0.5
+
+# Words that open a direct object, for docs without a dependency parse
+OBJECT_STARTERS = {"the", "a", "an", "it", "them", "all", "each", "your", "some", "everything"}
+
+
+def parse_weights(spec: str) -> Dict[str, float]:
+    """
+    Parse a "name:weight,name:weight" string into a weights dict
+
+    Args:
+        spec: Weights spec, e.g. "base:0.6,direct_object:0.2"
+
+    Returns:
+        DEFAULT_WEIGHTS overridden by the given entries
+    """
+    weights = dict(DEFAULT_WEIGHTS)
+    for item in spec.split(","):
+        if not item.strip():
+            continue
+        name, _, value = item.partition(":")
+        name = name.strip()
+        if name not in DEFAULT_WEIGHTS:
+            raise ValueError(f"Unknown confidence feature '{name}' (expected one of {sorted(DEFAULT_WEIGHTS)})")
+        weights[name] = float(value)
+    return weights
+
+
+class ConfidenceScorer:
+    """Scores matched verbs from precomputed sentence features plus token features"""
+
+    def __init__(
+        self,
+        weights: Optional[Dict[str, float]] = None,
+        threshold: float = DEFAULT_THRESHOLD,
+        context_words: Optional[Set[str]] = None,
+        debug: bool = False
+    ):
+        """
+        Args:
+            weights: Weight per feature (missing features use DEFAULT_WEIGHTS)
+            threshold: Minimum confidence for an action to be kept
+            context_words: Words marking a cooking context (default COOKING_CONTEXT_WORDS)
+            debug: Report each feature's contribution alongside the score
+        """
+        self.weights = dict(DEFAULT_WEIGHTS, **(weights or {}))
+        self.threshold = threshold
+        self.context_words = context_words or COOKING_CONTEXT_WORDS
+        self.debug = debug
+
+    def sentence_features(self, sent) -> Dict[str, float]:
+        """
+        Features shared by every verb in a sentence (computed once per sentence)
+
+        Args:
+            sent: spaCy Span for the sentence
+
+        Returns:
+            Feature values in [0, 1]
+        """
+        has_context = any(token.lower_ in self.context_words for token in sent)
+        return {"cooking_context": 1.0 if has_context else 0.0}
+
+    def score(
+        self,
+        token,
+        sent,
+        sentence_features: Dict[str, float],
+        parsed: bool = True,
+        edits: int = 0
+    ) -> Tuple[float, Optional[Dict[str, float]]]:
+        """
+        Score one matched verb
+
+        Args:
+            token: spaCy token for the verb
+            sent: spaCy Span of the sentence containing it
+            sentence_features: Result of sentence_features() for that sentence
+            parsed: Whether the doc has a dependency parse (else the direct
+                object is guessed from the next word)
+            edits: Edit distance of a fuzzy match (0 for exact matches)
+
+        Returns:
+            (confidence, contributions) - contributions maps feature to its
+            weighted contribution in debug mode, else None
+        """
+        features = dict(sentence_features)
+        features["base"] = 1.0
+        features["direct_object"] = 1.0 if self._has_direct_object(token, sent, parsed) else 0.0
+        features["sentence_initial"] = 1.0 if token.i == sent.start else 0.0
+        features["edit_distance"] = float(edits)
+
+        contributions = {
+            name: weight * features.get(name, 0.0)
+            for name, weight in self.weights.items()
+        }
+        confidence = round(min(max(sum(contributions.values()), 0.0), 1.0), 4)
+
+        if not self.debug:
+            return confidence, None
+        return confidence, {name: round(value, 4) for name, value in contributions.items()}
+
+    def _has_direct_object(self, token, sent, parsed: bool) -> bool:
+        """Check for a direct object via the parse, or the next word without one"""
+        if parsed:
+            return any(child.dep_ == "dobj" for child in token.children)
+        if token.i + 1 >= sent.end:
+            return False
+        following = token.nbor(1)
+        return following.lower_ in OBJECT_STARTERS or (
+            following.is_alpha and not following.is_stop and not following.lower_.endswith("ly")
+        )
+
+    def accepts(self, confidence: float) -> bool:
+        """Check whether a confidence clears the threshold"""
+        return confidence >= self.threshold
+
+
+def scorer_from_settings() -> ConfidenceScorer:
+    """Build a scorer from NLP_SCORE_WEIGHTS, NLP_CONFIDENCE_THRESHOLD and NLP_SCORE_DEBUG"""
+    from ..config import settings
+    return ConfidenceScorer(
+        weights=settings.nlp_score_weights_dict,
+        threshold=settings.NLP_CONFIDENCE_THRESHOLD,
+        debug=settings.NLP_SCORE_DEBUG
+    )
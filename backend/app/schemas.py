@@ -1,9 +1,11 @@
 """Pydantic schemas for request/response validation"""
-from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any
+from pydantic import BaseModel, Field, model_validator
+from typing import Annotated, List, Optional, Dict, Any
 from datetime import datetime
 from uuid import UUID
 
+from .config import settings
+
 # Recipe Step Schemas
 class RecipeStepCreate(BaseModel):
     step_number: int = Field(ge=1, description="Step number (1-indexed)")
@@ -36,6 +38,23 @@ class RecipeResponse(BaseModel):
     class Config:
         from_attributes = True
 
+class RecipeImage(BaseModel):
+    action_id: UUID
+    canonical_name: str
+    image_url: Optional[str]
+    thumbnail_url: Optional[str]
+    image_variants: List[Dict[str, Any]] = []
+    image_width: Optional[int] = None
+    image_height: Optional[int] = None
+    image_placeholder: Optional[str] = None
+    step_numbers: List[int]  # Steps using this technique, ascending
+    sprite: Optional[Dict[str, int]] = None  # {sheet, x, y, width, height} in sprite_sheets
+
+class RecipeImagesResponse(BaseModel):
+    recipe_id: UUID
+    images: List[RecipeImage]  # One per technique, in order of first use
+    sprite_sheets: List[Dict[str, Any]] = []  # [{width, height, urls: {format: url}}]
+
 # Cooking Action Schemas
 class CookingActionResponse(BaseModel):
     id: UUID
@@ -44,6 +63,10 @@ class CookingActionResponse(BaseModel):
     category: str
     image_url: Optional[str]
     thumbnail_url: Optional[str]
+    image_variants: Optional[List[Dict[str, Any]]] = None  # [{url, width, height, format}]
+    image_width: Optional[int] = None
+    image_height: Optional[int] = None
+    image_placeholder: Optional[str] = None  # data: URI preview
     attribution: Optional[str]
     license: Optional[str]
 
@@ -57,3 +80,23 @@ class NLPExtractRequest(BaseModel):
 class NLPExtractResponse(BaseModel):
     text: str
     extracted_actions: List[Dict[str, Any]]
+
+class NLPBatchExtractRequest(BaseModel):
+    texts: List[Annotated[str, Field(min_length=1, max_length=2000)]] = Field(
+        min_length=1, max_length=settings.NLP_BATCH_MAX_TEXTS
+    )
+
+    @model_validator(mode="after")
+    def check_total_length(self):
+        total = sum(len(text) for text in self.texts)
+        if total > settings.NLP_BATCH_MAX_CHARS:
+            raise ValueError(f"Batch has {total} characters, limit is {settings.NLP_BATCH_MAX_CHARS}")
+        return self
+
+class NLPBatchExtractResponse(BaseModel):
+    results: List[NLPExtractResponse]  # Same order as the request texts
+
+
+class TaxonomyReloadResponse(BaseModel):
+    version: int  # New taxonomy version; other workers reload when they see it
+    reloaded: List[str]  # Extractors reloaded in the worker that handled the request
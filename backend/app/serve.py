@@ -0,0 +1,217 @@
+"""
+Production Server - Prefork uvicorn workers sharing a preloaded NLP model
+
+    python -m app.serve --host 0.0.0.0 --port 8000 [--workers N]
+
+The parent process imports the app, creates the tables and loads everything
+the workers would otherwise each load on their own: the spaCy pipelines and
+matchers of both routers, the action catalog they are built from, the sprite
+atlas and the image store manifest. It then binds the listening socket,
+freezes the garbage collector (gc.freeze) and forks the workers, which serve
+requests on the shared socket with their own event loop. The preloaded pages
+stay shared copy-on-write; freezing keeps the collector from writing to every
+object header (and so copying every page) on its first full collection in
+each worker.
+
+Dead workers are replaced; SIGTERM/SIGINT shut all of them down gracefully.
+
+Only what is loaded before the fork is shared. Each worker keeps its own
+state from there on:
+- Metrics: every worker has its own registry and labels its samples
+  worker="<n>" (n = 0 .. workers-1; a replacement takes over the number of
+  the worker it replaces). A /metrics scrape reaches whichever worker
+  accepts it, so each scrape reports one worker; sum over the worker label
+  for totals.
+- Extraction result caches and micro-batching queues.
+- The VariantCache index: each worker indexes IMAGE_CACHE_DIR when it
+  starts and evicts by its own view of it, so the directory can grow to
+  about workers x IMAGE_CACHE_MAX_BYTES until a restart re-indexes it.
+"""
+import argparse
+import gc
+import logging
+import os
+import signal
+import socket
+import sys
+import time
+import traceback
+from typing import Dict, Optional
+
+from .config import settings
+
+logger = logging.getLogger("app.serve")
+
+parser = argparse.ArgumentParser(description="Run the API with preforked uvicorn workers")
+parser.add_argument("--host", default="127.0.0.1", help="Bind address")
+parser.add_argument("--port", type=int, default=int(os.environ.get("PORT", 8000)), help="Bind port")
+parser.add_argument("--workers", type=int, default=settings.WEB_WORKERS,
+                    help="Worker processes (default: WEB_WORKERS, 0 = CPU count)")
+parser.add_argument("--no-preload", action="store_true",
+                    help="Load the NLP model in every worker after fork instead of once in the parent")
+parser.add_argument("--log-level", default="info", help="uvicorn log level")
+
+
+def preload():
+    """
+    Load the NLP extractors, action catalog and image manifests
+
+    Everything here is otherwise loaded lazily on the first request that
+    needs it, separately in every worker.
+    """
+    from .api.v1 import images, nlp, recipes
+
+    recipes.get_extractor()
+    nlp.get_extractor()
+    recipes.get_atlas()
+    images.get_store()
+
+
+def process_memory(pid: int) -> Optional[Dict[str, int]]:
+    """
+    Resident memory of a process, from /proc (Linux)
+
+    Returns:
+        Dict with rss (resident bytes, shared pages counted in full) and pss
+        (shared pages divided among the processes sharing them), or None if
+        unavailable
+    """
+    try:
+        with open(f"/proc/{pid}/smaps_rollup", "r") as f:
+            lines = f.readlines()
+    except OSError:
+        return None
+
+    memory = {}
+    for line in lines:
+        key, _, value = line.partition(":")
+        if key in ("Rss", "Pss"):
+            memory[key.lower()] = int(value.split()[0]) * 1024
+    return memory
+
+
+def release_connections(engine):
+    """
+    Close the parent's pooled connections before forking
+
+    Pooled connections must not be shared across processes. dispose()
+    replaces engine.pool, so the checkout timing hook is re-applied to the
+    new pool (a no-op when it carried over; see instrument_pool) and every
+    worker keeps reporting db_pool_checkout_wait_seconds.
+
+    Args:
+        engine: SQLAlchemy Engine
+    """
+    from .instrumentation import instrument_pool
+    engine.dispose()
+    instrument_pool(engine)
+
+
+def bind_socket(host: str, port: int) -> socket.socket:
+    """Listening socket inherited by every worker"""
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def run_worker(app, sock: socket.socket, args, number: int):
+    """Serve requests on the shared socket until told to stop (in the child)"""
+    import uvicorn
+    from .metrics import set_constant_labels
+
+    # The parent's handlers forward signals to the workers; uvicorn installs its own
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+
+    set_constant_labels(worker=str(number))
+    if args.no_preload:
+        preload()
+
+    config = uvicorn.Config(app, log_level=args.log_level, proxy_headers=True, forwarded_allow_ips="*")
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+def spawn_worker(app, sock: socket.socket, args, number: int) -> int:
+    """Fork worker number `number` and return its PID"""
+    pid = os.fork()
+    if pid:
+        return pid
+
+    code = 0
+    try:
+        run_worker(app, sock, args, number)
+    except BaseException:
+        traceback.print_exc()
+        code = 1
+    finally:
+        os._exit(code)
+
+
+def main():
+    """Main entry point"""
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s:     %(message)s")
+    workers = args.workers or os.cpu_count() or 1
+
+    try:
+        from .database import engine, init_db
+        from .main import app
+
+        init_db()
+        if not args.no_preload:
+            start = time.perf_counter()
+            preload()
+            logger.info("Preloaded NLP model and catalog in %.1fs", time.perf_counter() - start)
+
+        release_connections(engine)
+        sock = bind_socket(args.host, args.port)
+    except Exception as e:
+        print(f"\n❌ Error starting server: {e}")
+        traceback.print_exc()
+        sys.exit(1)
+
+    # Everything loaded so far is permanent: keep the collector off its pages
+    gc.collect()
+    gc.freeze()
+
+    pids: Dict[int, int] = {}  # PID -> worker number
+    stopping = False
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in list(pids):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    for number in range(workers):
+        pids[spawn_worker(app, sock, args, number)] = number
+    logger.info("Serving on %s:%d with %d workers (parent %d)", args.host, args.port, workers, os.getpid())
+
+    while pids:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        number = pids.pop(pid, None)
+        if not stopping and number is not None:
+            logger.warning("Worker %d exited (status %d), starting a new one", pid, status)
+            time.sleep(1)
+            if not stopping:
+                pids[spawn_worker(app, sock, args, number)] = number
+
+    sock.close()
+    logger.info("All workers stopped")
+
+
+if __name__ == "__main__":
+    main()
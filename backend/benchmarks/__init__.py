@@ -0,0 +1 @@
+"""Benchmark suite for NLP extraction, action matching and the recipes API"""
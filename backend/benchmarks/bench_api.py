@@ -0,0 +1,191 @@
+"""
+API benchmarks - end-to-end POST /recipes/, GET /recipes/ and NLP extraction in-process
+
+The app is driven through httpx's ASGI transport, so no server or network is
+involved. The runner points DATABASE_URL at a scratch SQLite file before the
+app is imported. Payloads cycle the seed recipes, so steady-state creates hit
+the extraction cache the way repeated editorial drafts do.
+"""
+import asyncio
+import contextlib
+import importlib.util
+import io
+import time
+from typing import Dict, List
+
+import httpx
+
+from .corpus import BACKEND_DIR, load_seed_recipes, synthetic_steps
+from .timing import latency_metrics, metric, percentile
+
+
+def _seed_cooking_actions():
+    """Create tables and seed cooking actions (quietly)"""
+    from app.database import init_db
+
+    path = BACKEND_DIR / "scripts" / "5_seed_database.py"
+    spec = importlib.util.spec_from_file_location("seed_database", path)
+    module = importlib.util.module_from_spec(spec)
+    with contextlib.redirect_stdout(io.StringIO()):
+        init_db()
+        spec.loader.exec_module(module)
+        module.seed_cooking_actions()
+
+
+def _recipe_payloads(count: int) -> List[Dict]:
+    """Build create-recipe payloads by cycling the seed recipes"""
+    recipes = load_seed_recipes()
+    payloads = []
+    for i in range(count):
+        recipe = recipes[i % len(recipes)]
+        payloads.append({
+            "title": f"{recipe['title']} #{i}",
+            "description": recipe["description"],
+            "steps": [
+                {"step_number": n, "instruction_text": text}
+                for n, text in enumerate(recipe["steps"], 1)
+            ],
+        })
+    return payloads
+
+
+async def _timed_requests(client: httpx.AsyncClient, requests: List[Dict]) -> List[float]:
+    samples = []
+    for request in requests:
+        start = time.perf_counter()
+        response = await client.request(**request)
+        samples.append(time.perf_counter() - start)
+        response.raise_for_status()
+    return samples
+
+
+async def _extraction_throughput(client: httpx.AsyncClient, texts: List[str], batch_size: int) -> Dict[str, Dict]:
+    """
+    Texts/sec through /nlp/extract one at a time versus /nlp/extract/batch
+
+    Each mode gets its own texts so neither is served from the other's cache.
+    """
+    half = len(texts) // 2
+    single_texts, batch_texts = texts[:half], texts[half:]
+
+    start = time.perf_counter()
+    for text in single_texts:
+        response = await client.post("/api/v1/nlp/extract", json={"text": text})
+        response.raise_for_status()
+    single = len(single_texts) / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for i in range(0, len(batch_texts), batch_size):
+        response = await client.post(
+            "/api/v1/nlp/extract/batch", json={"texts": batch_texts[i:i + batch_size]}
+        )
+        response.raise_for_status()
+    batch = len(batch_texts) / (time.perf_counter() - start)
+
+    return {
+        "api.nlp_extract.throughput": metric(single, "texts/s", True),
+        "api.nlp_extract_batch.throughput": metric(batch, "texts/s", True),
+    }
+
+
+async def _concurrent_extraction(
+    client: httpx.AsyncClient, texts: List[str], concurrency: int, prefix: str
+) -> Dict[str, Dict]:
+    """
+    Throughput and p99 of single-text /nlp/extract calls from concurrent clients
+
+    Args:
+        client: Client bound to the app
+        texts: Texts to send (split evenly across clients)
+        concurrency: Number of clients sending requests back to back
+        prefix: Metric name prefix
+    """
+    samples: List[float] = []
+
+    async def worker(chunk: List[str]):
+        for text in chunk:
+            start = time.perf_counter()
+            response = await client.post("/api/v1/nlp/extract", json={"text": text})
+            samples.append(time.perf_counter() - start)
+            response.raise_for_status()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(texts[i::concurrency]) for i in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    return {
+        f"{prefix}.throughput": metric(len(texts) / elapsed, "texts/s", True),
+        f"{prefix}.p99_ms": metric(percentile(samples, 99) * 1000, "ms", False),
+    }
+
+
+async def _run(create_count: int, list_count: int, extract_count: int) -> Dict[str, Dict]:
+    from app.api.v1 import nlp
+    from app.config import settings
+    from app.main import app
+    from app.nlp.action_matcher import load_taxonomy_for_matcher
+
+    _seed_cooking_actions()
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        payloads = _recipe_payloads(create_count)
+
+        # Warm up the lazily-built extractor outside the timed region
+        await client.post("/api/v1/recipes/", json=payloads[0])
+
+        create = await _timed_requests(
+            client,
+            [{"method": "POST", "url": "/api/v1/recipes/", "json": p} for p in payloads]
+        )
+        listing = await _timed_requests(
+            client,
+            [{"method": "GET", "url": "/api/v1/recipes/", "params": {"limit": 10}}] * list_count
+        )
+
+        names = [
+            name
+            for action in load_taxonomy_for_matcher(settings.TAXONOMY_PATH)
+            for name in [action["canonical_name"]] + action["synonyms"]
+        ]
+        await client.post("/api/v1/nlp/extract", json={"text": "Dice the onions."})
+        extraction = await _extraction_throughput(
+            client, synthetic_steps(extract_count, names, seed=7), batch_size=64
+        )
+
+        # Same concurrent load with server-side micro-batching off, then on
+        batcher = nlp.get_batcher()
+        configured = batcher.max_batch_size
+        batcher.max_batch_size = 1
+        unbatched = await _concurrent_extraction(
+            client, synthetic_steps(extract_count, names, seed=8), 32, "api.nlp_extract_concurrent.unbatched"
+        )
+        batcher.max_batch_size = configured
+        batched = await _concurrent_extraction(
+            client, synthetic_steps(extract_count, names, seed=9), 32, "api.nlp_extract_concurrent.batched"
+        )
+
+    results = {}
+    results.update(latency_metrics("api.create_recipe", create, unit="req/s"))
+    results.update(latency_metrics("api.list_recipes", listing, unit="req/s"))
+    results.update(extraction)
+    results.update(unbatched)
+    results.update(batched)
+    return results
+
+
+def run(create_count: int = 50, list_count: int = 200, extract_count: int = 1024) -> Dict[str, Dict]:
+    """
+    Run API benchmarks
+
+    Args:
+        create_count: Number of POST /recipes/ requests
+        list_count: Number of GET /recipes/ requests
+        extract_count: Texts sent through the NLP extraction endpoints per
+            scenario (sequential single/batch, then 32 concurrent clients with
+            and without micro-batching)
+
+    Returns:
+        Dict of metric name -> result entry
+    """
+    return asyncio.run(_run(create_count, list_count, extract_count))
@@ -0,0 +1,289 @@
+"""
+ActionExtractor benchmarks - steps/sec and p50/p99 latency per corpus
+
+The default extractor uses the inflection-table fast path; the same corpora
+are also run through the full pipeline, and the fast path's results on the
+seed recipes are compared against it. Re-matching from stored parses
+(app.nlp.docstore) is timed against parsing the same steps, and the
+cooking_actions pipeline component against the pipeline without it and
+against the token loop it replaced. Result records (app.nlp.results) are
+compared against the public dict form, and against the dicts that loop
+built, for throughput and retained allocations on a large corpus.
+"""
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+from app.config import settings
+from app.metrics import EXTRACTION_PATH_TOTAL
+from app.nlp import ActionExtractor, ActionMatcher
+from app.nlp.action_matcher import load_taxonomy_for_matcher
+from app.nlp.component import COMPONENT_NAME
+from app.nlp.docstore import doc_from_bytes, doc_to_bytes
+from app.nlp.results import Extraction
+
+from .corpus import example_steps, seed_steps, synthetic_steps
+from .timing import latency_metrics, metric, time_each
+
+
+def build_extractor(fast_path: bool = True) -> ActionExtractor:
+    """Build an extractor from the taxonomy with result caching disabled"""
+    matcher = ActionMatcher(
+        load_taxonomy_for_matcher(settings.TAXONOMY_PATH), settings.NLP_FUZZY_MAX_DISTANCE
+    )
+    return ActionExtractor(matcher, settings.SPACY_MODEL, cache_size=0, fast_path=fast_path)
+
+
+def baseline_extract(full: ActionExtractor, doc) -> List[Dict]:
+    """
+    The verb loop and result dicts extraction used before the component
+
+    Matches the lemmas of tagged verbs (falling back to fuzzy matching),
+    scores them and deduplicates plain dicts, as ActionExtractor did before
+    cooking_actions and result records replaced it. Kept here only as the
+    comparison point for component_overhead and result_footprint.
+
+    Args:
+        full: Extractor whose matcher and scorer to use
+        doc: Doc parsed without the cooking_actions component
+
+    Returns:
+        Extracted actions in the extract_actions format
+    """
+    matcher, scorer = full.action_matcher, full.scorer
+    parsed = doc.has_annotation("DEP")
+    sentence_features: Dict[int, Dict[str, float]] = {}
+    seen: Dict[str, Dict] = {}
+
+    for sent in doc.sents:
+        for verb in sent:
+            if verb.pos_ != "VERB":
+                continue
+            lemma = verb.lemma_.lower()
+            action_id, edits = matcher.match(lemma), 0
+            if action_id is None:
+                fuzzy = matcher.match_fuzzy(verb.text)
+                if fuzzy is None:
+                    continue
+                entry, edits = fuzzy
+                lemma, action_id = entry.lemma, matcher.action_id(entry.action)
+
+            if sent.start not in sentence_features:
+                sentence_features[sent.start] = scorer.sentence_features(sent)
+            confidence, _ = scorer.score(verb, sent, sentence_features[sent.start], parsed=parsed, edits=edits)
+            if not scorer.accepts(confidence):
+                continue
+
+            action = {
+                "action_id": str(action_id),
+                "matched_text": lemma,
+                "confidence": confidence,
+                "position": {"start": verb.idx, "end": verb.idx + len(verb.text)},
+            }
+            if action["action_id"] not in seen or confidence > seen[action["action_id"]]["confidence"]:
+                seen[action["action_id"]] = action
+
+    return sorted(seen.values(), key=lambda action: action["confidence"], reverse=True)
+
+
+def fast_path_accuracy(fast: ActionExtractor, full: ActionExtractor, steps: List[str]) -> Dict[str, Dict]:
+    """
+    Compare fast path results against the full pipeline
+
+    Args:
+        fast: Extractor with the fast path on
+        full: Extractor with the fast path off
+        steps: Step texts
+
+    Returns:
+        Dict of metric name -> result entry: share of steps with the same
+        action set, actions only one side found, and the share of steps the
+        fast path handed to the full pipeline
+    """
+    full_path = EXTRACTION_PATH_TOTAL.labels("full")
+    before = full_path.value
+    fast_results = [fast.extract_actions(step) for step in steps]
+    fallbacks = full_path.value - before
+
+    agree = gained = lost = 0
+    for step, fast_actions in zip(steps, fast_results):
+        fast_ids = {action["action_id"] for action in fast_actions}
+        full_ids = {action["action_id"] for action in full.extract_actions(step)}
+        agree += fast_ids == full_ids
+        gained += len(fast_ids - full_ids)
+        lost += len(full_ids - fast_ids)
+
+    count = len(steps) or 1
+    return {
+        "extractor.fast_path.seed.agreement": metric(agree / count, "ratio", True),
+        "extractor.fast_path.seed.actions_gained": metric(gained, "actions", False),
+        "extractor.fast_path.seed.actions_lost": metric(lost, "actions", False),
+        "extractor.fast_path.seed.full_pipeline_rate": metric(fallbacks / count, "ratio", False),
+    }
+
+
+def stored_parse_rematch(full: ActionExtractor, steps: List[str], name: str) -> Dict[str, Dict]:
+    """
+    Parse cost versus re-matching the same steps from serialized parses
+
+    Args:
+        full: Extractor with the fast path off
+        steps: Step texts
+        name: Corpus name for the metric prefix
+
+    Returns:
+        Dict of metric name -> result entry
+    """
+    start = time.perf_counter()
+    docs = full.parse(steps)
+    parse_seconds = time.perf_counter() - start
+    stored = [doc_to_bytes(doc) for doc in docs]
+
+    start = time.perf_counter()
+    for data in stored:
+        full.extract_from_doc(doc_from_bytes(data, full.nlp.vocab))
+    rematch_seconds = time.perf_counter() - start
+
+    count = len(steps)
+    return {
+        f"extractor.rematch.{name}.parse_throughput": metric(count / parse_seconds, "steps/s", True),
+        f"extractor.rematch.{name}.throughput": metric(count / rematch_seconds, "steps/s", True),
+        f"extractor.rematch.{name}.bytes_per_step": metric(sum(map(len, stored)) / count, "bytes", False),
+    }
+
+
+def component_overhead(full: ActionExtractor, steps: List[str], name: str, repeat: int = 3) -> Dict[str, Dict]:
+    """
+    Per-step cost of the cooking_actions component against the loop it replaced
+
+    "baseline_us" is the pipeline without the component followed by
+    baseline_extract; "component_us" is the pipeline with the component
+    followed by the dict conversion, so the two produce the same result.
+
+    Args:
+        full: Extractor with the fast path off
+        steps: Step texts
+        name: Corpus name for the metric prefix
+        repeat: Rounds per measurement (the fastest is kept)
+
+    Returns:
+        Dict of metric name -> result entry
+    """
+    def best(func) -> float:
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            times.append(time.perf_counter() - start)
+        return min(times)
+
+    bare_docs: List = []
+    docs: List = []
+
+    def parse_without_component():
+        bare_docs[:] = list(full.nlp.pipe(steps, disable=[COMPONENT_NAME]))
+
+    def parse_with_component():
+        docs[:] = list(full.nlp.pipe(steps, component_cfg=full._make_component_cfg()))
+
+    without = best(parse_without_component)
+    with_component = best(parse_with_component)
+    action_ids = full.action_matcher.action_ids
+    convert = best(lambda: [Extraction(doc._.action_matches, action_ids).to_dicts() for doc in docs])
+    loop = best(lambda: [baseline_extract(full, doc) for doc in bare_docs])
+
+    count = len(steps)
+    return {
+        f"extractor.component.{name}.overhead_us": metric((with_component - without) / count * 1e6, "us", False),
+        f"extractor.component.{name}.to_dicts_us": metric(convert / count * 1e6, "us", False),
+        f"extractor.component.{name}.pipeline_share": metric((with_component - without) / with_component, "ratio", False),
+        f"extractor.component.{name}.component_us": metric((with_component + convert) / count * 1e6, "us", False),
+        f"extractor.component.{name}.baseline_us": metric((without + loop) / count * 1e6, "us", False),
+    }
+
+
+def result_footprint(forms: Dict[str, Callable], steps: List[str], name: str) -> Dict[str, Dict]:
+    """
+    Throughput and retained allocations of records versus result dicts
+
+    Every result of the corpus is kept alive (as a batch or recipe create
+    does) while tracemalloc counts the blocks and bytes they hold.
+
+    Args:
+        forms: Form name -> function extracting one step
+        steps: Step texts (a large corpus gives stable per-step numbers)
+        name: Corpus name for the metric prefix
+
+    Returns:
+        Dict of metric name -> result entry per form
+    """
+    results = {}
+    for form, func in forms.items():
+        start = time.perf_counter()
+        kept = [func(step) for step in steps]
+        seconds = time.perf_counter() - start
+        del kept
+
+        tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        kept = [func(step) for step in steps]
+        stats = tracemalloc.take_snapshot().compare_to(before, "filename")
+        tracemalloc.stop()
+        del kept
+
+        count = len(steps)
+        prefix = f"extractor.results.{name}.{form}"
+        results.update({
+            f"{prefix}.throughput": metric(count / seconds, "steps/s", True),
+            f"{prefix}.blocks_per_step": metric(sum(s.count_diff for s in stats) / count, "blocks", False),
+            f"{prefix}.bytes_per_step": metric(sum(s.size_diff for s in stats) / count, "bytes", False),
+        })
+    return results
+
+
+def corpora(synthetic_count: int) -> Dict[str, List[str]]:
+    """Corpora keyed by name"""
+    names = [
+        name
+        for action in load_taxonomy_for_matcher(settings.TAXONOMY_PATH)
+        for name in [action["canonical_name"]] + action["synonyms"]
+    ]
+    return {
+        "seed": seed_steps(),
+        "examples": example_steps(),
+        "synthetic": synthetic_steps(synthetic_count, names),
+    }
+
+
+def run(synthetic_count: int = 2000) -> Dict[str, Dict]:
+    """
+    Run extractor benchmarks
+
+    Args:
+        synthetic_count: Number of steps in the synthetic corpus
+
+    Returns:
+        Dict of metric name -> result entry
+    """
+    extractor = build_extractor()
+    full = build_extractor(fast_path=False)
+    results = {}
+    for name, steps in corpora(synthetic_count).items():
+        samples = time_each(extractor.extract_actions, steps)
+        results.update(latency_metrics(f"extractor.{name}", samples))
+        samples = time_each(full.extract_actions, steps)
+        results.update(latency_metrics(f"extractor.full_pipeline.{name}", samples))
+    results.update(fast_path_accuracy(extractor, full, seed_steps()))
+    synthetic = corpora(synthetic_count)["synthetic"]
+    results.update(stored_parse_rematch(full, synthetic, "synthetic"))
+    results.update(component_overhead(full, synthetic, "synthetic"))
+    large = corpora(synthetic_count * 10)["synthetic"]
+    # "records" and "dicts" take the fast path; the full pipeline records are
+    # compared against the pre-component verb loop on the same parses
+    results.update(result_footprint({
+        "records": extractor.extract,
+        "dicts": extractor.extract_actions,
+        "full_records": full.extract,
+        "baseline_dicts": lambda step: baseline_extract(full, full.nlp(step, disable=[COMPONENT_NAME])),
+    }, large, "synthetic_large"))
+    return results
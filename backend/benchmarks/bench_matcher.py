@@ -0,0 +1,65 @@
+"""
+ActionMatcher benchmarks - match/match_phrase/match_fuzzy throughput
+"""
+import random
+from typing import Dict, List
+
+from app.config import settings
+from app.nlp import ActionMatcher
+from app.nlp.action_matcher import load_taxonomy_for_matcher
+
+from .corpus import seed_steps, synthetic_steps
+from .timing import metric, ops_per_second
+
+
+def misspellings(names: List[str], seed: int = 42) -> List[str]:
+    """One or two random deletions, swaps or substitutions per single-word name"""
+    rng = random.Random(seed)
+    typos = []
+    for name in names:
+        if " " in name or len(name) < 5:
+            continue
+        word = list(name)
+        for _ in range(1 if len(name) < 7 else 2):
+            i = rng.randrange(len(word) - 1)
+            op = rng.choice(("delete", "swap", "substitute"))
+            if op == "delete":
+                del word[i]
+            elif op == "swap":
+                word[i], word[i + 1] = word[i + 1], word[i]
+            else:
+                word[i] = rng.choice("abcdefghijklmnopqrstuvwxyz")
+        typos.append("".join(word))
+    return typos
+
+
+def run(synthetic_count: int = 2000) -> Dict[str, Dict]:
+    """
+    Run matcher benchmarks over words and phrases drawn from the corpora
+
+    Args:
+        synthetic_count: Number of synthetic steps to draw inputs from
+
+    Returns:
+        Dict of metric name -> result entry
+    """
+    actions = load_taxonomy_for_matcher(settings.TAXONOMY_PATH)
+    matcher = ActionMatcher(actions, fuzzy_max_distance=2)
+    names = [name for action in actions for name in [action["canonical_name"]] + action["synonyms"]]
+
+    steps = seed_steps() + synthetic_steps(synthetic_count, names)
+    words = [word.strip(".,").lower() for step in steps for word in step.split()]
+    phrases = [
+        " ".join(words[i:i + 3])
+        for i in range(0, len(words) - 3, 3)
+    ]
+
+    return {
+        "matcher.match.throughput": metric(ops_per_second(matcher.match, words), "ops/s", True),
+        "matcher.match_phrase.throughput": metric(
+            ops_per_second(matcher.match_phrase, phrases), "ops/s", True
+        ),
+        "matcher.match_fuzzy.throughput": metric(
+            ops_per_second(matcher.match_fuzzy, misspellings(names) + words[:2000]), "ops/s", True
+        ),
+    }
@@ -0,0 +1,123 @@
+"""
+Server memory benchmarks - resident memory of app.serve with 1 and N workers
+
+Starts the production launcher (python -m app.serve) on a free port, waits
+until every worker has loaded the NLP model and answered an extraction, and
+sums the memory of the parent and its workers from /proc (Linux only):
+
+- rss: resident pages, shared ones counted once per process (what most
+  dashboards add up)
+- pss: shared pages divided among the processes sharing them, i.e. what the
+  server really costs
+
+N is fixed at WORKERS (not the CPU count), so "n_workers" results from
+different machines count the same processes. The "per_worker" runs use --no-preload (every worker loads its own model after
+fork), which is what plain `uvicorn --workers N` does.
+"""
+import os
+import socket
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+import httpx
+
+from .corpus import BACKEND_DIR
+from .timing import metric
+
+STARTUP_TIMEOUT = 120
+WORKERS = 4
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _children(pid: int) -> List[int]:
+    """PIDs of a process's direct children"""
+    children = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", "r") as f:
+                # The command name may contain spaces; fields after it are fixed
+                fields = f.read().rsplit(")", 1)[1].split()
+        except OSError:
+            continue
+        if int(fields[1]) == pid:
+            children.append(int(entry))
+    return children
+
+
+def _server_memory(workers: int, preload: bool) -> Dict[str, float]:
+    """
+    Start the launcher, warm every worker up and measure it
+
+    Returns:
+        Dict with total rss and pss in MB
+    """
+    from app.serve import process_memory
+
+    port = _free_port()
+    command = [sys.executable, "-m", "app.serve", "--port", str(port),
+               "--workers", str(workers), "--log-level", "warning"]
+    if not preload:
+        command.append("--no-preload")
+    server = subprocess.Popen(command, cwd=BACKEND_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        url = f"http://127.0.0.1:{port}"
+        deadline = time.monotonic() + STARTUP_TIMEOUT
+        while True:
+            if server.poll() is not None:
+                raise RuntimeError(f"app.serve exited with status {server.returncode}")
+            try:
+                httpx.get(f"{url}/health", timeout=1).raise_for_status()
+                break
+            except httpx.HTTPError:
+                if time.monotonic() > deadline:
+                    raise RuntimeError("app.serve did not start in time")
+                time.sleep(0.2)
+
+        # Connections are spread over the workers; every one should have served a few
+        for _ in range(workers * 10):
+            with httpx.Client(base_url=url, timeout=30) as client:
+                client.post("/api/v1/nlp/extract", json={"text": "Dice the onion and simmer the sauce."})
+        time.sleep(1)
+
+        totals = {"rss": 0, "pss": 0}
+        for pid in [server.pid] + _children(server.pid):
+            memory = process_memory(pid)
+            if memory is None:
+                raise RuntimeError("Process memory is only available on Linux")
+            for key in totals:
+                totals[key] += memory[key]
+        return {key: value / 1024 / 1024 for key, value in totals.items()}
+    finally:
+        server.terminate()
+        try:
+            server.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            server.kill()
+
+
+def run() -> Dict[str, Dict]:
+    """
+    Run server memory benchmarks
+
+    Returns:
+        Dict of metric name -> result entry
+    """
+    results = {}
+    for name, count, preload in (
+        ("1_worker", 1, True),
+        ("n_workers", WORKERS, True),
+        ("n_workers_per_worker", WORKERS, False),
+    ):
+        memory = _server_memory(count, preload)
+        for key, value in memory.items():
+            results[f"serve.{name}.{key}_mb"] = metric(value, "MB", False)
+    return results
@@ -0,0 +1,168 @@
+"""
+Storage benchmarks - JSON versus packed step actions (app.nlp.packed)
+
+The synthetic corpus is extracted once with UUID action IDs, the way the
+recipes API stores steps, and written to two scratch SQLite databases: one
+with the extracted_actions/nlp_confidence JSON columns and one with
+packed_actions. Reported per step: database size after VACUUM, and the time
+to read the steps' actions back the way recipe enrichment does (fetching the
+action columns and decoding them with step_action_refs).
+
+The lookup benchmark stores the JSON form in the configured database
+(DATABASE_URL: scratch SQLite by default, or the runner's --database-url) and
+times RecipeStep.has_actions lookups - json_each() scans on SQLite, a JSONB
+GIN index on PostgreSQL.
+"""
+import os
+import tempfile
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, List
+
+from sqlalchemy import create_engine, func, text
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import engine as app_engine, init_db
+from app.models import Recipe, RecipeStep
+from app.models.base import Base
+from app.nlp import ActionExtractor, ActionMatcher
+from app.nlp.action_matcher import load_taxonomy_for_matcher
+from app.nlp.packed import step_action_refs, store_step_actions
+
+from .corpus import synthetic_steps
+from .timing import metric
+
+
+def _best(func, repeat: int = 3) -> float:
+    """Fastest of several runs, in seconds"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def _write_steps(path: Path, steps: List[str], extractions: List, codes) -> int:
+    """
+    Store the steps in a fresh database
+
+    Args:
+        path: Database file
+        steps: Step texts
+        extractions: Extraction per step
+        codes: Action ID -> code to pack with, or None for JSON
+
+    Returns:
+        File size after VACUUM, in bytes
+    """
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        recipe = Recipe(title="Storage benchmark")
+        db.add(recipe)
+        db.flush()
+        for number, (step_text, extraction) in enumerate(zip(steps, extractions), 1):
+            step = RecipeStep(recipe_id=recipe.id, step_number=number, instruction_text=step_text)
+            store_step_actions(step, extraction, codes)
+            db.add(step)
+        db.commit()
+    with engine.connect() as conn:
+        conn.execution_options(isolation_level="AUTOCOMMIT").execute(text("VACUUM"))
+    engine.dispose()
+    return os.path.getsize(path)
+
+
+def _read_seconds(path: Path) -> float:
+    """Time to fetch every step's action columns and decode them"""
+    engine = create_engine(f"sqlite:///{path}")
+
+    def read():
+        with Session(engine) as db:
+            rows = db.query(
+                RecipeStep.extracted_actions, RecipeStep.nlp_confidence, RecipeStep.packed_actions
+            ).all()
+        for row in rows:
+            step_action_refs(row)
+
+    seconds = _best(read)
+    engine.dispose()
+    return seconds
+
+
+def _lookup_seconds(steps: List[str], extractions: List, action_ids: List[str]) -> float:
+    """
+    Time to count the steps with each action, in the configured database
+
+    Returns:
+        Seconds per lookup
+    """
+    init_db()
+    with Session(app_engine) as db:
+        recipe = Recipe(title="Storage lookup benchmark")
+        db.add(recipe)
+        db.flush()
+        db.add_all(
+            RecipeStep(
+                recipe_id=recipe.id,
+                step_number=number,
+                instruction_text=step_text,
+                extracted_actions=extraction.ids(),
+                nlp_confidence=extraction.confidences()
+            )
+            for number, (step_text, extraction) in enumerate(zip(steps, extractions), 1)
+        )
+        db.commit()
+        if app_engine.dialect.name == "postgresql":
+            db.execute(text("ANALYZE recipe_steps"))
+
+        def lookup():
+            for action_id in action_ids:
+                db.query(func.count(RecipeStep.id)).filter(RecipeStep.has_actions(action_id)).scalar()
+
+        seconds = _best(lookup) / len(action_ids)
+
+        db.query(RecipeStep).filter(RecipeStep.recipe_id == recipe.id).delete()
+        db.delete(recipe)
+        db.commit()
+    return seconds
+
+
+def run(synthetic_count: int = 2000) -> Dict[str, Dict]:
+    """
+    Run storage benchmarks
+
+    Args:
+        synthetic_count: Number of steps in the synthetic corpus
+
+    Returns:
+        Dict of metric name -> result entry
+    """
+    actions = load_taxonomy_for_matcher(settings.TAXONOMY_PATH)
+    names = [name for action in actions for name in [action["canonical_name"]] + action["synonyms"]]
+    steps = synthetic_steps(synthetic_count, names, seed=11)
+
+    # Database-style IDs and codes, as the recipes API sees them
+    rows = [dict(action, id=str(uuid.uuid4())) for action in actions]
+    codes = {action["id"]: code for code, action in enumerate(rows, 1)}
+    matcher = ActionMatcher(rows, settings.NLP_FUZZY_MAX_DISTANCE)
+    extractor = ActionExtractor(matcher, settings.SPACY_MODEL, cache_size=0)
+    extractions = extractor.extract_many(steps, settings.NLP_PIPE_BATCH_SIZE)
+
+    count = len(steps)
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="recipe-storage-") as scratch:
+        for form, form_codes in (("json", None), ("packed", codes)):
+            path = Path(scratch) / f"{form}.db"
+            size = _write_steps(path, steps, extractions, form_codes)
+            prefix = f"storage.steps.{form}"
+            results[f"{prefix}.db_bytes_per_step"] = metric(size / count, "bytes", False)
+            results[f"{prefix}.read_us"] = metric(_read_seconds(path) / count * 1e6, "us", False)
+
+    lookup_ids = [action["id"] for action in rows[:20]]
+    results["storage.lookup.has_action_ms"] = metric(
+        _lookup_seconds(steps, extractions, lookup_ids) * 1000, "ms", False
+    )
+    return results
@@ -0,0 +1,89 @@
+"""
+Benchmark Corpora - Seed recipes, example recipes and a synthetic corpus
+"""
+import importlib.util
+import json
+import random
+from pathlib import Path
+from typing import Dict, List
+
+BACKEND_DIR = Path(__file__).parent.parent
+REPO_DIR = BACKEND_DIR.parent
+
+
+def load_seed_recipes() -> List[Dict]:
+    """
+    Load the example recipes seeded by scripts/6_seed_recipes.py
+
+    Returns:
+        List of recipe dicts with title, description and steps (list of str)
+    """
+    # Module name starts with a digit, so load it by path
+    path = BACKEND_DIR / "scripts" / "6_seed_recipes.py"
+    spec = importlib.util.spec_from_file_location("seed_recipes", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.EXAMPLE_RECIPES
+
+
+def seed_steps() -> List[str]:
+    """Step texts from the seeded recipes"""
+    return [step for recipe in load_seed_recipes() for step in recipe["steps"]]
+
+
+def example_steps() -> List[str]:
+    """Step texts from examples/*.json"""
+    steps = []
+    for path in sorted((REPO_DIR / "examples").glob("*.json")):
+        with open(path, "r") as f:
+            recipe = json.load(f)
+        steps.extend(step["instruction_text"] for step in recipe["steps"])
+    return steps
+
+
+INGREDIENTS = [
+    "onions", "garlic", "carrots", "celery", "potatoes", "tomatoes", "bell peppers",
+    "chicken breast", "salmon fillets", "short ribs", "mushrooms", "zucchini",
+    "basil", "parsley", "butter", "cream", "eggs", "flour", "pasta", "rice"
+]
+
+TOOLS = [
+    "in a large pan", "in a mixing bowl", "in a hot skillet", "on a cutting board",
+    "in the oven", "in a saucepan", "in a wok", "on the grill"
+]
+
+FINISHES = [
+    "until golden brown", "for 5 minutes", "until tender", "over medium heat",
+    "until fragrant", "for 10-15 minutes", "until the sauce thickens", "gently"
+]
+
+
+def synthetic_steps(count: int, action_names: List[str], seed: int = 42) -> List[str]:
+    """
+    Generate a deterministic synthetic corpus of recipe steps
+
+    Steps mix one to three sentences of taxonomy verbs, generic verbs and
+    filler so that long multi-sentence steps are represented.
+
+    Args:
+        count: Number of steps to generate
+        action_names: Verbs to draw from (canonical names and synonyms)
+        seed: Random seed
+
+    Returns:
+        List of step texts
+    """
+    rng = random.Random(seed)
+    verbs = [name for name in action_names if " " not in name] + ["add", "place", "cook", "let"]
+    steps = []
+    for _ in range(count):
+        sentences = []
+        for _ in range(rng.randint(1, 3)):
+            verb = rng.choice(verbs)
+            sentence = f"{verb.capitalize()} the {rng.choice(INGREDIENTS)} {rng.choice(TOOLS)}"
+            if rng.random() < 0.6:
+                sentence += f" and {rng.choice(verbs)} the {rng.choice(INGREDIENTS)}"
+            sentence += f" {rng.choice(FINISHES)}."
+            sentences.append(sentence)
+        steps.append(" ".join(sentences))
+    return steps
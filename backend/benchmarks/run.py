@@ -0,0 +1,156 @@
+"""
+Benchmark Runner - Run suites, save JSON baselines and flag regressions
+
+Usage (from backend/):
+    python -m benchmarks --save benchmarks/baselines/local.json
+    python -m benchmarks --compare benchmarks/baselines/local.json --threshold 0.1
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+BACKEND_DIR = Path(__file__).parent.parent
+
+SUITES = ["extractor", "matcher", "api", "storage", "serve"]
+
+
+def run_suites(suites: List[str], synthetic_count: int) -> Dict[str, Dict]:
+    """
+    Run the selected benchmark suites
+
+    Args:
+        suites: Suite names (see SUITES)
+        synthetic_count: Size of the synthetic step corpus
+
+    Returns:
+        Dict of metric name -> result entry
+    """
+    results = {}
+    for suite in suites:
+        print(f"Running {suite} benchmarks...", file=sys.stderr)
+        if suite == "extractor":
+            from . import bench_extractor
+            results.update(bench_extractor.run(synthetic_count))
+        elif suite == "matcher":
+            from . import bench_matcher
+            results.update(bench_matcher.run(synthetic_count))
+        elif suite == "api":
+            from . import bench_api
+            results.update(bench_api.run())
+        elif suite == "storage":
+            from . import bench_storage
+            results.update(bench_storage.run(synthetic_count * 10))
+        elif suite == "serve":
+            from . import bench_serve
+            results.update(bench_serve.run())
+    return results
+
+
+def compare(
+    baseline: Dict[str, Dict],
+    current: Dict[str, Dict],
+    threshold: float
+) -> List[Tuple[str, float, float, float, bool]]:
+    """
+    Compare current results against a baseline
+
+    Args:
+        baseline: Baseline results (metric name -> entry)
+        current: Current results
+        threshold: Allowed relative slowdown (0.1 = 10%)
+
+    Returns:
+        List of (metric, baseline, current, relative change, regressed)
+    """
+    rows = []
+    for name, entry in sorted(current.items()):
+        if name not in baseline:
+            continue
+        base_value = baseline[name]["value"]
+        value = entry["value"]
+        if not base_value:
+            continue
+        change = (value - base_value) / base_value
+        # Normalize so that a positive number always means "worse"
+        worse = -change if entry["higher_is_better"] else change
+        rows.append((name, base_value, value, change, worse > threshold))
+    return rows
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Run extractor, matcher, API, storage and server memory benchmarks")
+    parser.add_argument("--suite", action="append", choices=SUITES,
+                        help="Suite to run (repeatable, default: all)")
+    parser.add_argument("--synthetic-steps", type=int, default=2000,
+                        help="Size of the synthetic step corpus")
+    parser.add_argument("--save", help="Write results JSON to this path")
+    parser.add_argument("--compare", help="Baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="Relative regression that fails the comparison (default 0.10)")
+    parser.add_argument("--database-url",
+                        help="Throwaway database for the API and storage lookup suites, e.g. a local "
+                             "PostgreSQL (default: scratch SQLite)")
+    args = parser.parse_args(argv)
+
+    # Relative settings paths (taxonomy, static dir) are resolved from backend/
+    os.chdir(BACKEND_DIR)
+    if str(BACKEND_DIR) not in sys.path:
+        sys.path.insert(0, str(BACKEND_DIR))
+
+    # Never benchmark against a real database unless explicitly given one
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+    else:
+        scratch = tempfile.mkdtemp(prefix="recipe-bench-")
+        os.environ["DATABASE_URL"] = f"sqlite:///{scratch}/bench.db"
+
+    results = run_suites(args.suite or SUITES, args.synthetic_steps)
+
+    import spacy
+    from app.config import settings
+    report = {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "spacy": spacy.__version__,
+            "spacy_model": settings.SPACY_MODEL,
+            "synthetic_steps": args.synthetic_steps,
+            "database": settings.DATABASE_URL.split(":", 1)[0],
+        },
+        "results": results,
+    }
+
+    for name, entry in sorted(results.items()):
+        print(f"{name:45s} {entry['value']:14.2f} {entry['unit']}")
+
+    if args.save:
+        Path(args.save).parent.mkdir(parents=True, exist_ok=True)
+        with open(args.save, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nSaved results to {args.save}")
+
+    if args.compare:
+        with open(args.compare, "r") as f:
+            baseline = json.load(f)["results"]
+
+        rows = compare(baseline, results, args.threshold)
+        regressions = [row for row in rows if row[4]]
+
+        print(f"\nComparison against {args.compare} (threshold {args.threshold:.0%}):")
+        for name, base_value, value, change, regressed in rows:
+            flag = "REGRESSION" if regressed else "ok"
+            print(f"  {name:45s} {base_value:12.2f} -> {value:12.2f} ({change:+.1%}) {flag}")
+
+        if regressions:
+            print(f"\n{len(regressions)} metric(s) regressed beyond {args.threshold:.0%}")
+            return 1
+        print("\nNo regressions")
+
+    return 0
@@ -0,0 +1,80 @@
+"""
+Timing helpers shared by the benchmarks
+"""
+import statistics
+import time
+from typing import Callable, Dict, Iterable, List
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of samples"""
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def metric(value: float, unit: str, higher_is_better: bool) -> Dict:
+    """Build a result entry"""
+    return {"value": value, "unit": unit, "higher_is_better": higher_is_better}
+
+
+def time_each(func: Callable, items: Iterable, warmup: int = 5) -> List[float]:
+    """
+    Call func once per item and return per-call latencies in seconds
+
+    Args:
+        func: Function under test
+        items: Arguments, one call each
+        warmup: Number of leading items to run untimed first
+    """
+    items = list(items)
+    for item in items[:warmup]:
+        func(item)
+
+    samples = []
+    for item in items:
+        start = time.perf_counter()
+        func(item)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def latency_metrics(prefix: str, samples: List[float], unit: str = "steps/s") -> Dict[str, Dict]:
+    """
+    Summarize latency samples as throughput plus p50/p99
+
+    Args:
+        prefix: Metric name prefix (e.g. "extractor.seed")
+        samples: Per-call latencies in seconds
+        unit: Throughput unit label
+
+    Returns:
+        Dict of metric name -> result entry
+    """
+    total = sum(samples)
+    return {
+        f"{prefix}.throughput": metric(len(samples) / total if total else 0.0, unit, True),
+        f"{prefix}.p50_ms": metric(statistics.median(samples) * 1000, "ms", False),
+        f"{prefix}.p99_ms": metric(percentile(samples, 99) * 1000, "ms", False),
+    }
+
+
+def ops_per_second(func: Callable, items: List, repeat: int = 5) -> float:
+    """
+    Measure throughput of a cheap function over a list of inputs
+
+    Args:
+        func: Function under test
+        items: Arguments, one call each per round
+        repeat: Number of rounds; the best round is reported
+
+    Returns:
+        Calls per second for the fastest round
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for item in items:
+            func(item)
+        best = min(best, time.perf_counter() - start)
+    return len(items) / best if best else 0.0
@@ -18,8 +18,23 @@ python -c "from app.database import init_db; init_db()"
 echo "==> Seeding cooking actions..."
 python scripts/5_seed_database.py
 
+echo "==> Compiling taxonomy matcher artifact..."
+python scripts/compile_taxonomy.py
+
+echo "==> Building content-addressed image store..."
+python scripts/build_image_store.py
+
 echo "==> Linking images to cooking actions..."
 python scripts/8_migrate_action_images.py
 
+echo "==> Generating resized image variants..."
+python scripts/generate_image_variants.py
+
+echo "==> Publishing content-hashed image URLs..."
+python scripts/9_publish_hashed_assets.py
+
+echo "==> Packing technique thumbnails into sprite sheets..."
+python scripts/build_sprite_atlas.py
+
 echo "==> Build completed successfully!"
 echo "Note: Create recipes via API after deployment"
@@ -0,0 +1,95 @@
+"""
+Shared pytest fixtures
+
+Tests run against a scratch SQLite database and never read the compiled
+taxonomy artifact in data/taxonomy (it may have been built against another
+database). Tests that need the spaCy model are skipped when it is not
+installed (python -m spacy download en_core_web_sm).
+"""
+import contextlib
+import importlib.util
+import io
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).parent
+
+# Must be set before app.config is imported
+_scratch = tempfile.mkdtemp(prefix="recipe-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_scratch}/test.db"
+os.environ["TAXONOMY_ARTIFACT_PATH"] = f"{_scratch}/cooking_actions.rtax"
+os.environ["NLP_TAXONOMY_POLL_SECONDS"] = "0"
+
+# Relative settings paths (taxonomy, static dir) are resolved from backend/
+os.chdir(BACKEND_DIR)
+sys.path.insert(0, str(BACKEND_DIR))
+
+
+@pytest.fixture(scope="session")
+def spacy_model():
+    """Name of the installed spaCy model (skips the test if it is missing)"""
+    import spacy
+    from app.config import settings
+
+    try:
+        spacy.load(settings.SPACY_MODEL)
+    except OSError:
+        pytest.skip(f"spaCy model {settings.SPACY_MODEL} is not installed")
+    return settings.SPACY_MODEL
+
+
+@pytest.fixture(scope="session")
+def taxonomy_actions():
+    """Taxonomy actions with their taxonomy IDs"""
+    from app.config import settings
+    from app.nlp.action_matcher import load_taxonomy_for_matcher
+
+    return load_taxonomy_for_matcher(settings.TAXONOMY_PATH)
+
+
+@pytest.fixture(scope="session")
+def seeded_db():
+    """Create the tables and seed cooking actions (once per session)"""
+    from app.database import init_db
+
+    path = BACKEND_DIR / "scripts" / "5_seed_database.py"
+    spec = importlib.util.spec_from_file_location("seed_database", path)
+    module = importlib.util.module_from_spec(spec)
+    with contextlib.redirect_stdout(io.StringIO()):
+        init_db()
+        spec.loader.exec_module(module)
+        module.seed_cooking_actions()
+
+
+@pytest.fixture(scope="session")
+def client(spacy_model, seeded_db):
+    """TestClient for the app, against the seeded scratch database"""
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def db(seeded_db):
+    """Session on the scratch database"""
+    from app.database import SessionLocal
+
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def action_ids(db):
+    """Canonical action name -> database ID"""
+    from app.models import CookingAction
+
+    return {action.canonical_name: str(action.id) for action in db.query(CookingAction)}
@@ -0,0 +1,140 @@
+"""
+Re-match Script - Apply taxonomy changes to existing recipe steps
+Matches every step against the current taxonomy from its stored parse
+(step_parses), so only steps without an up-to-date parse go through spaCy;
+those are parsed once and stored for next time. Run after editing the
+taxonomy, reseeding cooking actions and recompiling the artifact.
+"""
+import argparse
+import sys
+import os
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# Change to backend directory
+os.chdir(Path(__file__).parent.parent)
+
+from sqlalchemy.orm import selectinload
+
+from app.config import settings
+from app.database import get_db_context
+from app.models import CookingAction, RecipeStep, StepParse, TaxonomyVersion
+from app.nlp import ActionExtractor, ActionMatcher
+from app.nlp.artifact import ArtifactError, load_matcher
+from app.nlp.docstore import doc_from_bytes, doc_to_bytes, pipeline_id, text_digest
+from app.nlp.packed import store_step_actions
+
+parser = argparse.ArgumentParser(description="Re-match recipe steps against the current taxonomy")
+parser.add_argument("--reparse", action="store_true", help="Re-parse every step, ignoring stored parses")
+
+
+def build_matcher(db) -> ActionMatcher:
+    """Matcher with database IDs, the same way the recipes API builds it"""
+    try:
+        return load_matcher(
+            settings.TAXONOMY_ARTIFACT_PATH,
+            ids="database",
+            fuzzy_max_distance=settings.NLP_FUZZY_MAX_DISTANCE,
+            taxonomy_version=TaxonomyVersion.current(db),
+            database_ids=[str(action_id) for action_id, in db.query(CookingAction.id)]
+        )
+    except ArtifactError as e:
+        print(f"⚠️  Taxonomy artifact unavailable ({e}), loading actions from database")
+        taxonomy_actions = [
+            {
+                "id": action.id,
+                "canonical_name": action.canonical_name,
+                "synonyms": action.synonyms or [],
+                "category": action.category,
+                "priority": action.priority or 1
+            }
+            for action in db.query(CookingAction).all()
+        ]
+        return ActionMatcher(taxonomy_actions, settings.NLP_FUZZY_MAX_DISTANCE)
+
+
+def rematch_steps(reparse: bool = False):
+    """
+    Re-match all recipe steps, parsing only those without a current stored parse
+
+    Args:
+        reparse: Ignore stored parses and parse every step
+
+    Returns:
+        (steps, steps parsed, steps updated, parse seconds, match seconds)
+    """
+    with get_db_context() as db:
+        extractor = ActionExtractor(build_matcher(db), settings.SPACY_MODEL, fast_path=False)
+        pipeline = pipeline_id(extractor.nlp)
+
+        steps = db.query(RecipeStep).options(selectinload(RecipeStep.parse)).all()
+        print(f"\nFound {len(steps)} steps ({pipeline})")
+
+        # Parse steps whose stored parse is missing or stale, in one pass
+        stale = [
+            step for step in steps
+            if reparse or step.parse is None
+            or step.parse.pipeline != pipeline
+            or step.parse.text_sha256 != text_digest(step.instruction_text)
+        ]
+        start = time.perf_counter()
+        docs = {}
+        if stale:
+            parsed = extractor.parse([step.instruction_text for step in stale], settings.NLP_PIPE_BATCH_SIZE)
+            for step, doc in zip(stale, parsed):
+                docs[step.id] = doc
+                if step.parse is None:
+                    step.parse = StepParse()
+                step.parse.text_sha256 = text_digest(step.instruction_text)
+                step.parse.pipeline = pipeline
+                step.parse.doc = doc_to_bytes(doc)
+        parse_seconds = time.perf_counter() - start
+
+        # Packed steps stay packed (app.nlp.packed)
+        codes = dict(db.query(CookingAction.id, CookingAction.code))
+
+        # Pure matching pass over every step
+        start = time.perf_counter()
+        updated = 0
+        for step in steps:
+            doc = docs.get(step.id) or doc_from_bytes(step.parse.doc, extractor.nlp.vocab)
+            extracted = extractor.extract_from_doc(doc)
+
+            pack = settings.NLP_PACK_STEP_ACTIONS or step.packed_actions is not None
+            updated += store_step_actions(step, extracted, codes if pack else None)
+        match_seconds = time.perf_counter() - start
+
+    return len(steps), len(stale), updated, parse_seconds, match_seconds
+
+
+def main():
+    """Main entry point"""
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Re-matching Recipe Steps Against the Taxonomy")
+    print("=" * 60)
+
+    try:
+        total, parsed, updated, parse_seconds, match_seconds = rematch_steps(args.reparse)
+
+        print("\n" + "=" * 60)
+        print(f"✅ Re-match complete!")
+        print(f"   Steps: {total}, updated: {updated}")
+        print(f"   Parsed: {parsed} in {parse_seconds * 1000:.1f} ms")
+        print(f"   Matched from stored parses: {total - parsed}")
+        print(f"   Matching pass: {match_seconds * 1000:.1f} ms")
+        print("=" * 60)
+
+    except Exception as e:
+        print(f"\n❌ Error re-matching steps: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
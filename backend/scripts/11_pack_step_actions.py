@@ -0,0 +1,169 @@
+"""
+Migration Script - Pack recipe step actions into one binary column
+Gives every cooking action a code, then converts steps stored as JSON
+(extracted_actions + nlp_confidence) to RecipeStep.packed_actions
+(app.nlp.packed) and clears the JSON columns. Spans are not known for
+converted steps; re-matching (scripts/10_rematch_steps.py) fills them in.
+Run with --unpack to convert back.
+"""
+import argparse
+import json
+import sys
+import os
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# Change to backend directory
+os.chdir(Path(__file__).parent.parent)
+
+from sqlalchemy import text
+
+from app.database import engine, get_db_context, init_db
+from app.models import CookingAction, RecipeStep
+from app.nlp.packed import pack_actions, unpack_actions
+
+parser = argparse.ArgumentParser(description="Convert recipe step actions between JSON and packed storage")
+parser.add_argument("--unpack", action="store_true", help="Convert packed steps back to JSON")
+parser.add_argument("--chunk-size", type=int, default=1000, help="Steps converted per transaction")
+parser.add_argument("--vacuum", action="store_true", help="VACUUM afterwards and report the file size (SQLite)")
+
+
+def assign_action_codes() -> int:
+    """
+    Give every cooking action without a code the next free one
+
+    Returns:
+        Number of actions that got a code
+    """
+    # Adds the code column and its index on databases created before them
+    init_db()
+
+    with get_db_context() as db:
+        next_code = CookingAction.next_code(db)
+        actions = db.query(CookingAction).filter(CookingAction.code.is_(None)).order_by(
+            CookingAction.created_at, CookingAction.canonical_name
+        ).all()
+        for action in actions:
+            action.code = next_code
+            next_code += 1
+        db.commit()
+    return len(actions)
+
+
+def _json_size(step: RecipeStep) -> int:
+    """Bytes of a step's JSON columns as stored"""
+    size = 0
+    for value in (step.extracted_actions, step.nlp_confidence):
+        if value is not None:
+            size += len(json.dumps(value))
+    return size
+
+
+def convert_steps(unpack: bool, chunk_size: int):
+    """
+    Convert steps between JSON and packed storage
+
+    Steps referring to an action that no longer exists keep their JSON.
+
+    Args:
+        unpack: Convert packed steps to JSON instead
+        chunk_size: Steps per transaction
+
+    Returns:
+        (steps converted, steps skipped, JSON bytes, packed bytes)
+    """
+    with get_db_context() as db:
+        codes = {}
+        for action_id, code in db.query(CookingAction.id, CookingAction.code):
+            codes[str(action_id)] = code
+        ids_by_code = {code: action_id for action_id, code in codes.items()}
+
+        if unpack:
+            pending = RecipeStep.packed_actions.isnot(None)
+        else:
+            pending = RecipeStep.packed_actions.is_(None) & RecipeStep.extracted_actions.isnot(None)
+        step_ids = [step_id for step_id, in db.query(RecipeStep.id).filter(pending).order_by(RecipeStep.id)]
+        print(f"\nFound {len(step_ids)} steps to convert")
+
+        converted = skipped = json_bytes = packed_bytes = 0
+        for i in range(0, len(step_ids), chunk_size):
+            steps = db.query(RecipeStep).filter(RecipeStep.id.in_(step_ids[i:i + chunk_size])).all()
+            for step in steps:
+                if unpack:
+                    actions = unpack_actions(step.packed_actions)
+                    if any(action.code not in ids_by_code for action in actions):
+                        skipped += 1
+                        continue
+                    packed_bytes += len(step.packed_actions)
+                    step.extracted_actions = [ids_by_code[action.code] for action in actions]
+                    step.nlp_confidence = {ids_by_code[action.code]: action.confidence for action in actions}
+                    step.packed_actions = None
+                    json_bytes += _json_size(step)
+                else:
+                    action_ids = step.extracted_actions or []
+                    confidence = step.nlp_confidence or {}
+                    if any(codes.get(action_id) is None for action_id in action_ids):
+                        skipped += 1
+                        continue
+                    json_bytes += _json_size(step)
+                    step.packed_actions = pack_actions(
+                        (codes[action_id], confidence.get(action_id, 1.0), None, None)
+                        for action_id in action_ids
+                    )
+                    step.extracted_actions = None
+                    step.nlp_confidence = None
+                    packed_bytes += len(step.packed_actions)
+                converted += 1
+            db.commit()
+            print(f"  {min(i + chunk_size, len(step_ids))}/{len(step_ids)} steps")
+
+    return converted, skipped, json_bytes, packed_bytes
+
+
+def vacuum_sqlite():
+    """Reclaim freed pages and return the database file size (None if not SQLite)"""
+    if engine.dialect.name != "sqlite" or not engine.url.database:
+        return None
+    with engine.connect() as conn:
+        conn.execution_options(isolation_level="AUTOCOMMIT").execute(text("VACUUM"))
+    return os.path.getsize(engine.url.database)
+
+
+def main():
+    """Main entry point"""
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Migration: " + ("Unpacking" if args.unpack else "Packing") + " Recipe Step Actions")
+    print("=" * 60)
+
+    try:
+        if args.vacuum:
+            before = vacuum_sqlite()
+        coded = assign_action_codes()
+        print(f"\nAssigned codes to {coded} cooking actions")
+
+        converted, skipped, json_bytes, packed_bytes = convert_steps(args.unpack, args.chunk_size)
+
+        print("\n" + "=" * 60)
+        print(f"✅ Converted {converted} steps ({skipped} skipped: unknown actions)")
+        if converted:
+            print(f"   JSON: {json_bytes} bytes, packed: {packed_bytes} bytes "
+                  f"({packed_bytes / max(json_bytes, 1):.1%})")
+        if args.vacuum:
+            after = vacuum_sqlite()
+            if before is not None:
+                print(f"   Database file: {before} -> {after} bytes")
+        print("=" * 60)
+
+    except Exception as e:
+        print(f"\n❌ Error during migration: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -13,7 +13,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 os.chdir(Path(__file__).parent.parent)
 
 from app.database import get_db_context
-from app.models import CookingAction
+from app.models import CookingAction, TaxonomyVersion
 from app.config import settings
 
 
@@ -39,6 +39,9 @@ def seed_cooking_actions():
     actions_added = 0
 
     with get_db_context() as db:
+        # Small stable numbers for packed step actions (app.nlp.packed)
+        next_code = CookingAction.next_code(db)
+
         # Clear existing actions (optional - comment out if you want to preserve)
         # db.query(CookingAction).delete()
         # print("Cleared existing cooking actions")
@@ -79,18 +82,26 @@ def seed_cooking_actions():
                     synonyms=action_data.get("synonyms", []),
                     description=action_data.get("description"),
                     category=category_id,
+                    code=next_code,
                     priority=action_data.get("priority", 1),
                     difficulty=action_data.get("difficulty", "easy"),
                     image_url=image_path,
-                    thumbnail_url=image_path,  # Use same image for thumbnail
+                    # Resized thumbnails come from scripts/generate_image_variants.py
+                    thumbnail_url=None,
                     attribution="Photo from Pexels",
                     license="Pexels License"
                 )
 
                 db.add(action)
+                next_code += 1
                 actions_added += 1
                 print(f"  ✅ Added '{action_data['canonical_name']}'")
 
+        if actions_added:
+            # Running API workers pick the new actions up without a restart
+            version = TaxonomyVersion.bump(db)
+            print(f"\nTaxonomy version is now {version}")
+
         db.commit()
 
     print(f"\n✨ Successfully seeded {actions_added} cooking actions!")
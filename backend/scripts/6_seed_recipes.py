@@ -7,6 +7,7 @@ from app.database import get_db_context
 from app.models import Recipe, RecipeStep, CookingAction
 from app.nlp import ActionExtractor, ActionMatcher
 from app.nlp.action_matcher import load_taxonomy_for_matcher
+from app.nlp.artifact import ArtifactError, load_matcher
 from app.config import settings
 
 # Example comprehensive recipes
@@ -108,9 +109,16 @@ def seed_recipes():
     print("Seeding Example Recipes")
     print("=" * 60)
 
-    # Initialize NLP components
-    taxonomy_actions = load_taxonomy_for_matcher(settings.TAXONOMY_PATH)
-    matcher = ActionMatcher(taxonomy_actions)
+    # Initialize NLP components (compiled artifact if present and current)
+    try:
+        matcher = load_matcher(
+            settings.TAXONOMY_ARTIFACT_PATH,
+            fuzzy_max_distance=settings.NLP_FUZZY_MAX_DISTANCE,
+            taxonomy_path=settings.TAXONOMY_PATH
+        )
+    except ArtifactError:
+        taxonomy_actions = load_taxonomy_for_matcher(settings.TAXONOMY_PATH)
+        matcher = ActionMatcher(taxonomy_actions, settings.NLP_FUZZY_MAX_DISTANCE)
     extractor = ActionExtractor(matcher, settings.SPACY_MODEL)
 
     recipes_added = 0
@@ -140,7 +148,8 @@ def seed_recipes():
                 step = RecipeStep(
                     recipe_id=recipe.id,
                     step_number=idx,
-                    instruction_text=step_text
+                    instruction_text=step_text,
+                    extracted_actions=[]
                 )
                 db.add(step)
                 db.flush()  # Get the step ID
@@ -44,7 +44,7 @@ def migrate_extract_actions():
         ]
         print(f"Loaded {len(taxonomy_actions)} actions from database")
 
-        matcher = ActionMatcher(taxonomy_actions)
+        matcher = ActionMatcher(taxonomy_actions, settings.NLP_FUZZY_MAX_DISTANCE)
         extractor = ActionExtractor(matcher, settings.SPACY_MODEL)
         # Get all recipes
         recipes = db.query(Recipe).all()
@@ -12,7 +12,11 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 # Change to backend directory
 os.chdir(Path(__file__).parent.parent)
 
+from app.config import settings
 from app.database import get_db_context
+from app.images.assets import AssetPublisher
+from app.images.derivatives import load_image_index, select_thumbnail
+from app.images.store import ImageStore
 from app.models import CookingAction
 
 
@@ -23,7 +27,15 @@ def migrate_action_images():
     print("=" * 60)
 
     actions_updated = 0
-    images_dir = "static/images/techniques"
+
+    # Images are resolved from the store manifest (scripts/build_image_store.py)
+    store = ImageStore("static/images/store")
+
+    # Resized derivatives from scripts/generate_image_variants.py (if run)
+    image_index = load_image_index("static/images/variants", "/static/images/variants")
+
+    # Compare against logical URLs; hashed ones come from 9_publish_hashed_assets.py
+    publisher = AssetPublisher("static")
 
     with get_db_context() as db:
         # Get all cooking actions
@@ -32,31 +44,38 @@ def migrate_action_images():
 
         for action in actions:
             action_name = action.canonical_name
-            image_path = None
-
-            # Try different image file patterns
-            for pattern in [f"{action_name}-pexels.jpg", f"{action_name}-curated.jpg", f"{action_name}-demo.jpg", f"{action_name}-real.jpg"]:
-                full_path = os.path.join(images_dir, pattern)
-                if os.path.exists(full_path):
-                    image_path = f"/static/images/techniques/{pattern}"
-                    break
+            resolved = store.resolve(action_name)
 
             # Update action if image found
-            if image_path:
-                if action.image_url != image_path:
+            if resolved:
+                source, digest = resolved
+                image_path = store.blob_url(digest)
+                entry = image_index.get(store.blob_filename(digest), {})
+                variants = entry.get("variants")
+                thumbnail = select_thumbnail(variants, settings.IMAGE_THUMBNAIL_WIDTH) if variants else None
+                thumbnail_path = thumbnail["url"] if thumbnail else None
+
+                if (
+                    publisher.logical_url(action.image_url) != image_path
+                    or publisher.logical_url(action.thumbnail_url) != thumbnail_path
+                ):
                     action.image_url = image_path
-                    action.thumbnail_url = image_path
+                    action.thumbnail_url = thumbnail_path
+                    action.image_variants = variants
+                    action.image_width = entry.get("width")
+                    action.image_height = entry.get("height")
+                    action.image_placeholder = entry.get("placeholder")
                     action.attribution = "Photo from Pexels"
                     action.license = "Pexels License"
                     actions_updated += 1
-                    print(f"  ✅ {action_name}: {pattern}")
+                    print(f"  ✅ {action_name}: {source} ({digest[:12]})")
                 else:
                     print(f"  ⏭️  {action_name}: already has image")
             else:
                 if action.image_url:
-                    print(f"  ⚠️  {action_name}: has image_url but file not found")
+                    print(f"  ⚠️  {action_name}: has image_url but no image in store")
                 else:
-                    print(f"  ❌ {action_name}: no image file found")
+                    print(f"  ❌ {action_name}: no image in store")
 
         # Commit all changes
         db.commit()
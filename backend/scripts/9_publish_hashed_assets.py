@@ -0,0 +1,91 @@
+"""
+Migration Script - Publish technique images under content-hashed URLs
+Copies each action's image, thumbnail and variants to static/assets with a
+content hash in the filename and points the action at the hashed URLs, which
+are served with immutable far-future caching
+"""
+import sys
+import os
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# Change to backend directory
+os.chdir(Path(__file__).parent.parent)
+
+from app.database import get_db_context
+from app.images.assets import AssetPublisher
+from app.models import CookingAction
+
+
+def publish_hashed_assets():
+    """Publish action images and rewrite their URLs"""
+    print("=" * 60)
+    print("Migration: Publishing Content-Hashed Image URLs")
+    print("=" * 60)
+
+    publisher = AssetPublisher("static")
+    actions_updated = 0
+
+    with get_db_context() as db:
+        actions = db.query(CookingAction).filter(CookingAction.image_url.isnot(None)).all()
+        print(f"\nFound {len(actions)} cooking actions with images\n")
+
+        for action in actions:
+            image_url = publisher.publish(publisher.logical_url(action.image_url))
+            if image_url is None:
+                print(f"  ❌ {action.canonical_name}: source file not found for {action.image_url}")
+                continue
+
+            thumbnail_url = action.thumbnail_url
+            if thumbnail_url:
+                thumbnail_url = publisher.publish(publisher.logical_url(thumbnail_url)) or thumbnail_url
+
+            variants = []
+            for variant in action.image_variants or []:
+                url = publisher.publish(publisher.logical_url(variant["url"]))
+                variants.append(dict(variant, url=url or variant["url"]))
+
+            if (
+                action.image_url != image_url
+                or action.thumbnail_url != thumbnail_url
+                or (action.image_variants or []) != variants
+            ):
+                action.image_url = image_url
+                action.thumbnail_url = thumbnail_url
+                action.image_variants = variants or action.image_variants
+                actions_updated += 1
+                print(f"  ✅ {action.canonical_name}: {image_url}")
+            else:
+                print(f"  ⏭️  {action.canonical_name}: already published")
+
+        db.commit()
+
+    publisher.save()
+
+    print("\n" + "=" * 60)
+    print(f"✅ Migration complete!")
+    print(f"   Actions updated: {actions_updated}")
+    print("=" * 60)
+
+    return actions_updated
+
+
+def main():
+    """Main entry point"""
+    try:
+        count = publish_hashed_assets()
+        if count > 0:
+            print(f"\n🎉 Successfully published images for {count} cooking actions!")
+        else:
+            print("\n✨ All cooking action images are already published")
+    except Exception as e:
+        print(f"\n❌ Error during migration: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
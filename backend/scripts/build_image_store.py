@@ -0,0 +1,63 @@
+"""
+Image Store Script - Build the content-addressed technique image store
+Adds every image in static/images/techniques (and, where an action/source is
+missing there, static/images/techniques_backup) to static/images/store,
+storing identical files once
+"""
+import sys
+import os
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# Change to backend directory
+os.chdir(Path(__file__).parent.parent)
+
+from app.images.store import ImageStore
+
+STORE_DIR = Path("static/images/store")
+SOURCE_DIRS = [
+    (Path("static/images/techniques"), True),
+    (Path("static/images/techniques_backup"), False),
+]
+
+
+def build_image_store():
+    """Add technique images to the store and drop unreferenced blobs"""
+    store = ImageStore(STORE_DIR)
+    blobs_before = len(store.blobs)
+    files = 0
+
+    for directory, overwrite in SOURCE_DIRS:
+        added = store.add_directory(directory, overwrite=overwrite)
+        files += len(added)
+        print(f"  📁 {directory}: {len(added)} images")
+
+    removed = store.prune()
+    store.save()
+
+    print(f"\n  Files indexed: {files}")
+    print(f"  Blobs: {len(store.blobs)} ({len(store.blobs) - blobs_before:+d}, {removed} pruned)")
+    print(f"  Actions: {len(store.actions)}")
+    return store
+
+
+def main():
+    """Main entry point"""
+    print("=" * 60)
+    print("Image Store: Indexing Technique Images")
+    print("=" * 60)
+
+    try:
+        build_image_store()
+        print("\n✅ Image store up to date")
+    except Exception as e:
+        print(f"\n❌ Error building image store: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Sprite Atlas Script - Pack technique thumbnails into sprite sheets
+Writes content-hashed sheets to static/assets and the coordinate map to
+static/images/sprites/atlas.json, used by GET /api/v1/recipes/{id}/images
+"""
+import sys
+import os
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# Change to backend directory
+os.chdir(Path(__file__).parent.parent)
+
+from app.database import get_db_context
+from app.images.assets import AssetPublisher
+from app.images.sprites import build_atlas, save_atlas
+from app.models import CookingAction
+
+STATIC_DIR = Path("static")
+ATLAS_PATH = STATIC_DIR / "images" / "sprites" / "atlas.json"
+
+
+def collect_tiles():
+    """Find the thumbnail (or full image) file for every action with an image"""
+    publisher = AssetPublisher(str(STATIC_DIR))
+    tiles = []
+
+    with get_db_context() as db:
+        actions = db.query(CookingAction).filter(
+            CookingAction.image_url.isnot(None)
+        ).order_by(CookingAction.category, CookingAction.canonical_name).all()
+
+        for action in actions:
+            url = publisher.logical_url(action.thumbnail_url or action.image_url)
+            path = STATIC_DIR / url[len("/static/"):] if url.startswith("/static/") else None
+            if path is None or not path.is_file():
+                print(f"  ⚠️  {action.canonical_name}: image file not found for {url}")
+                continue
+            tiles.append((action.canonical_name, path))
+
+    return tiles
+
+
+def main():
+    """Main entry point"""
+    print("=" * 60)
+    print("Sprite Atlas: Packing Technique Thumbnails")
+    print("=" * 60)
+
+    try:
+        tiles = collect_tiles()
+        if not tiles:
+            print("\n❌ No technique images found")
+            sys.exit(1)
+
+        atlas = build_atlas(tiles, STATIC_DIR / "assets")
+        save_atlas(atlas, ATLAS_PATH)
+
+        print(f"\n✅ Packed {len(atlas['tiles'])} thumbnails into {len(atlas['sheets'])} sheet(s)")
+        for sheet in atlas["sheets"]:
+            print(f"   {sheet['width']}x{sheet['height']}: {', '.join(sheet['urls'].values())}")
+        print(f"   Map: {ATLAS_PATH}")
+
+    except Exception as e:
+        print(f"\n❌ Error building sprite atlas: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
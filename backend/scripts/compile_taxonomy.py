@@ -0,0 +1,86 @@
+"""
+Taxonomy Compiler - Build the memory-mapped matcher artifact
+Compiles the taxonomy JSON (plus CookingAction IDs from the database, when
+seeded) into TAXONOMY_ARTIFACT_PATH, which the API and scripts map at startup
+instead of parsing the JSON or querying every action. Re-run after editing
+the taxonomy or reseeding the database: the API ignores an artifact compiled
+at another taxonomy version or against another database.
+"""
+import sys
+import os
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# Change to backend directory
+os.chdir(Path(__file__).parent.parent)
+
+from sqlalchemy.exc import OperationalError
+
+from app.config import settings
+from app.database import get_db_context
+from app.models import CookingAction, TaxonomyVersion
+from app.nlp.action_matcher import load_taxonomy_for_matcher
+from app.nlp.artifact import compile_taxonomy, file_sha256, load_matcher
+
+
+def database_ids():
+    """
+    CookingAction IDs by canonical name, and the taxonomy version they are from
+
+    Returns:
+        (IDs, TaxonomyVersion) - empty and None if the database isn't seeded
+    """
+    try:
+        with get_db_context() as db:
+            ids = {name: action_id for action_id, name in db.query(CookingAction.id, CookingAction.canonical_name)}
+            return ids, TaxonomyVersion.current(db) if ids else None
+    except OperationalError:
+        return {}, None
+
+
+def main():
+    """Main entry point"""
+    print("=" * 60)
+    print("Taxonomy Compiler: Building Matcher Artifact")
+    print("=" * 60)
+
+    try:
+        actions = load_taxonomy_for_matcher(settings.TAXONOMY_PATH)
+        ids, taxonomy_version = database_ids()
+        for action in actions:
+            action["db_id"] = ids.get(action["canonical_name"])
+
+        linked = sum(1 for action in actions if action["db_id"])
+        if linked < len(actions):
+            print(f"\n⚠️  {len(actions) - linked} of {len(actions)} actions have no database row")
+            print("   The API will fall back to querying the database until this is re-run after seeding")
+
+        counts = compile_taxonomy(
+            actions,
+            Path(settings.TAXONOMY_ARTIFACT_PATH),
+            file_sha256(settings.TAXONOMY_PATH),
+            fuzzy_max_distance=max(settings.NLP_FUZZY_MAX_DISTANCE, 0),
+            taxonomy_version=taxonomy_version
+        )
+
+        start = time.perf_counter()
+        load_matcher(settings.TAXONOMY_ARTIFACT_PATH, fuzzy_max_distance=settings.NLP_FUZZY_MAX_DISTANCE)
+        load_ms = (time.perf_counter() - start) * 1000
+
+        print(f"\n✅ Compiled {counts['actions']} actions to {settings.TAXONOMY_ARTIFACT_PATH}")
+        print(f"   Names: {counts['names']}, forms: {counts['forms']}, "
+              f"fuzzy deletes: {counts['fuzzy_deletes']}, strings: {counts['strings']}")
+        print(f"   Size: {counts['bytes'] / 1024:.1f} KB, load time: {load_ms:.2f} ms")
+
+    except Exception as e:
+        print(f"\n❌ Error compiling taxonomy: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,16 +5,19 @@ Uses pre-vetted CC0/CC-BY images that are known to be freely usable
 import os
 import sys
 import json
-import requests
+import asyncio
 from pathlib import Path
-import time
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from app.database import get_db_context
+from app.images.acquisition import AcquisitionEngine, download_many
+from app.images.store import ImageStore
 from app.models import CookingAction
 
+USER_AGENT = "RecipeImagePlatform/1.0 (Educational project)"
+
 # Curated images from Wikimedia Commons (all CC0 or CC-BY licensed)
 # These are verified free-to-use images
 CURATED_IMAGES = {
@@ -117,23 +120,10 @@ CURATED_IMAGES = {
 }
 
 
-def download_image(url, save_path):
-    """Download image from URL"""
-    try:
-        headers = {
-            "User-Agent": "RecipeImagePlatform/1.0 (Educational project)"
-        }
-        response = requests.get(url, headers=headers, timeout=15, stream=True)
-        response.raise_for_status()
-
-        with open(save_path, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                f.write(chunk)
-
-        return True
-    except Exception as e:
-        print(f"    ❌ Download failed: {e}")
-        return False
+async def download_images(jobs):
+    """Download all images concurrently; returns technique -> error (None on success)"""
+    async with AcquisitionEngine(headers={"User-Agent": USER_AGENT}) as engine:
+        return await download_many(engine, "wikimedia", jobs)
 
 
 def main():
@@ -147,6 +137,7 @@ def main():
     backend_dir = Path(__file__).parent.parent
     static_dir = backend_dir / "static"
     images_dir = static_dir / "images" / "techniques"
+    store = ImageStore(static_dir / "images" / "store")
 
     print(f"Creating directories at: {images_dir}")
     images_dir.mkdir(parents=True, exist_ok=True)
@@ -156,34 +147,41 @@ def main():
     metadata = {}
 
     with get_db_context() as db:
-        for technique, image_info in CURATED_IMAGES.items():
-            print(f"📸 Processing: {technique}")
-
-            # Find action in database
-            action = db.query(CookingAction).filter(
-                CookingAction.canonical_name == technique
-            ).first()
+        actions = {
+            action.canonical_name: action
+            for action in db.query(CookingAction).filter(
+                CookingAction.canonical_name.in_(list(CURATED_IMAGES))
+            )
+        }
 
-            if not action:
-                print(f"    ⚠️  Action '{technique}' not found in database")
+        jobs = {}
+        for technique, image_info in CURATED_IMAGES.items():
+            if technique not in actions:
+                print(f"⚠️  Action '{technique}' not found in database")
                 failed += 1
                 continue
+            jobs[technique] = (image_info["url"], images_dir / f"{technique}-001.jpg")
 
-            # Download image
+        print(f"📥 Downloading {len(jobs)} images from Wikimedia Commons...")
+        print()
+        errors = asyncio.run(download_images(jobs))
+
+        for technique, error in errors.items():
+            image_info = CURATED_IMAGES[technique]
+            action = actions[technique]
             filename = f"{technique}-001.jpg"
-            filepath = images_dir / filename
+            print(f"📸 Processing: {technique}")
 
-            print(f"    📥 Downloading from Wikimedia Commons...")
-            if download_image(image_info["url"], filepath):
+            if error is None:
                 # Build web-accessible URL
-                relative_path = f"/static/images/techniques/{filename}"
+                relative_path = store.blob_url(store.add(images_dir / filename, technique, "curated"))
 
                 # Create attribution
                 attribution = f"Image by {image_info['artist']}, {image_info['license']}, via Wikimedia Commons"
 
                 # Update database
                 action.image_url = relative_path
-                action.thumbnail_url = relative_path
+                action.clear_image_derivatives()
                 action.attribution = attribution
                 action.license = image_info['license']
                 action.wikimedia_file_id = image_info['source_url']
@@ -200,13 +198,14 @@ def main():
                 print(f"    📄 License: {image_info['license']}")
                 print(f"    👤 Artist: {image_info['artist']}")
             else:
+                print(f"    ❌ Download failed: {error}")
                 failed += 1
 
             print()
-            time.sleep(0.5)  # Be nice to servers
 
         # Commit database changes
         db.commit()
+        store.save()
         print("💾 Database updated")
 
     # Save metadata
@@ -5,9 +5,8 @@ Free, high-quality stock photos showing actual cooking techniques
 import os
 import sys
 import json
-import requests
+import asyncio
 from pathlib import Path
-import time
 from dotenv import load_dotenv
 
 # Add parent directory to path
@@ -18,6 +17,8 @@ env_path = Path(__file__).parent.parent / '.env'
 load_dotenv(env_path)
 
 from app.database import get_db_context
+from app.images.acquisition import AcquisitionEngine, AcquisitionError
+from app.images.store import ImageStore
 from app.models import CookingAction
 
 # Get API key from environment
@@ -102,39 +103,50 @@ SEARCH_QUERIES = {
 }
 
 
-def search_pexels(query, per_page=15):
-    """Search Pexels for images"""
-    url = "https://api.pexels.com/v1/search"
-    headers = {"Authorization": PEXELS_API_KEY}
+PEXELS_SEARCH_URL = "https://api.pexels.com/v1/search"
+
+
+async def fetch_technique(engine, technique, images_dir, per_page=15):
+    """
+    Search Pexels for a technique and download the top result
+
+    Returns:
+        (photo, error) - the Pexels photo record on success, otherwise an error message
+    """
     params = {
-        "query": query,
+        "query": SEARCH_QUERIES[technique],
         "per_page": per_page,
         "orientation": "landscape"
     }
-
     try:
-        response = requests.get(url, headers=headers, params=params, timeout=10)
-        response.raise_for_status()
-        return response.json()
-    except Exception as e:
-        print(f"    ❌ Search failed: {e}")
-        return None
+        results = await engine.get_json(
+            "pexels", PEXELS_SEARCH_URL, params=params,
+            headers={"Authorization": PEXELS_API_KEY}
+        )
+    except AcquisitionError as e:
+        return None, f"Search failed: {e}"
 
+    if not results or not results.get('photos'):
+        return None, "No results found"
 
-def download_image(url, save_path):
-    """Download image from Pexels"""
+    # Get the best image (first result is usually most relevant)
+    photo = results['photos'][0]
+
+    # Use 'large' size (good balance of quality and file size)
     try:
-        response = requests.get(url, timeout=15, stream=True)
-        response.raise_for_status()
+        await engine.download("pexels-cdn", photo['src']['large'], images_dir / f"{technique}-pexels.jpg")
+    except AcquisitionError as e:
+        return None, f"Download failed: {e}"
+    return photo, None
 
-        with open(save_path, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                f.write(chunk)
 
-        return True
-    except Exception as e:
-        print(f"    ❌ Download failed: {e}")
-        return False
+async def fetch_all(techniques, images_dir):
+    """Search and download every technique concurrently"""
+    async with AcquisitionEngine() as engine:
+        results = await asyncio.gather(
+            *(fetch_technique(engine, technique, images_dir) for technique in techniques)
+        )
+    return dict(zip(techniques, results))
 
 
 def main():
@@ -147,6 +159,7 @@ def main():
     # Create directories
     backend_dir = Path(__file__).parent.parent
     images_dir = backend_dir / "static" / "images" / "techniques"
+    store = ImageStore(backend_dir / "static" / "images" / "store")
     images_dir.mkdir(parents=True, exist_ok=True)
 
     successful = 0
@@ -160,71 +173,60 @@ def main():
         print(f"Processing {len(actions)} cooking actions...")
         print()
 
+        actions_by_name = {}
         for action in actions:
-            technique = action.canonical_name
-
             # Skip if no search query defined
-            if technique not in SEARCH_QUERIES:
-                print(f"⏭️  Skipping '{technique}' - no search query defined")
+            if action.canonical_name not in SEARCH_QUERIES:
+                print(f"⏭️  Skipping '{action.canonical_name}' - no search query defined")
                 continue
+            actions_by_name[action.canonical_name] = action
 
-            print(f"📸 {technique}: {SEARCH_QUERIES[technique]}")
+        print(f"📥 Searching and downloading {len(actions_by_name)} techniques from Pexels...")
+        print()
+        results = asyncio.run(fetch_all(list(actions_by_name), images_dir))
 
-            # Search Pexels
-            results = search_pexels(SEARCH_QUERIES[technique], per_page=15)
+        for technique, (photo, error) in results.items():
+            action = actions_by_name[technique]
+            print(f"📸 {technique}: {SEARCH_QUERIES[technique]}")
 
-            if not results or not results.get('photos'):
-                print(f"    ⚠️  No results found")
+            if error is not None:
+                print(f"    ❌ {error}")
                 failed += 1
                 print()
                 continue
 
-            # Get the best image (first result is usually most relevant)
-            photo = results['photos'][0]
-
-            # Use 'large' size (good balance of quality and file size)
-            image_url = photo['src']['large']
             photographer = photo['photographer']
             photo_url = photo['url']
-
-            # Download image
             filename = f"{technique}-pexels.jpg"
-            filepath = images_dir / filename
 
-            print(f"    📥 Downloading from Pexels...")
-            print(f"    👤 Photo by: {photographer}")
+            # Build web URL
+            relative_path = store.blob_url(store.add(images_dir / filename, technique, "pexels"))
 
-            if download_image(image_url, filepath):
-                # Build web URL
-                relative_path = f"/static/images/techniques/{filename}"
-
-                # Create attribution
-                attribution = f"Photo by {photographer} from Pexels"
-
-                # Update database
-                action.image_url = relative_path
-                action.thumbnail_url = relative_path
-                action.attribution = attribution
-                action.license = "Pexels License (Free to use)"
-                action.wikimedia_file_id = photo_url
-
-                metadata[technique] = {
-                    "image_url": relative_path,
-                    "photographer": photographer,
-                    "pexels_url": photo_url,
-                    "attribution": attribution
-                }
-
-                successful += 1
-                print(f"    ✅ Saved: {filename}")
-            else:
-                failed += 1
+            # Create attribution
+            attribution = f"Photo by {photographer} from Pexels"
+
+            # Update database
+            action.image_url = relative_path
+            action.clear_image_derivatives()
+            action.attribution = attribution
+            action.license = "Pexels License (Free to use)"
+            action.wikimedia_file_id = photo_url
 
+            metadata[technique] = {
+                "image_url": relative_path,
+                "photographer": photographer,
+                "pexels_url": photo_url,
+                "attribution": attribution
+            }
+
+            successful += 1
+            print(f"    👤 Photo by: {photographer}")
+            print(f"    ✅ Saved: {filename}")
             print()
-            time.sleep(0.5)  # Be respectful to API (200 requests/hour limit)
 
         # Commit all changes
         db.commit()
+        store.save()
         print("💾 Database updated with Pexels images")
 
     # Save metadata
@@ -5,16 +5,19 @@ Uses Pexels API (free) and Unsplash API for real instructional images
 import os
 import sys
 import json
-import requests
+import asyncio
 from pathlib import Path
-import time
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from app.database import get_db_context
+from app.images.acquisition import AcquisitionEngine, download_many
+from app.images.store import ImageStore
 from app.models import CookingAction
 
+USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
+
 # Free image sources - no API key needed for some
 # Pexels has generous free tier
 
@@ -108,23 +111,10 @@ REAL_IMAGES = {
 }
 
 
-def download_image(url, save_path):
-    """Download image from URL with proper headers"""
-    try:
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
-        }
-        response = requests.get(url, headers=headers, timeout=15, stream=True)
-        response.raise_for_status()
-
-        with open(save_path, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                f.write(chunk)
-
-        return True
-    except Exception as e:
-        print(f"    ❌ Download failed: {e}")
-        return False
+async def download_images(jobs):
+    """Download all images concurrently; returns technique -> error (None on success)"""
+    async with AcquisitionEngine(headers={"User-Agent": USER_AGENT}) as engine:
+        return await download_many(engine, "pexels-cdn", jobs)
 
 
 def main():
@@ -137,50 +127,59 @@ def main():
     # Create image directory
     backend_dir = Path(__file__).parent.parent
     images_dir = backend_dir / "static" / "images" / "techniques"
+    store = ImageStore(backend_dir / "static" / "images" / "store")
     images_dir.mkdir(parents=True, exist_ok=True)
 
     successful = 0
     failed = 0
 
     with get_db_context() as db:
-        for technique, image_info in REAL_IMAGES.items():
-            print(f"📸 {technique}: {image_info['description']}")
-
-            # Find action in database
-            action = db.query(CookingAction).filter(
-                CookingAction.canonical_name == technique
-            ).first()
+        actions = {
+            action.canonical_name: action
+            for action in db.query(CookingAction).filter(
+                CookingAction.canonical_name.in_(list(REAL_IMAGES))
+            )
+        }
 
-            if not action:
-                print(f"    ⚠️  Not found in database")
+        jobs = {}
+        for technique in REAL_IMAGES:
+            if technique not in actions:
+                print(f"⚠️  {technique}: not found in database")
                 failed += 1
                 continue
+            jobs[technique] = (REAL_IMAGES[technique]["url"], images_dir / f"{technique}-real.jpg")
 
-            # Download image
+        print(f"📥 Downloading {len(jobs)} photos...")
+        print()
+        errors = asyncio.run(download_images(jobs))
+
+        for technique, error in errors.items():
+            image_info = REAL_IMAGES[technique]
+            action = actions[technique]
             filename = f"{technique}-real.jpg"
-            filepath = images_dir / filename
+            print(f"📸 {technique}: {image_info['description']}")
 
-            print(f"    📥 Downloading from {image_info['source']}...")
-            if download_image(image_info["url"], filepath):
+            if error is None:
                 # Build web URL
-                relative_path = f"/static/images/techniques/{filename}"
+                relative_path = store.blob_url(store.add(images_dir / filename, technique, "real"))
 
                 # Update database
                 action.image_url = relative_path
-                action.thumbnail_url = relative_path
+                action.clear_image_derivatives()
                 action.attribution = f"{image_info['description']} - Photo from {image_info['source']} ({image_info['license']})"
                 action.license = image_info['license']
 
                 successful += 1
                 print(f"    ✅ Saved: {filename}")
             else:
+                print(f"    ❌ Download failed: {error}")
                 failed += 1
 
             print()
-            time.sleep(0.3)  # Be nice to servers
 
         # Commit all changes
         db.commit()
+        store.save()
         print("💾 Database updated with real images")
 
     print(f"\n{'='*70}")
@@ -5,15 +5,16 @@ Searches for and downloads free images for cooking techniques
 import os
 import sys
 import json
-import requests
+import asyncio
 from pathlib import Path
 from urllib.parse import quote
-import time
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from app.database import get_db_context
+from app.images.acquisition import AcquisitionEngine, AcquisitionError
+from app.images.store import ImageStore
 from app.models import CookingAction
 
 # Wikimedia Commons API endpoint
@@ -27,18 +28,22 @@ PRIORITY_TECHNIQUES = [
     "boil", "simmer", "steam"
 ]
 
-def search_wikimedia_images(search_term, limit=5):
+# Add proper headers to avoid 403
+USER_AGENT = "RecipeImagePlatform/1.0 (Educational/Non-commercial project; mailto:noreply@example.com)"
+
+
+async def search_wikimedia_images(engine, search_term, limit=5):
     """
     Search Wikimedia Commons for images
 
     Args:
+        engine: Open AcquisitionEngine
         search_term: Cooking technique to search for
         limit: Maximum number of results
 
     Returns:
         List of image info dicts
     """
-    print(f"  Searching for '{search_term}'...")
 
     # Build search query - focus on cooking/food related images
     query = f"{search_term} cooking technique food preparation"
@@ -54,18 +59,11 @@ def search_wikimedia_images(search_term, limit=5):
         "iiurlwidth": 800,  # Request 800px width thumbnail
     }
 
-    # Add proper headers to avoid 403
-    headers = {
-        "User-Agent": "RecipeImagePlatform/1.0 (Educational/Non-commercial project; mailto:noreply@example.com)"
-    }
-
     try:
-        response = requests.get(COMMONS_API, params=params, headers=headers, timeout=10)
-        response.raise_for_status()
-        data = response.json()
+        data = await engine.get_json("wikimedia", COMMONS_API, params=params)
 
         if "query" not in data or "pages" not in data["query"]:
-            print(f"    ⚠️  No results found")
+            print(f"    ⚠️  {search_term}: no results found")
             return []
 
         images = []
@@ -83,7 +81,7 @@ def search_wikimedia_images(search_term, limit=5):
             # Filter for acceptable licenses (CC0, CC-BY, CC-BY-SA)
             acceptable_licenses = ["CC0", "CC-BY", "CC-BY-SA", "Public domain"]
             if not any(lic in license_short for lic in acceptable_licenses):
-                print(f"    ❌ Skipping {page['title']} - Non-commercial or restrictive license: {license_short}")
+                print(f"    ❌ {search_term}: skipping {page['title']} - Non-commercial or restrictive license: {license_short}")
                 continue
 
             # Extract attribution info
@@ -108,19 +106,20 @@ def search_wikimedia_images(search_term, limit=5):
                 "page_id": page["pageid"]
             })
 
-        print(f"    ✅ Found {len(images)} usable images")
+        print(f"    ✅ {search_term}: found {len(images)} usable images")
         return images
 
-    except Exception as e:
-        print(f"    ❌ Error searching: {e}")
+    except AcquisitionError as e:
+        print(f"    ❌ {search_term}: error searching: {e}")
         return []
 
 
-def download_image(image_info, save_dir, filename):
+async def download_image(engine, image_info, save_dir, filename):
     """
     Download an image from URL
 
     Args:
+        engine: Open AcquisitionEngine
         image_info: Image info dict from search
         save_dir: Directory to save image
         filename: Filename to save as
@@ -128,35 +127,50 @@ def download_image(image_info, save_dir, filename):
     Returns:
         Path to saved image or None
     """
+    # Determine file extension from mime type
+    mime = image_info["mime"]
+    if "jpeg" in mime or "jpg" in mime:
+        ext = "jpg"
+    elif "png" in mime:
+        ext = "png"
+    elif "webp" in mime:
+        ext = "webp"
+    else:
+        ext = "jpg"  # Default
+
     try:
-        url = image_info["url"]
-        response = requests.get(url, timeout=15, stream=True)
-        response.raise_for_status()
-
-        # Determine file extension from mime type
-        mime = image_info["mime"]
-        if "jpeg" in mime or "jpg" in mime:
-            ext = "jpg"
-        elif "png" in mime:
-            ext = "png"
-        elif "webp" in mime:
-            ext = "webp"
-        else:
-            ext = "jpg"  # Default
-
-        filepath = save_dir / f"{filename}.{ext}"
-
-        with open(filepath, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                f.write(chunk)
-
-        return filepath
-
-    except Exception as e:
-        print(f"      ❌ Download failed: {e}")
+        return await engine.download("wikimedia", image_info["url"], save_dir / f"{filename}.{ext}")
+    except AcquisitionError as e:
+        print(f"      ❌ {filename}: download failed: {e}")
         return None
 
 
+async def fetch_technique(engine, technique, images_dir):
+    """
+    Search for a technique and download the first suitable image
+
+    Returns:
+        (image info, saved path) - either may be None on failure
+    """
+    search_results = await search_wikimedia_images(engine, technique, limit=3)
+    if not search_results:
+        return None, None
+
+    # Take the first suitable image
+    best_image = search_results[0]
+    filepath = await download_image(engine, best_image, images_dir, f"{technique}-001")
+    return best_image, filepath
+
+
+async def fetch_all(techniques, images_dir):
+    """Search and download every technique concurrently"""
+    async with AcquisitionEngine(headers={"User-Agent": USER_AGENT}) as engine:
+        results = await asyncio.gather(
+            *(fetch_technique(engine, technique, images_dir) for technique in techniques)
+        )
+    return dict(zip(techniques, results))
+
+
 def main():
     """Main execution"""
     print("="*70)
@@ -168,6 +182,7 @@ def main():
     backend_dir = Path(__file__).parent.parent
     static_dir = backend_dir / "static"
     images_dir = static_dir / "images" / "techniques"
+    store = ImageStore(static_dir / "images" / "store")
 
     print(f"Creating directories at: {images_dir}")
     images_dir.mkdir(parents=True, exist_ok=True)
@@ -189,36 +204,32 @@ def main():
 
         print(f"Found {len(actions)} priority techniques to fetch images for\n")
 
+        print(f"🔍 Searching and downloading {len(actions)} techniques...")
+        results = asyncio.run(fetch_all([action.canonical_name for action in actions], images_dir))
+        print()
+
         # Process each action
         for action in actions:
             print(f"📸 Processing: {action.canonical_name}")
+            best_image, filepath = results[action.canonical_name]
 
-            # Search for images
-            search_results = search_wikimedia_images(action.canonical_name, limit=3)
-
-            if not search_results:
+            if not best_image:
                 failed_downloads += 1
                 print(f"    ⏭️  Skipping (no suitable images found)\n")
                 continue
 
-            # Take the first suitable image
-            best_image = search_results[0]
-
-            # Download image
-            print(f"    📥 Downloading: {best_image['title']}")
-            filename = f"{action.canonical_name}-001"
-            filepath = download_image(best_image, images_dir, filename)
+            print(f"    📥 Downloaded: {best_image['title']}")
 
             if filepath:
                 # Build web-accessible URL
-                relative_path = f"/static/images/techniques/{filepath.name}"
+                relative_path = store.blob_url(store.add(filepath, action.canonical_name, "wikimedia"))
 
                 # Prepare attribution text
                 attribution = f"Image: {best_image['artist']}, {best_image['license']}, via Wikimedia Commons"
 
                 # Update database
                 action.image_url = relative_path
-                action.thumbnail_url = relative_path
+                action.clear_image_derivatives()
                 action.attribution = attribution
                 action.license = best_image['license']
                 action.wikimedia_file_id = best_image['title']
@@ -239,11 +250,9 @@ def main():
 
             print()
 
-            # Be nice to Wikimedia servers
-            time.sleep(1)
-
         # Commit all changes
         db.commit()
+        store.save()
         print("💾 Database updated with image URLs and attribution")
 
     # Save metadata to JSON
@@ -0,0 +1,131 @@
+"""
+Image Variants Script - Generate resized derivatives of technique images
+Reads images from the content-addressed store (scripts/build_image_store.py).
+Writes WebP/JPEG width variants to static/images/variants and records them on
+each cooking action, pointing thumbnail_url at a small variant and storing the
+image size and an inline placeholder preview
+"""
+import argparse
+import sys
+import os
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# Change to backend directory
+os.chdir(Path(__file__).parent.parent)
+
+from app.config import settings
+from app.database import get_db_context, init_db
+from app.images.assets import AssetPublisher
+from app.images.derivatives import generate_derivatives, load_image_index, select_thumbnail
+from app.models import CookingAction
+
+SOURCE_DIR = Path("static/images/store")
+VARIANTS_DIR = Path("static/images/variants")
+VARIANTS_URL = "/static/images/variants"
+
+
+def generate_variants(workers=None, force=False):
+    """Generate derivatives for every technique image"""
+    print(f"Generating {settings.IMAGE_VARIANT_FORMATS} variants at widths {settings.IMAGE_VARIANT_WIDTHS}")
+
+    manifest = generate_derivatives(
+        SOURCE_DIR,
+        VARIANTS_DIR,
+        settings.image_variant_widths_list,
+        settings.image_variant_formats_list,
+        workers=workers,
+        force=force
+    )
+
+    counts = {"generated": 0, "unchanged": 0, "failed": 0}
+    for name, entry in sorted(manifest.items()):
+        status = entry.get("status")
+        if status not in counts:
+            continue
+        counts[status] += 1
+        if status == "generated":
+            print(f"  ✅ {name}: {len(entry['variants'])} variants")
+        elif status == "failed":
+            print(f"  ❌ {name}: {entry['error']}")
+
+    print(f"\nGenerated: {counts['generated']}, unchanged: {counts['unchanged']}, failed: {counts['failed']}")
+    return counts
+
+
+def link_variants():
+    """Record variants, size and placeholder on cooking actions and point thumbnails at them"""
+    image_index = load_image_index(VARIANTS_DIR, VARIANTS_URL)
+    publisher = AssetPublisher("static")
+    actions_updated = 0
+
+    with get_db_context() as db:
+        actions = db.query(CookingAction).filter(CookingAction.image_url.isnot(None)).all()
+
+        for action in actions:
+            source_name = publisher.logical_url(action.image_url).rsplit("/", 1)[-1]
+            entry = image_index.get(source_name)
+            variants = entry["variants"] if entry else None
+            if not variants:
+                print(f"  ⚠️  {action.canonical_name}: no variants for {source_name}")
+                continue
+
+            thumbnail = select_thumbnail(variants, settings.IMAGE_THUMBNAIL_WIDTH)
+            current = [
+                dict(v, url=publisher.logical_url(v["url"]))
+                for v in action.image_variants or []
+            ]
+            if (
+                current != variants
+                or publisher.logical_url(action.thumbnail_url) != thumbnail["url"]
+                or action.image_placeholder != entry["placeholder"]
+            ):
+                action.image_variants = variants
+                action.thumbnail_url = thumbnail["url"]
+                action.image_width = entry["width"]
+                action.image_height = entry["height"]
+                action.image_placeholder = entry["placeholder"]
+                actions_updated += 1
+                print(f"  ✅ {action.canonical_name}: thumbnail {thumbnail['width']}px")
+
+        db.commit()
+
+    return actions_updated
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Generate resized technique image variants")
+    parser.add_argument("--workers", type=int, default=None, help="Process pool size (default: CPU count)")
+    parser.add_argument("--force", action="store_true", help="Regenerate unchanged sources")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Image Variants: Generating Technique Image Derivatives")
+    print("=" * 60)
+
+    try:
+        init_db()
+        counts = generate_variants(workers=args.workers, force=args.force)
+        updated = link_variants()
+
+        print("\n" + "=" * 60)
+        print(f"✅ Variants complete!")
+        print(f"   Sources processed: {counts['generated']}")
+        print(f"   Actions updated: {updated}")
+        print("=" * 60)
+
+        if counts["failed"]:
+            sys.exit(1)
+
+    except Exception as e:
+        print(f"\n❌ Error generating variants: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Image Optimization Script - Shrink technique source images
+Re-encodes JPEG/WebP images without EXIF (progressive JPEG) at the lowest
+quality that keeps SSIM above IMAGE_OPTIMIZE_MIN_SSIM and, if set, fits
+IMAGE_OPTIMIZE_MAX_BYTES. Safe to re-run: processed files are skipped.
+"""
+import argparse
+import sys
+import os
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# Change to backend directory
+os.chdir(Path(__file__).parent.parent)
+
+from app.config import settings
+from app.images.optimize import optimize_directory
+
+DEFAULT_DIRS = ["static/images/techniques", "static/images/techniques_backup"]
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Optimize technique images in place")
+    parser.add_argument("dirs", nargs="*", default=DEFAULT_DIRS, help="Directories to optimize")
+    parser.add_argument("--max-bytes", type=int, default=settings.IMAGE_OPTIMIZE_MAX_BYTES or None,
+                        help="Per-image byte budget")
+    parser.add_argument("--min-ssim", type=float, default=settings.IMAGE_OPTIMIZE_MIN_SSIM,
+                        help="SSIM floor (0 disables)")
+    parser.add_argument("--workers", type=int, default=None, help="Process pool size (default: CPU count)")
+    parser.add_argument("--force", action="store_true", help="Re-process files optimized on earlier runs")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Image Optimization: Re-encoding Technique Images")
+    print("=" * 60)
+
+    try:
+        total_before = total_after = failed = 0
+        for directory in args.dirs:
+            if not Path(directory).is_dir():
+                print(f"\n⏭️  {directory}: not found")
+                continue
+
+            print(f"\n📁 {directory}")
+            results = optimize_directory(
+                Path(directory),
+                max_bytes=args.max_bytes,
+                min_ssim=args.min_ssim or None,
+                workers=args.workers,
+                force=args.force
+            )
+
+            counts = {}
+            for name, result in sorted(results.items()):
+                status = result["status"]
+                counts[status] = counts.get(status, 0) + 1
+                if status == "optimized":
+                    saved = result["before"] - result["after"]
+                    print(f"  ✅ {name}: q{result['quality']}, SSIM {result['ssim']}, -{saved / 1024:.1f} KB")
+                elif status == "failed":
+                    failed += 1
+                    print(f"  ❌ {name}: {result['error']}")
+                if status != "failed":
+                    total_before += result["before"]
+                    total_after += result["after"]
+
+            print("  " + ", ".join(f"{status}: {count}" for status, count in sorted(counts.items())))
+
+        saved = total_before - total_after
+        percent = 100 * saved / total_before if total_before else 0
+        print("\n" + "=" * 60)
+        print(f"✅ Optimization complete!")
+        print(f"   Bytes saved: {saved:,} ({percent:.1f}%)")
+        print(f"   Total size: {total_before:,} -> {total_after:,}")
+        print("=" * 60)
+
+        if failed:
+            sys.exit(1)
+
+    except Exception as e:
+        print(f"\n❌ Error optimizing images: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
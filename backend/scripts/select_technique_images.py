@@ -0,0 +1,183 @@
+"""
+Image Selection Script - Pick the best image per cooking technique
+Scores candidate images (sharpness, exposure, resolution) and drops
+near-duplicates across techniques, instead of taking the first search hit.
+
+Candidates come from data/metadata/<technique>_candidates.json (Pexels search
+results, downloaded to data/cache/candidates) or, with --store, from every
+source already in the image store.
+"""
+import argparse
+import asyncio
+import json
+import sys
+import os
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# Change to backend directory
+os.chdir(Path(__file__).parent.parent)
+
+from app.database import get_db_context
+from app.images.acquisition import AcquisitionEngine, download_many
+from app.images.selection import select_best
+from app.images.store import ImageStore
+from app.models import CookingAction
+
+METADATA_DIR = Path("data/metadata")
+CANDIDATES_DIR = Path("data/cache/candidates")
+TECHNIQUES_DIR = Path("static/images/techniques")
+STORE_DIR = Path("static/images/store")
+SELECTION_FILE = METADATA_DIR / "selected_images.json"
+
+
+def load_search_candidates():
+    """
+    Load Pexels search candidates and download any not cached yet
+
+    Returns:
+        List of (technique, path, candidate record)
+    """
+    candidates = []
+    jobs = {}
+    for candidates_file in sorted(METADATA_DIR.glob("*_candidates.json")):
+        technique = candidates_file.name[:-len("_candidates.json")]
+        with open(candidates_file, "r") as f:
+            records = json.load(f)
+        for record in records:
+            path = CANDIDATES_DIR / f"{record['photo_id']}.jpg"
+            candidates.append((technique, path, record))
+            if not path.exists():
+                jobs[str(record["photo_id"])] = (record["url"], path)
+
+    if jobs:
+        print(f"📥 Downloading {len(jobs)} candidate images...")
+        errors = asyncio.run(_download(jobs))
+        for photo_id, error in errors.items():
+            if error:
+                print(f"    ❌ {photo_id}: {error}")
+
+    return [c for c in candidates if c[1].exists()]
+
+
+async def _download(jobs):
+    async with AcquisitionEngine() as engine:
+        return await download_many(engine, "pexels-cdn", jobs)
+
+
+def load_store_candidates(store):
+    """
+    Use every stored source of every action as a candidate
+
+    Returns:
+        List of (technique, path, candidate record)
+    """
+    return [
+        (action, store.blob_path(digest), {"source": source, "digest": digest})
+        for action, sources in sorted(store.actions.items())
+        for source, digest in sorted(sources.items())
+    ]
+
+
+def apply_selection(store, selection, candidates):
+    """Point each action at its selected image"""
+    updated = 0
+    with get_db_context() as db:
+        actions = {a.canonical_name: a for a in db.query(CookingAction).all()}
+
+        for technique, entry in selection.items():
+            action = actions.get(technique)
+            # Keep the current image rather than one another technique already shows
+            if action is None or entry["fallback"]:
+                continue
+            _, path, record = candidates[entry["index"]]
+
+            if "digest" in record:
+                digest = record["digest"]
+            else:
+                # New Pexels pick: keep the source file alongside the others
+                target = TECHNIQUES_DIR / f"{technique}-pexels.jpg"
+                target.write_bytes(path.read_bytes())
+                digest = store.add(target, technique, "pexels")
+                action.attribution = f"Photo by {record['photographer']} from Pexels"
+                action.license = "Pexels License (Free to use)"
+                action.wikimedia_file_id = record["pexels_url"]
+
+            url = store.blob_url(digest)
+            if action.image_url != url:
+                action.image_url = url
+                action.clear_image_derivatives()
+                updated += 1
+
+        db.commit()
+    store.save()
+    return updated
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Select the best image per cooking technique")
+    parser.add_argument("--store", action="store_true", help="Choose among sources already in the image store")
+    parser.add_argument("--apply", action="store_true", help="Update cooking actions with the selection")
+    parser.add_argument("--workers", type=int, default=None, help="Decoder threads")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Image Selection: Scoring Technique Image Candidates")
+    print("=" * 60)
+
+    try:
+        store = ImageStore(STORE_DIR)
+        candidates = load_store_candidates(store) if args.store else load_search_candidates()
+        if not candidates:
+            print("\n❌ No candidate images found")
+            sys.exit(1)
+
+        start = time.perf_counter()
+        chosen = select_best(
+            [c[0] for c in candidates],
+            [c[1] for c in candidates],
+            workers=args.workers
+        )
+        elapsed = time.perf_counter() - start
+        print(f"\nScored {len(candidates)} candidates for {len(chosen)} techniques in {elapsed:.2f}s\n")
+
+        selection = {}
+        for technique in sorted(chosen):
+            entry = chosen[technique]
+            _, path, record = candidates[entry["index"]]
+            selection[technique] = {
+                "index": entry["index"],
+                "file": str(path),
+                "candidate": record,
+                "scores": entry["scores"],
+                "near_duplicates": [str(candidates[i][1]) for i in entry["duplicates"]],
+                "fallback": entry["fallback"],
+            }
+            if entry["fallback"]:
+                print(f"  ⚠️  {technique}: every candidate duplicates another technique's image, using {path.name}")
+                continue
+            skipped = f", skipped {len(entry['duplicates'])} near-duplicate(s)" if entry["duplicates"] else ""
+            print(f"  ✅ {technique}: {path.name} (score {entry['scores']['total']:.3f}{skipped})")
+
+        METADATA_DIR.mkdir(parents=True, exist_ok=True)
+        with open(SELECTION_FILE, "w") as f:
+            json.dump(selection, f, indent=2, ensure_ascii=False)
+        print(f"\n📄 Selection saved to: {SELECTION_FILE}")
+
+        if args.apply:
+            updated = apply_selection(store, selection, candidates)
+            print(f"💾 Cooking actions updated: {updated}")
+
+    except Exception as e:
+        print(f"\n❌ Error selecting images: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
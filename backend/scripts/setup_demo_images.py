@@ -13,7 +13,10 @@ from PIL import Image, ImageDraw, ImageFont
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from app.config import settings
 from app.database import get_db_context
+from app.images.optimize import optimize_image
+from app.images.store import ImageStore
 from app.models import CookingAction
 
 # Priority techniques for demo
@@ -85,6 +88,7 @@ def main():
     backend_dir = Path(__file__).parent.parent
     static_dir = backend_dir / "static"
     images_dir = static_dir / "images" / "techniques"
+    store = ImageStore(static_dir / "images" / "store")
 
     print(f"Creating directories at: {images_dir}")
     images_dir.mkdir(parents=True, exist_ok=True)
@@ -115,16 +119,21 @@ def main():
                 filename = f"{technique}-demo.jpg"
                 filepath = images_dir / filename
                 img.save(filepath, 'JPEG', quality=85)
+                optimized = optimize_image(
+                    str(filepath),
+                    max_bytes=settings.IMAGE_OPTIMIZE_MAX_BYTES or None,
+                    min_ssim=settings.IMAGE_OPTIMIZE_MIN_SSIM
+                )
 
                 # Build web-accessible URL
-                relative_path = f"/static/images/techniques/{filename}"
+                relative_path = store.blob_url(store.add(filepath, technique, "demo"))
 
                 # Create attribution
                 attribution = "Demo placeholder image. In production, this would be a real image from Wikimedia Commons."
 
                 # Update database
                 action.image_url = relative_path
-                action.thumbnail_url = relative_path
+                action.clear_image_derivatives()
                 action.attribution = attribution
                 action.license = "Demo"
 
@@ -136,7 +145,7 @@ def main():
                 }
 
                 successful += 1
-                print(f"    ✅ Created: {filename}")
+                print(f"    ✅ Created: {filename} ({optimized['after'] / 1024:.1f} KB)")
                 print(f"    📁 Category: {category}")
 
             except Exception as e:
@@ -147,6 +156,7 @@ def main():
 
         # Commit database changes
         db.commit()
+        store.save()
         print("💾 Database updated with demo images")
 
     # Save metadata
@@ -0,0 +1,131 @@
+"""Test concurrent, rate-limited image fetching (app.images.acquisition) against a stub transport"""
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from app.images import acquisition
+from app.images.acquisition import AcquisitionEngine, AcquisitionError, TokenBucket, download_many
+
+FAST = {"default": (1000.0, 1000), "test": (1000.0, 1000)}
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Retry delays requested by the engine (without waiting for them)"""
+    delays = []
+    sleep = asyncio.sleep
+
+    async def record(delay, *args, **kwargs):
+        delays.append(delay)
+        await sleep(0)
+
+    monkeypatch.setattr(acquisition.asyncio, "sleep", record)
+    return delays
+
+
+def _engine(handler, **kwargs) -> AcquisitionEngine:
+    kwargs.setdefault("rate_limits", FAST)
+    return AcquisitionEngine(transport=httpx.MockTransport(handler), **kwargs)
+
+
+def _get_json(engine: AcquisitionEngine, url: str = "http://stub/search"):
+    async def run():
+        async with engine:
+            return await engine.get_json("test", url)
+    return asyncio.run(run())
+
+
+def test_retries_honour_retry_after(sleeps):
+    statuses = [429, 503, 200]
+
+    def handler(request):
+        status = statuses.pop(0)
+        headers = {"Retry-After": "3"} if status == 429 else {}
+        return httpx.Response(status, headers=headers, json={"ok": True})
+
+    result = _get_json(_engine(handler, max_retries=3, backoff_base=0.5, backoff_max=10))
+
+    assert result == {"ok": True}
+    assert statuses == []
+    assert sleeps[0] == 3.0  # Retry-After
+    assert 0.5 <= sleeps[1] <= 1.0  # Jittered backoff for the 503 (second attempt)
+
+
+def test_gives_up_after_max_retries(sleeps):
+    attempts = []
+
+    def handler(request):
+        attempts.append(request.url.path)
+        return httpx.Response(503 if request.url.path == "/busy" else 404)
+
+    with pytest.raises(AcquisitionError, match="HTTP 503"):
+        _get_json(_engine(handler, max_retries=2), "http://stub/busy")
+    assert len(attempts) == 3
+
+    attempts.clear()
+    with pytest.raises(AcquisitionError, match="HTTP 404"):
+        _get_json(_engine(handler, max_retries=2), "http://stub/missing")
+    assert len(attempts) == 1  # Not transient: no retry
+
+
+def test_concurrency_is_capped(tmp_path):
+    in_flight = peak = 0
+
+    async def handler(request):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return httpx.Response(200, content=request.url.path.encode())
+
+    async def run():
+        async with _engine(handler, max_concurrency=3) as engine:
+            jobs = {str(i): (f"http://stub/{i}", tmp_path / f"{i}.jpg") for i in range(12)}
+            return await download_many(engine, "test", jobs)
+
+    errors = asyncio.run(run())
+
+    assert errors == {str(i): None for i in range(12)}
+    assert peak == 3
+    assert (tmp_path / "7.jpg").read_bytes() == b"/7"
+
+
+def test_token_bucket_paces_after_the_burst():
+    async def take(bucket: TokenBucket, count: int) -> float:
+        start = time.monotonic()
+        for _ in range(count):
+            await bucket.acquire()
+        return time.monotonic() - start
+
+    assert asyncio.run(take(TokenBucket(rate=50, capacity=5), 5)) < 0.05
+    # 5 banked tokens, then 5 more at 50/s
+    assert asyncio.run(take(TokenBucket(rate=50, capacity=5), 10)) >= 0.09
+
+
+class _BrokenStream(httpx.AsyncByteStream):
+    """Body that fails after the first chunk"""
+
+    async def __aiter__(self):
+        yield b"partial image data"
+        raise httpx.ReadError("connection reset")
+
+
+def test_failed_stream_leaves_no_partial_file(tmp_path, sleeps):
+    dest = tmp_path / "dice-pexels.jpg"
+    dest.write_bytes(b"previous image")
+
+    def handler(request):
+        return httpx.Response(200, stream=_BrokenStream())
+
+    async def run():
+        async with _engine(handler, max_retries=1) as engine:
+            return await download_many(engine, "test", {"dice": ("http://stub/dice.jpg", dest)})
+
+    errors = asyncio.run(run())
+
+    assert "ReadError" in errors["dice"]
+    assert dest.read_bytes() == b"previous image"
+    assert [path.name for path in tmp_path.iterdir()] == ["dice-pexels.jpg"]
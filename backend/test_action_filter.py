@@ -0,0 +1,80 @@
+"""Test filtering steps and recipes by extracted action (RecipeStep.has_actions)"""
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateIndex
+
+from app.config import settings
+from app.instrumentation import assert_query_budget
+from app.models import Recipe, RecipeStep
+
+URL = "/api/v1/recipes/"
+
+
+@pytest.fixture
+def steps(db):
+    """Steps with known action IDs, removed again afterwards"""
+    recipe = Recipe(title="Filter recipe")
+    db.add(recipe)
+    db.flush()
+    actions = {1: ["a", "b"], 2: ["b"], 3: [], 4: None}
+    db.add_all(
+        RecipeStep(recipe_id=recipe.id, step_number=number, instruction_text="Step", extracted_actions=ids)
+        for number, ids in actions.items()
+    )
+    db.commit()
+    yield recipe.id
+    db.delete(recipe)
+    db.commit()
+
+
+def _step_numbers(db, recipe_id, *action_ids):
+    return sorted(db.scalars(
+        select(RecipeStep.step_number).where(RecipeStep.recipe_id == recipe_id, RecipeStep.has_actions(*action_ids))
+    ))
+
+
+def test_has_actions(db, steps):
+    assert _step_numbers(db, steps, "a") == [1]
+    assert _step_numbers(db, steps, "b") == [1, 2]
+    assert _step_numbers(db, steps, "a", "b") == [1]
+    assert _step_numbers(db, steps, "c") == []
+    assert _step_numbers(db, steps, "a", "c") == []
+
+
+def test_postgresql_uses_jsonb_containment_and_a_gin_index():
+    dialect = postgresql.dialect()
+
+    query = str(select(RecipeStep.id).where(RecipeStep.has_actions("a")).compile(dialect=dialect))
+    index = next(index for index in RecipeStep.__table__.indexes if index.name == "ix_recipe_steps_extracted_actions")
+    ddl = str(CreateIndex(index).compile(dialect=dialect))
+
+    assert "recipe_steps.extracted_actions @> CAST(" in query
+    assert "AS JSONB)" in query
+    assert "USING gin" in ddl and "jsonb_path_ops" in ddl
+    assert RecipeStep.__table__.c.extracted_actions.type.compile(dialect=dialect) == "JSONB"
+
+
+def _create(client, title: str, steps) -> str:
+    response = client.post(URL, json={
+        "title": title,
+        "steps": [{"step_number": number, "instruction_text": text} for number, text in enumerate(steps, 1)]
+    })
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+def test_list_recipes_by_action(client, action_ids, monkeypatch):
+    monkeypatch.setattr(settings, "NLP_PACK_STEP_ACTIONS", False)
+    with_dice = _create(client, "Diced", ["Dice the onion.", "Simmer the sauce."])
+    without_dice = _create(client, "Whisked", ["Whisk the eggs."])
+
+    response = assert_query_budget(client, "get", URL, params={"action_id": action_ids["dice"], "limit": 100})
+
+    assert response.status_code == 200
+    recipes = response.json()
+    ids = {recipe["id"] for recipe in recipes}
+    assert with_dice in ids and without_dice not in ids
+    for recipe in recipes:
+        step_actions = {action["id"] for step in recipe["steps"] for action in step["extracted_actions"]}
+        assert action_ids["dice"] in step_actions
@@ -0,0 +1,83 @@
+"""Test the compiled taxonomy artifact (app.nlp.artifact)"""
+import uuid
+from pathlib import Path
+
+import pytest
+
+from app.config import settings
+from app.models import CookingAction, TaxonomyVersion
+from app.nlp import ActionMatcher
+from app.nlp.artifact import ArtifactError, compile_taxonomy, file_sha256, load_matcher
+
+WORDS = ["dice", "diced", "dicing", "simmer", "simmering", "sautéed", "beaten", "bring to boil", "onion", "heat"]
+
+
+def _compile(path: Path, actions, **kwargs) -> Path:
+    compile_taxonomy(actions, path, file_sha256(settings.TAXONOMY_PATH), fuzzy_max_distance=2, **kwargs)
+    return path
+
+
+def test_round_trip_matches_like_the_source_matcher(tmp_path, taxonomy_actions):
+    path = _compile(tmp_path / "taxonomy.rtax", taxonomy_actions)
+
+    mapped = load_matcher(path, fuzzy_max_distance=2, taxonomy_path=settings.TAXONOMY_PATH)
+    built = ActionMatcher(taxonomy_actions, fuzzy_max_distance=2)
+
+    for word in WORDS:
+        assert mapped.match(word) == built.match(word), word
+        assert mapped.lookup_form(word) == built.lookup_form(word), word
+    for word in ("simer", "julliene", "rice"):
+        assert mapped.match_fuzzy(word) == built.match_fuzzy(word), word
+
+
+def test_artifact_from_another_taxonomy_file_is_rejected(tmp_path, taxonomy_actions):
+    path = tmp_path / "taxonomy.rtax"
+    compile_taxonomy(taxonomy_actions, path, "00" * 32)
+
+    with pytest.raises(ArtifactError):
+        load_matcher(path, taxonomy_path=settings.TAXONOMY_PATH)
+
+
+def test_missing_or_corrupt_artifact_is_rejected(tmp_path):
+    with pytest.raises(ArtifactError):
+        load_matcher(tmp_path / "missing.rtax")
+
+    corrupt = tmp_path / "corrupt.rtax"
+    corrupt.write_bytes(b"not an artifact at all, not even close")
+    with pytest.raises(ArtifactError):
+        load_matcher(corrupt)
+
+
+def test_database_ids_are_checked_against_the_database(tmp_path, taxonomy_actions, db):
+    ids = {action.canonical_name: str(action.id) for action in db.query(CookingAction)}
+    version = TaxonomyVersion.current(db)
+    current = [dict(action, db_id=ids[action["canonical_name"]]) for action in taxonomy_actions]
+    foreign = [dict(action, db_id=str(uuid.uuid4())) for action in taxonomy_actions]
+
+    path = _compile(tmp_path / "current.rtax", current, taxonomy_version=version)
+    matcher = load_matcher(path, ids="database", taxonomy_version=version, database_ids=ids.values())
+    assert matcher.match("dice") == ids["dice"]
+
+    # Reseeded or reloaded since it was compiled
+    with pytest.raises(ArtifactError):
+        load_matcher(path, ids="database", taxonomy_version=version + 1, database_ids=ids.values())
+
+    # Compiled against another database
+    path = _compile(tmp_path / "foreign.rtax", foreign, taxonomy_version=version)
+    with pytest.raises(ArtifactError):
+        load_matcher(path, ids="database", taxonomy_version=version, database_ids=ids.values())
+
+
+def test_recipes_api_ignores_a_foreign_artifact(taxonomy_actions, action_ids):
+    from app.api.v1 import recipes
+
+    foreign = [dict(action, db_id=str(uuid.uuid4())) for action in taxonomy_actions]
+    path = Path(settings.TAXONOMY_ARTIFACT_PATH)
+    _compile(path, foreign, taxonomy_version=0)
+    try:
+        matcher = recipes._build_matcher(True)
+    finally:
+        path.unlink()
+
+    assert getattr(matcher, "artifact", None) is None
+    assert str(matcher.match("dice")) == action_ids["dice"]
@@ -0,0 +1,85 @@
+"""Test stopping the extraction micro-batcher (app.nlp.batching) at shutdown"""
+import asyncio
+import threading
+
+import pytest
+
+from app import main
+from app.nlp import live
+from app.nlp.batching import BatcherClosedError, ExtractionBatcher
+
+
+class BlockingExtractor:
+    """Extractor whose batches run until released"""
+
+    def __init__(self):
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.batches = []
+
+    def extract_many(self, texts, batch_size):
+        self.batches.append(texts)
+        self.started.set()
+        self.release.wait(5)
+        return [f"extraction of {text}" for text in texts]
+
+
+async def _wait_for_batch(extractor: BlockingExtractor):
+    while not extractor.started.is_set():
+        await asyncio.sleep(0.001)
+
+
+def test_close_fails_running_and_queued_requests():
+    extractor = BlockingExtractor()
+    batcher = ExtractionBatcher(extractor, max_batch_size=1, max_wait_ms=0)
+
+    async def run():
+        requests = [asyncio.ensure_future(batcher.extract(text)) for text in ("one", "two", "three")]
+        await _wait_for_batch(extractor)
+        worker = batcher._worker
+
+        await batcher.close()
+        extractor.release.set()
+
+        results = await asyncio.gather(*requests, return_exceptions=True)
+        assert worker.done()
+        assert batcher._worker is None
+
+        # A new request starts a new worker
+        assert await batcher.extract("four") == "extraction of four"
+        await batcher.close()
+        return results
+
+    results = asyncio.run(run())
+
+    assert all(isinstance(result, BatcherClosedError) for result in results)
+    assert extractor.batches == [["one"], ["four"]]
+
+
+def test_close_without_a_worker():
+    asyncio.run(ExtractionBatcher(BlockingExtractor()).close())
+
+
+@pytest.fixture
+def live_batcher():
+    """A LiveExtractor with a blocking batcher, registered like the routers' ones"""
+    extractor = live.LiveExtractor("shutdown", lambda use_artifact: None)
+    extractor._batcher = ExtractionBatcher(BlockingExtractor(), max_wait_ms=0)
+    yield extractor._batcher
+    extractor._batcher.extractor.release.set()
+    live._registry.remove(extractor)
+
+
+def test_app_shutdown_closes_the_batchers(live_batcher):
+    async def run():
+        request = asyncio.ensure_future(live_batcher.extract("Dice the onion."))
+        await _wait_for_batch(live_batcher.extractor)
+
+        await main.shutdown_event()
+        live_batcher.extractor.release.set()
+
+        with pytest.raises(BatcherClosedError):
+            await request
+        assert live_batcher._worker is None
+
+    asyncio.run(run())
@@ -0,0 +1,75 @@
+"""Test multi-resolution image variants (app.images.derivatives)"""
+import hashlib
+import json
+
+import pytest
+from PIL import Image
+
+from app.images.derivatives import MANIFEST_NAME, generate_derivatives, hash_file
+
+WIDTHS = [160, 400, 800]
+FORMATS = ["webp", "jpeg"]
+
+
+@pytest.fixture
+def dirs(tmp_path):
+    source_dir, output_dir = tmp_path / "sources", tmp_path / "variants"
+    source_dir.mkdir()
+    Image.new("RGB", (500, 250), (200, 120, 40)).save(source_dir / "dice.jpg")
+    return source_dir, output_dir
+
+
+def _generate(dirs):
+    return generate_derivatives(*dirs, WIDTHS, FORMATS, workers=1)
+
+
+def _saved(output_dir):
+    return json.loads((output_dir / MANIFEST_NAME).read_text())
+
+
+def test_variant_sizes(dirs):
+    source_dir, output_dir = dirs
+
+    entry = _generate(dirs)["dice.jpg"]
+
+    assert entry["status"] == "generated"
+    assert (entry["width"], entry["height"]) == (500, 250)
+    assert entry["placeholder"].startswith("data:image/webp;base64,")
+    # No upscaling: 800 is wider than the source
+    assert sorted((v["width"], v["height"], v["format"]) for v in entry["variants"]) == [
+        (160, 80, "jpeg"), (160, 80, "webp"), (400, 200, "jpeg"), (400, 200, "webp"),
+    ]
+    for variant in entry["variants"]:
+        with Image.open(output_dir / variant["filename"]) as img:
+            assert img.size == (variant["width"], variant["height"])
+        assert (output_dir / variant["filename"]).stat().st_size == variant["bytes"]
+
+
+def test_manifest_records_the_source_hash(dirs):
+    source_dir, output_dir = dirs
+    _generate(dirs)
+
+    saved = _saved(output_dir)["dice.jpg"]
+
+    assert saved["sha256"] == hashlib.sha256((source_dir / "dice.jpg").read_bytes()).hexdigest()
+    assert saved["sha256"] == hash_file(source_dir / "dice.jpg")
+    assert saved["params"]["widths"] == WIDTHS
+    assert "status" not in saved
+    assert _generate(dirs)["dice.jpg"]["status"] == "unchanged"
+
+
+def test_failed_render_keeps_the_previous_entry(dirs):
+    source_dir, output_dir = dirs
+    _generate(dirs)
+    previous = _saved(output_dir)["dice.jpg"]
+
+    (source_dir / "dice.jpg").write_bytes(b"not an image")
+    (source_dir / "broken.png").write_bytes(b"not an image either")
+    manifest = _generate(dirs)
+
+    assert manifest["dice.jpg"]["status"] == "failed"
+    assert manifest["broken.png"]["status"] == "failed"
+    saved = _saved(output_dir)
+    assert saved["dice.jpg"] == previous
+    assert "broken.png" not in saved
+    assert all((output_dir / v["filename"]).exists() for v in saved["dice.jpg"]["variants"])
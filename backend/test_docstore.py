@@ -0,0 +1,43 @@
+"""Test stored parses and re-matching without re-parsing (app.nlp.docstore)"""
+import pytest
+
+from app.nlp import ActionExtractor, ActionMatcher
+from app.nlp.docstore import doc_from_bytes, doc_to_bytes, pipeline_id, text_digest
+
+TEXTS = [
+    "Dice the onion and simmer the sauce until thick.",
+    "Whisk the eggs. Fold in the flour, then bake for 20 minutes.",
+    "Let the dough rest before kneading it again.",
+]
+
+
+@pytest.fixture(scope="module")
+def extractor(spacy_model, taxonomy_actions):
+    return ActionExtractor(ActionMatcher(taxonomy_actions), spacy_model, cache_size=0, fast_path=False)
+
+
+def test_stored_parse_rematches_like_a_fresh_parse(extractor):
+    for text, doc in zip(TEXTS, extractor.parse(TEXTS)):
+        restored = doc_from_bytes(doc_to_bytes(doc), extractor.nlp.vocab)
+
+        assert restored.text == doc.text
+        assert extractor.extract_from_doc(restored) == extractor.extract(text)
+
+
+def test_rematch_applies_a_changed_taxonomy(extractor, taxonomy_actions):
+    stored = [doc_to_bytes(doc) for doc in extractor.parse(TEXTS)]
+    without_dice = extractor.with_matcher(ActionMatcher(
+        [action for action in taxonomy_actions if action["canonical_name"] != "dice"]
+    ))
+
+    for text, data in zip(TEXTS, stored):
+        rematched = without_dice.extract_from_doc(doc_from_bytes(data, extractor.nlp.vocab))
+        assert "dice" not in rematched.ids()
+        assert rematched.ids() == without_dice.extract(text).ids()
+
+
+def test_parse_identity(extractor):
+    assert text_digest(TEXTS[0]) == text_digest(TEXTS[0])
+    assert text_digest(TEXTS[0]) != text_digest(TEXTS[1])
+    assert pipeline_id(extractor.nlp) == pipeline_id(extractor.nlp)
+    assert pipeline_id(extractor.nlp).startswith(extractor.nlp.meta["lang"])
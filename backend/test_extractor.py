@@ -0,0 +1,59 @@
+"""Test ActionExtractor caching and thread safety"""
+import threading
+
+import pytest
+
+from app.nlp import ActionExtractor, ActionMatcher
+
+TEXTS = [
+    "Dice the onion and simmer the sauce.",
+    "Whisk the eggs, then fold in the flour.",
+    "Let the dough rest, then knead it.",
+] * 10
+
+
+@pytest.fixture(scope="module")
+def extractor(spacy_model, taxonomy_actions):
+    return ActionExtractor(ActionMatcher(taxonomy_actions), spacy_model, cache_size=0)
+
+
+def test_cache_returns_the_same_result(spacy_model, taxonomy_actions):
+    extractor = ActionExtractor(ActionMatcher(taxonomy_actions), spacy_model, cache_size=8)
+
+    first = extractor.extract(TEXTS[0])
+    second = extractor.extract(TEXTS[0])
+
+    assert second.matches is first.matches
+    assert extractor.extract_many(TEXTS[:3]) == [extractor.extract(text) for text in TEXTS[:3]]
+
+
+def test_copies_share_the_pipeline_lock(extractor, taxonomy_actions):
+    clone = extractor.with_matcher(ActionMatcher(taxonomy_actions))
+
+    assert clone.nlp is extractor.nlp
+    assert clone._pipeline_lock is extractor._pipeline_lock
+
+
+def test_concurrent_callers_get_consistent_results(extractor):
+    expected = [extraction.ids() for extraction in extractor.extract_many(TEXTS)]
+    errors = []
+
+    def call(kind: int):
+        try:
+            for _ in range(5):
+                if kind == 0:
+                    assert [extraction.ids() for extraction in extractor.extract_many(TEXTS)] == expected
+                elif kind == 1:
+                    assert [extractor.extract(text).ids() for text in TEXTS] == expected
+                else:
+                    assert len(extractor.parse(TEXTS)) == len(TEXTS)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=call, args=(i % 3,)) for i in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
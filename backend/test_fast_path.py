@@ -0,0 +1,48 @@
+"""Test tokenizer-only matching from the inflection table (ActionExtractor fast path)"""
+import pytest
+import spacy
+
+from app.nlp import ActionExtractor, ActionMatcher
+from app.nlp.component import CookingActionsComponent
+
+
+@pytest.fixture
+def matcher(taxonomy_actions):
+    return ActionMatcher(taxonomy_actions, fuzzy_max_distance=0)
+
+
+@pytest.fixture(scope="module")
+def tokenize():
+    nlp = spacy.blank("en")
+    nlp.add_pipe("sentencizer")
+    return nlp
+
+
+def _untable(matcher, lemma: str):
+    """Drop a verb's forms from the table, like an irregular form it never had"""
+    for form in [form for form, entry in matcher.inflections.items() if entry.lemma == lemma]:
+        del matcher.inflections[form]
+
+
+def test_tabled_forms_match_without_tagging(matcher, tokenize):
+    candidates = CookingActionsComponent._match_forms(tokenize("Dice the onion. Then simmer it."), matcher)
+
+    assert [lemma for _, _, lemma, _, _ in candidates] == ["dice", "simmer"]
+
+
+def test_sentence_without_tabled_form_needs_tagging(matcher, tokenize):
+    _untable(matcher, "chop")
+
+    assert CookingActionsComponent._match_forms(tokenize("Chop the parsley."), matcher) is None
+    assert CookingActionsComponent._match_forms(tokenize("Dice the onion. Chop the parsley."), matcher) is None
+
+
+def test_untabled_verb_is_found_by_the_lemmatizer(spacy_model, matcher):
+    _untable(matcher, "chop")
+
+    fast = ActionExtractor(matcher, spacy_model, cache_size=0, fast_path=True)
+    full = ActionExtractor(matcher, spacy_model, cache_size=0, fast_path=False)
+    text = "Chop the parsley."
+
+    assert [action["action_id"] for action in full.extract_actions(text)] == ["chop"]
+    assert fast.extract_actions(text) == full.extract_actions(text)
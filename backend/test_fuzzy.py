@@ -0,0 +1,58 @@
+"""Test typo-tolerant matching (app.nlp.fuzzy and ActionMatcher.match_fuzzy)"""
+import pytest
+
+from app.nlp import ActionMatcher
+from app.nlp.fuzzy import SymSpellIndex, edit_distance
+
+
+@pytest.fixture(scope="module")
+def matcher(taxonomy_actions):
+    return ActionMatcher(taxonomy_actions, fuzzy_max_distance=2)
+
+
+def test_edit_distance():
+    assert edit_distance("simmer", "simmer", 2) == 0
+    assert edit_distance("simer", "simmer", 2) == 1
+    assert edit_distance("smimer", "simmer", 2) == 1  # transposition
+    assert edit_distance("julliene", "julienne", 2) == 2
+    assert edit_distance("boil", "simmer", 2) == 3  # gives up past the limit
+
+
+def test_index_finds_closest_word():
+    index = SymSpellIndex([("simmer", "S"), ("shimmy", "X")], known_words=())
+
+    assert index.lookup("simmer") == ("simmer", "S", 0)
+    assert index.lookup("simer") == ("simmer", "S", 1)
+    assert index.lookup("boil") is None
+
+
+def test_known_words_are_not_corrected():
+    index = SymSpellIndex([("dice", "D"), ("beat", "B")], known_words={"rice", "heat"})
+
+    assert index.lookup("rice") is None
+    assert index.lookup("heat") is None
+
+
+def test_short_words_get_fewer_edits():
+    index = SymSpellIndex([("stir", "S")], known_words=())
+
+    assert index.lookup("stirr") == ("stir", "S", 1)
+    assert index.lookup("sr") is None
+
+
+def test_matcher_corrects_misspelled_verbs(matcher):
+    for word, lemma in (("simer", "simmer"), ("julliene", "julienne"), ("carmelize", "caramelize")):
+        found = matcher.match_fuzzy(word)
+        assert found is not None, word
+        entry, distance = found
+        assert matcher.action_id(entry.action) == lemma
+        assert 1 <= distance <= 2
+
+
+def test_matcher_leaves_recipe_words_alone(matcher):
+    for word in ("rice", "heat", "skillet", "sauce", "onion"):
+        assert matcher.match_fuzzy(word) is None, word
+
+
+def test_fuzzy_matching_can_be_disabled(taxonomy_actions):
+    assert ActionMatcher(taxonomy_actions, fuzzy_max_distance=0).match_fuzzy("simer") is None
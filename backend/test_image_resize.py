@@ -0,0 +1,90 @@
+"""Test on-demand image resizing (GET /api/v1/images/{action_id})"""
+import asyncio
+import io
+import time
+
+import httpx
+import pytest
+from PIL import Image
+
+from app.api.v1 import images
+from app.images.cache import VariantCache
+
+
+@pytest.fixture
+def resize_calls(client, tmp_path, monkeypatch):
+    """Point the endpoint at a scratch source image and cache; returns the resize calls made"""
+    source = tmp_path / "dice.jpg"
+    Image.new("RGB", (1000, 700), (200, 120, 40)).save(source)
+    monkeypatch.setattr(images, "_source_path", lambda image_url: source)
+    monkeypatch.setattr(images, "_cache", VariantCache(str(tmp_path / "cache"), 10 * 1024 * 1024))
+
+    calls = []
+    resize_image = images.resize_image
+
+    def counting_resize(*args):
+        calls.append(args)
+        time.sleep(0.05)  # Let the other requests queue up on the lock
+        return resize_image(*args)
+
+    monkeypatch.setattr(images, "resize_image", counting_resize)
+    return calls
+
+
+def _get_concurrently(app, url: str, count: int):
+    async def fetch_all():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+            return await asyncio.gather(*(http.get(url) for _ in range(count)))
+    return asyncio.run(fetch_all())
+
+
+def test_concurrent_requests_share_one_resize(client, action_ids, resize_calls):
+    responses = _get_concurrently(client.app, f"/api/v1/images/{action_ids['dice']}?w=400", 5)
+
+    assert [response.status_code for response in responses] == [200] * 5
+    assert len(resize_calls) == 1
+    assert images._resize_locks == {}
+    with Image.open(io.BytesIO(responses[0].content)) as variant:
+        assert variant.width == 400
+
+
+def test_width_must_be_whitelisted(client, action_ids, resize_calls):
+    response = client.get(f"/api/v1/images/{action_ids['dice']}?w=401")
+
+    assert response.status_code == 400
+    assert resize_calls == []
+
+
+def test_pinned_entries_are_not_evicted(tmp_path):
+    cache = VariantCache(str(tmp_path), max_bytes=10)
+    write = lambda path: path.write_bytes(b"x" * 8)
+
+    first = cache.put("first", write, pin=True)
+    cache.put("second", write)
+    assert first.exists()  # Over budget while pinned
+
+    cache.unpin("first")
+    cache.put("third", write)
+    assert not first.exists()
+    assert not (tmp_path / "second").exists()
+    assert cache.total_bytes == 8
+
+
+def test_variant_evicted_at_capacity_is_still_served(client, action_ids, resize_calls, tmp_path, monkeypatch):
+    class CrowdedCache(VariantCache):
+        """Full cache where every put is immediately followed by another request's put"""
+        def put(self, key, write, pin=False):
+            path = super().put(key, write, pin)
+            super().put("other-request", lambda dest: dest.write_bytes(b"x" * 64))
+            return path
+
+    cache = CrowdedCache(str(tmp_path / "crowded"), max_bytes=64)
+    monkeypatch.setattr(images, "_cache", cache)
+
+    response = client.get(f"/api/v1/images/{action_ids['dice']}?w=400")
+
+    assert response.status_code == 200
+    with Image.open(io.BytesIO(response.content)) as variant:
+        assert variant.width == 400
+    assert cache._pins == {}
@@ -0,0 +1,55 @@
+"""Test SQL instrumentation hooks (app.instrumentation)"""
+from sqlalchemy import create_engine, text
+
+from app.instrumentation import count_queries, instrument_engine, instrument_pool
+from app.metrics import DB_POOL_CHECKOUT_WAIT
+
+
+def _checkouts() -> int:
+    return sum(DB_POOL_CHECKOUT_WAIT._default().counts)
+
+
+def _query(engine):
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+
+def test_pool_timing_survives_dispose(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/pool.db")
+    instrument_engine(engine)
+
+    before = _checkouts()
+    _query(engine)
+    assert _checkouts() == before + 1
+
+    engine.dispose()
+    assert engine.pool.__class__.__name__.startswith("Timed")
+    _query(engine)
+    assert _checkouts() == before + 2
+
+    # Instrumenting again does not time a checkout twice
+    instrument_pool(engine)
+    _query(engine)
+    assert _checkouts() == before + 3
+
+
+def test_query_counting_survives_dispose(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/queries.db")
+    instrument_engine(engine)
+    engine.dispose()
+
+    with count_queries() as counter:
+        _query(engine)
+
+    assert counter.count == 1
+
+
+def test_app_engine_is_timed_after_the_prefork_dispose(seeded_db):
+    from app.database import engine
+    from app.serve import release_connections
+
+    release_connections(engine)
+    before = _checkouts()
+    _query(engine)
+
+    assert _checkouts() == before + 1
@@ -0,0 +1,90 @@
+"""Test taxonomy hot reloads (app.nlp.live and POST /api/v1/admin/taxonomy/reload)"""
+import pytest
+
+from app.config import settings
+from app.instrumentation import assert_query_budget
+from app.models import TaxonomyVersion
+from app.nlp import ActionMatcher, live
+
+
+@pytest.fixture
+def taxonomy(taxonomy_actions):
+    """Mutable taxonomy the test LiveExtractor builds its matchers from"""
+    return list(taxonomy_actions)
+
+
+@pytest.fixture
+def live_extractor(spacy_model, taxonomy):
+    extractor = live.LiveExtractor("test", lambda use_artifact: ActionMatcher(taxonomy))
+    yield extractor
+    live._registry.remove(extractor)
+
+
+def test_reload_swaps_in_a_new_matcher(live_extractor, taxonomy):
+    before = live_extractor.get()
+    batcher = live_extractor.batcher
+    assert before.extract("Dice the onion.").ids() == ["dice"]
+
+    taxonomy[:] = [action for action in taxonomy if action["canonical_name"] != "dice"]
+    assert live_extractor.reload()
+
+    after = live_extractor.get()
+    assert after is not before
+    assert after.nlp is before.nlp
+    assert batcher.extractor is after
+    assert after.extract("Dice the onion.").ids() == []
+    # Calls that started on the old snapshot finish with its matcher
+    assert before.extract("Dice the onion.").ids() == ["dice"]
+
+
+def test_unloaded_extractor_is_not_reloaded(spacy_model, taxonomy):
+    extractor = live.LiveExtractor("unused", lambda use_artifact: ActionMatcher(taxonomy))
+    try:
+        assert not extractor.reload()
+        assert not extractor.loaded
+    finally:
+        live._registry.remove(extractor)
+
+
+def test_failed_reload_keeps_the_current_matcher(spacy_model, taxonomy):
+    builds = []
+
+    def build(use_artifact):
+        builds.append(use_artifact)
+        if len(builds) > 1:
+            raise RuntimeError("taxonomy unavailable")
+        return ActionMatcher(taxonomy)
+
+    extractor = live.LiveExtractor("failing", build)
+    try:
+        current = extractor.get()
+        assert "failing" not in live.reload_all()
+        assert extractor.get() is current
+        assert builds == [True, False]  # Reloads never use the artifact
+    finally:
+        live._registry.remove(extractor)
+
+
+def test_admin_reload_requires_the_token(client, monkeypatch):
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", None)
+    assert client.post("/api/v1/admin/taxonomy/reload").status_code == 403
+
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", "secret")
+    response = client.post("/api/v1/admin/taxonomy/reload", headers={"X-Admin-Token": "wrong"})
+    assert response.status_code == 403
+
+
+def test_admin_reload_bumps_the_version(client, db, monkeypatch):
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", "secret")
+    client.post("/api/v1/nlp/extract", json={"text": "Dice the onion"})  # Load the nlp extractor
+    version = TaxonomyVersion.current(db)
+
+    response = assert_query_budget(
+        client, "post", "/api/v1/admin/taxonomy/reload", headers={"X-Admin-Token": "secret"}
+    )
+
+    assert response.status_code == 200
+    assert response.json()["version"] == version + 1
+    assert "nlp" in response.json()["reloaded"]
+    db.expire_all()
+    assert TaxonomyVersion.current(db) == version + 1
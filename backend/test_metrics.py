@@ -0,0 +1,46 @@
+"""Test Prometheus rendering with per-worker labels (app.metrics)"""
+import pytest
+
+from app import metrics
+from app.metrics import Counter, Gauge, Histogram, MetricsRegistry, set_constant_labels
+
+
+@pytest.fixture
+def registry():
+    registry = MetricsRegistry()
+    registry.register(Counter("test_total", "Counter", ["path"])).labels("fast").inc()
+    registry.register(Histogram("test_seconds", "Histogram", buckets=(0.1,))).observe(0.05)
+    registry.register(Gauge("test_ratio", "Gauge", lambda: 0.5))
+    yield registry
+    set_constant_labels()
+
+
+def _samples(registry):
+    return [line for line in registry.render().splitlines() if not line.startswith("#")]
+
+
+def test_samples_without_constant_labels(registry):
+    assert _samples(registry) == [
+        'test_total{path="fast"} 1',
+        'test_seconds_bucket{le="0.1"} 1',
+        'test_seconds_bucket{le="+Inf"} 1',
+        "test_seconds_sum 0.05",
+        "test_seconds_count 1",
+        "test_ratio 0.5",
+    ]
+
+
+def test_worker_label_is_added_to_every_sample(registry):
+    set_constant_labels(worker="2")
+
+    assert _samples(registry) == [
+        'test_total{worker="2",path="fast"} 1',
+        'test_seconds_bucket{worker="2",le="0.1"} 1',
+        'test_seconds_bucket{worker="2",le="+Inf"} 1',
+        'test_seconds_sum{worker="2"} 0.05',
+        'test_seconds_count{worker="2"} 1',
+        'test_ratio{worker="2"} 0.5',
+    ]
+
+    set_constant_labels()
+    assert metrics._constant_labels == ()
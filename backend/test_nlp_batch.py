@@ -0,0 +1,44 @@
+"""Test the batch extraction endpoint (POST /api/v1/nlp/extract/batch)"""
+from app.config import settings
+
+URL = "/api/v1/nlp/extract/batch"
+
+TEXTS = [
+    "Dice the onion and simmer the sauce.",
+    "Preheat nothing, just wait.",
+    "Whisk the eggs, then fold in the flour.",
+    "Dice the onion and simmer the sauce.",
+]
+
+
+def test_results_match_single_extraction_in_order(client):
+    response = client.post(URL, json={"texts": TEXTS})
+
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [result["text"] for result in results] == TEXTS
+    for text, result in zip(TEXTS, results):
+        single = client.post("/api/v1/nlp/extract", json={"text": text}).json()
+        assert result["extracted_actions"] == single["extracted_actions"]
+
+
+def test_empty_batch_is_rejected(client):
+    assert client.post(URL, json={"texts": []}).status_code == 422
+    assert client.post(URL, json={"texts": [""]}).status_code == 422
+
+
+def test_too_many_texts_are_rejected(client):
+    texts = ["Dice the onion."] * (settings.NLP_BATCH_MAX_TEXTS + 1)
+
+    assert client.post(URL, json={"texts": texts}).status_code == 422
+
+
+def test_too_many_characters_are_rejected(client):
+    text = "Dice the onion. " * 120  # Under the per-text limit
+    count = settings.NLP_BATCH_MAX_CHARS // len(text) + 1
+
+    response = client.post(URL, json={"texts": [text] * count})
+
+    assert count <= settings.NLP_BATCH_MAX_TEXTS
+    assert response.status_code == 422
+    assert "characters" in response.text
@@ -0,0 +1,150 @@
+"""Test size-budget image optimization (app.images.optimize)"""
+import json
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from app.images.optimize import MANIFEST_NAME, optimize_directory, optimize_image, ssim
+
+
+def _photo(seed: int = 0, size=(240, 160)) -> Image.Image:
+    """Smooth gradients plus grain, roughly like a photo"""
+    width, height = size
+    y, x = np.mgrid[0:height, 0:width]
+    rng = np.random.default_rng(seed)
+    base = np.stack([x * 255 / width, y * 255 / height, (x + y) * 127 / (width + height) + 64], axis=-1)
+    noisy = base + rng.normal(0, 12, base.shape)
+    return Image.fromarray(np.clip(noisy, 0, 255).astype(np.uint8))
+
+
+@pytest.fixture
+def source(tmp_path):
+    """High-quality JPEG with EXIF, worth re-encoding"""
+    path = tmp_path / "dice.jpg"
+    exif = Image.Exif()
+    exif[0x010F] = "Camera maker"
+    _photo().save(path, "JPEG", quality=100, exif=exif)
+    return path
+
+
+def _grey(path) -> np.ndarray:
+    with Image.open(path) as img:
+        return np.asarray(img.convert("L"))
+
+
+def test_ssim():
+    image = np.asarray(_photo().convert("L"))
+    noisy = np.clip(image + np.random.default_rng(1).normal(0, 30, image.shape), 0, 255)
+
+    assert ssim(image, image) == pytest.approx(1.0)
+    assert 0 < ssim(image, noisy) < 0.9
+    assert ssim(image, noisy) < ssim(image, (image + noisy) / 2)
+
+
+def test_quality_floor_is_respected(source):
+    reference = _grey(source)
+    before = source.stat().st_size
+
+    result = optimize_image(str(source), min_ssim=0.95)
+
+    assert result["status"] == "optimized"
+    assert result["after"] == source.stat().st_size < before
+    assert result["ssim"] >= 0.95
+    assert ssim(reference, _grey(source)) >= 0.95
+    with Image.open(source) as img:
+        assert img.format == "JPEG"
+        assert img.info.get("progressive")
+        assert not img.getexif()
+
+
+def test_lowest_passing_quality_is_chosen(tmp_path):
+    paths = []
+    for floor in (0.9, 0.99):
+        path = tmp_path / f"{floor}.jpg"
+        _photo().save(path, "JPEG", quality=100)
+        paths.append((floor, path))
+
+    loose, strict = (optimize_image(str(path), min_ssim=floor) for floor, path in paths)
+
+    assert loose["quality"] < strict["quality"]
+    assert loose["after"] < strict["after"]
+
+
+def test_byte_budget_caps_the_quality(source):
+    budget = source.stat().st_size // 4
+
+    result = optimize_image(str(source), max_bytes=budget, min_ssim=0.999)
+
+    assert result["status"] == "optimized"
+    assert source.stat().st_size <= budget
+
+
+def test_files_that_would_barely_shrink_are_kept(source):
+    data = source.read_bytes()
+
+    result = optimize_image(str(source), min_ssim=0.95, min_savings=0.99)
+
+    assert result["status"] == "kept"
+    assert result["after"] == result["before"]
+    assert source.read_bytes() == data
+
+
+def test_exif_orientation_is_baked_in(tmp_path):
+    path = tmp_path / "rotated.jpg"
+    exif = Image.Exif()
+    exif[0x0112] = 6  # Orientation: rotate 90 degrees clockwise
+    _photo(size=(240, 160)).save(path, "JPEG", quality=100, exif=exif)
+
+    assert optimize_image(str(path), min_ssim=0.95)["status"] == "optimized"
+    with Image.open(path) as img:
+        assert img.size == (160, 240)
+        assert 0x0112 not in img.getexif()
+
+
+def test_unsupported_formats_are_skipped(tmp_path):
+    path = tmp_path / "dice.png"
+    _photo().save(path)
+    data = path.read_bytes()
+
+    assert optimize_image(str(path), min_ssim=0.95)["status"] == "skipped"
+    assert path.read_bytes() == data
+
+
+def test_directory_runs_are_idempotent(tmp_path):
+    for seed, name in enumerate(["dice.jpg", "whisk.webp"]):
+        _photo(seed).save(tmp_path / name, quality=100)
+    (tmp_path / "notes.txt").write_text("not an image")
+
+    first = optimize_directory(tmp_path, min_ssim=0.95, workers=1)
+
+    assert {name: result["status"] for name, result in first.items()} == {
+        "dice.jpg": "optimized", "whisk.webp": "optimized"
+    }
+    manifest = json.loads((tmp_path / MANIFEST_NAME).read_text())
+    assert sorted(manifest) == ["dice.jpg", "whisk.webp"]
+    assert manifest["dice.jpg"]["params"]["min_ssim"] == 0.95
+
+    sizes = {name: (tmp_path / name).stat().st_size for name in manifest}
+    second = optimize_directory(tmp_path, min_ssim=0.95, workers=1)
+    assert {name: result["status"] for name, result in second.items()} == {
+        "dice.jpg": "unchanged", "whisk.webp": "unchanged"
+    }
+    assert {name: (tmp_path / name).stat().st_size for name in manifest} == sizes
+
+    # Replaced files and changed settings are processed again
+    _photo(2).save(tmp_path / "dice.jpg", quality=100)
+    third = optimize_directory(tmp_path, min_ssim=0.95, workers=1)
+    assert third["dice.jpg"]["status"] == "optimized"
+    assert third["whisk.webp"]["status"] == "unchanged"
+    fourth = optimize_directory(tmp_path, min_ssim=0.9, workers=1)
+    assert {result["status"] for result in fourth.values()} <= {"optimized", "kept"}
+
+
+def test_failures_are_reported_and_not_recorded(tmp_path):
+    (tmp_path / "broken.jpg").write_bytes(b"not an image")
+
+    results = optimize_directory(tmp_path, min_ssim=0.95, workers=1)
+
+    assert results["broken.jpg"]["status"] == "failed"
+    assert json.loads((tmp_path / MANIFEST_NAME).read_text()) == {}
@@ -0,0 +1,98 @@
+"""Test packed step action storage (app.nlp.packed)"""
+from types import SimpleNamespace
+
+import pytest
+
+from app.config import settings
+from app.instrumentation import assert_query_budget
+from app.models import RecipeStep
+from app.nlp.packed import (
+    NO_SPAN, pack_actions, pack_extraction, step_action_refs, store_step_actions, unpack_actions
+)
+from app.nlp.results import ActionMatch, Extraction
+
+STEPS = ["Dice the onion and simmer the sauce.", "Whisk the eggs, then fold in the flour.", "Rest the dough."]
+
+
+def _step(**columns):
+    values = {"extracted_actions": None, "nlp_confidence": None, "packed_actions": None}
+    values.update(columns)
+    return SimpleNamespace(**values)
+
+
+def test_round_trip():
+    actions = [(3, 0.8512, 0, 4), (65535, 1.0, 21, 25), (7, 0.0, None, None)]
+
+    unpacked = unpack_actions(pack_actions(actions))
+
+    assert [tuple(action) for action in unpacked] == actions
+    assert len(pack_actions(actions)) == 2 + 7 * len(actions)
+
+
+def test_spans_that_do_not_fit_are_dropped():
+    unpacked = unpack_actions(pack_actions([(1, 0.5, NO_SPAN, NO_SPAN + 4), (2, 0.5, 10, 10 + 256)]))
+
+    assert [(action.start, action.end) for action in unpacked] == [(None, None), (None, None)]
+
+
+def test_invalid_input_is_rejected():
+    with pytest.raises(ValueError):
+        pack_actions([(65536, 0.5, 0, 4)])
+    with pytest.raises(ValueError):
+        pack_actions([(1, 0.5, 0, 4)] * 256)
+    with pytest.raises(ValueError):
+        unpack_actions(b"\x02\x00")
+
+
+def test_store_step_actions_packs_when_every_action_has_a_code():
+    extraction = Extraction(
+        (ActionMatch(0, "dice", 0.85, 0, 4), ActionMatch(1, "simmer", 0.6, 19, 25)),
+        ["id-dice", "id-simmer"],
+    )
+
+    packed = _step()
+    assert store_step_actions(packed, extraction, {"id-dice": 4, "id-simmer": 9})
+    assert (packed.extracted_actions, packed.nlp_confidence) == (None, None)
+    assert step_action_refs(packed) == [(4, 0.85), (9, 0.6)]
+    assert not store_step_actions(packed, extraction, {"id-dice": 4, "id-simmer": 9})
+
+    # An action without a code yet falls back to JSON
+    assert pack_extraction(extraction, {"id-dice": 4, "id-simmer": None}) is None
+    stored = _step()
+    assert store_step_actions(stored, extraction, {"id-dice": 4})
+    assert stored.packed_actions is None
+    assert step_action_refs(stored) == [("id-dice", 0.85), ("id-simmer", 0.6)]
+
+
+def _create(client, title: str) -> dict:
+    response = assert_query_budget(client, "post", "/api/v1/recipes/", json={
+        "title": title,
+        "steps": [{"step_number": number, "instruction_text": text} for number, text in enumerate(STEPS, 1)]
+    })
+    assert response.status_code == 201
+    return response.json()
+
+
+def _step_actions(recipe: dict) -> list:
+    return [step["extracted_actions"] for step in recipe["steps"]]
+
+
+def test_packed_recipes_read_back_like_json_ones(client, db, monkeypatch):
+    monkeypatch.setattr(settings, "NLP_PACK_STEP_ACTIONS", False)
+    json_recipe = _create(client, "JSON steps")
+    monkeypatch.setattr(settings, "NLP_PACK_STEP_ACTIONS", True)
+    packed_recipe = _create(client, "Packed steps")
+
+    rows = db.query(RecipeStep).filter(RecipeStep.recipe_id == packed_recipe["id"]).all()
+    assert rows and all(row.packed_actions is not None and row.extracted_actions is None for row in rows)
+
+    assert _step_actions(packed_recipe) == _step_actions(json_recipe)
+    for recipe in (json_recipe, packed_recipe):
+        fetched = assert_query_budget(client, "get", f"/api/v1/recipes/{recipe['id']}").json()
+        assert _step_actions(fetched) == _step_actions(json_recipe)
+
+    images = [
+        assert_query_budget(client, "get", f"/api/v1/recipes/{recipe['id']}/images").json()["images"]
+        for recipe in (json_recipe, packed_recipe)
+    ]
+    assert images[0] == images[1]
@@ -0,0 +1,118 @@
+"""Test image size and inline placeholder previews on cooking actions"""
+import base64
+import io
+import json
+
+import pytest
+from PIL import Image
+
+from app.images.derivatives import (
+    MANIFEST_NAME, PLACEHOLDER_WIDTH, load_image_index, render_placeholder, render_source
+)
+from app.models import CookingAction
+
+PREFIX = "data:image/webp;base64,"
+
+
+def _decode(placeholder: str) -> Image.Image:
+    assert placeholder.startswith(PREFIX)
+    return Image.open(io.BytesIO(base64.b64decode(placeholder[len(PREFIX):])))
+
+
+def test_placeholder_is_a_tiny_preview_with_the_source_aspect_ratio():
+    source = Image.new("RGB", (800, 400), (200, 120, 40))
+
+    placeholder = render_placeholder(source)
+
+    with _decode(placeholder) as preview:
+        assert preview.format == "WEBP"
+        assert preview.size == (PLACEHOLDER_WIDTH, 8)
+        red, green, blue = preview.convert("RGB").getpixel((8, 4))
+        assert abs(red - 200) < 16 and abs(green - 120) < 16 and abs(blue - 40) < 16
+    assert len(placeholder) < 300
+
+
+def test_placeholder_of_a_tall_narrow_image_is_at_least_one_pixel_high():
+    with _decode(render_placeholder(Image.new("RGB", (400, 10)))) as preview:
+        assert preview.size == (PLACEHOLDER_WIDTH, 1)
+
+
+def test_source_size_is_recorded_after_exif_rotation(tmp_path):
+    source = tmp_path / "dice.jpg"
+    exif = Image.Exif()
+    exif[0x0112] = 6  # Orientation: rotate 90 degrees clockwise
+    Image.new("RGB", (300, 200), "white").save(source, exif=exif)
+
+    rendered = render_source(str(source), str(tmp_path / "variants"), [160], ["jpeg"])
+
+    assert (rendered["width"], rendered["height"]) == (200, 300)
+    with _decode(rendered["placeholder"]) as preview:
+        assert preview.size == (PLACEHOLDER_WIDTH, 24)
+
+
+def test_image_index_tolerates_entries_without_size_or_placeholder(tmp_path):
+    manifest = {
+        "new.jpg": {"width": 500, "height": 250, "placeholder": PREFIX + "AAAA", "variants": []},
+        "old.jpg": {"variants": [{"width": 160, "height": 80, "format": "jpeg", "filename": "old-160w.jpg"}]},
+    }
+    (tmp_path / MANIFEST_NAME).write_text(json.dumps(manifest))
+
+    index = load_image_index(tmp_path, "/static/images/variants/")
+
+    assert index["new.jpg"] == {"variants": [], "width": 500, "height": 250, "placeholder": PREFIX + "AAAA"}
+    assert index["old.jpg"] == {
+        "variants": [{"url": "/static/images/variants/old-160w.jpg", "width": 160, "height": 80, "format": "jpeg"}],
+        "width": None,
+        "height": None,
+        "placeholder": None,
+    }
+
+
+def test_clear_image_derivatives():
+    action = CookingAction(
+        canonical_name="dice",
+        image_url="/static/images/techniques/dice.jpg",
+        thumbnail_url="/static/images/variants/dice-160w.jpg",
+        image_variants=[{"url": "/static/images/variants/dice-160w.jpg"}],
+        image_width=500,
+        image_height=250,
+        image_placeholder=PREFIX + "AAAA",
+    )
+
+    action.clear_image_derivatives()
+
+    assert action.image_url == "/static/images/techniques/dice.jpg"
+    assert (action.thumbnail_url, action.image_variants) == (None, None)
+    assert (action.image_width, action.image_height, action.image_placeholder) == (None, None, None)
+
+
+@pytest.fixture
+def dice_image(db):
+    """Give the dice action an image with size and placeholder, restored afterwards"""
+    action = db.query(CookingAction).filter(CookingAction.canonical_name == "dice").one()
+    columns = ("image_url", "image_width", "image_height", "image_placeholder")
+    saved = {column: getattr(action, column) for column in columns}
+    action.image_url = "/static/images/techniques/dice.jpg"
+    action.image_width, action.image_height = 500, 250
+    action.image_placeholder = PREFIX + "AAAA"
+    db.commit()
+    yield action
+    for column, value in saved.items():
+        setattr(action, column, value)
+    db.commit()
+
+
+def test_recipe_responses_carry_size_and_placeholder(client, dice_image):
+    created = client.post("/api/v1/recipes/", json={
+        "title": "Placeholder recipe",
+        "steps": [{"step_number": 1, "instruction_text": "Dice the onion."}]
+    }).json()
+    expected = {"image_width": 500, "image_height": 250, "image_placeholder": PREFIX + "AAAA"}
+
+    recipe = client.get(f"/api/v1/recipes/{created['id']}").json()
+    action = next(a for a in recipe["steps"][0]["extracted_actions"] if a["canonical_name"] == "dice")
+    assert {key: action[key] for key in expected} == expected
+
+    images = client.get(f"/api/v1/recipes/{created['id']}/images").json()["images"]
+    image = next(i for i in images if i["canonical_name"] == "dice")
+    assert {key: image[key] for key in expected} == expected
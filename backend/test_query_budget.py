@@ -0,0 +1,67 @@
+"""Test that endpoints stay within their declared query budgets (@query_budget)"""
+import pytest
+
+from app.instrumentation import QueryBudgetExceeded, assert_query_budget
+
+RECIPES = [
+    ["Dice the onion.", "Boil the pasta in salted water.", "Simmer the sauce for 10 minutes."],
+    ["Whisk the eggs.", "Fold in the flour.", "Bake for 25 minutes."],
+    ["Slice the tomatoes.", "Drizzle with olive oil and season."],
+]
+
+
+@pytest.fixture(scope="module")
+def recipe_ids(client):
+    """Create recipes with several steps each (budgets must not grow with them)"""
+    ids = []
+    for number, steps in enumerate(RECIPES):
+        response = assert_query_budget(client, "post", "/api/v1/recipes/", json={
+            "title": f"Budget recipe {number}",
+            "steps": [
+                {"step_number": step_number, "instruction_text": text}
+                for step_number, text in enumerate(steps, 1)
+            ]
+        })
+        assert response.status_code == 201
+        ids.append(response.json()["id"])
+    return ids
+
+
+def test_list_recipes(client, recipe_ids):
+    response = assert_query_budget(client, "get", "/api/v1/recipes/", params={"limit": 50})
+    assert response.status_code == 200
+    assert len(response.json()) >= len(RECIPES)
+
+
+def test_get_recipe(client, recipe_ids):
+    for recipe_id in recipe_ids:
+        response = assert_query_budget(client, "get", f"/api/v1/recipes/{recipe_id}")
+        assert response.status_code == 200
+
+
+def test_get_recipe_images(client, recipe_ids):
+    for recipe_id in recipe_ids:
+        response = assert_query_budget(client, "get", f"/api/v1/recipes/{recipe_id}/images")
+        assert response.status_code == 200
+
+
+def test_list_actions(client):
+    response = assert_query_budget(client, "get", "/api/v1/actions/")
+    assert response.status_code == 200
+
+
+def test_nlp_extract(client):
+    response = assert_query_budget(client, "post", "/api/v1/nlp/extract", json={"text": "Dice the onion"})
+    assert response.status_code == 200
+
+
+def test_nlp_extract_batch(client):
+    response = assert_query_budget(client, "post", "/api/v1/nlp/extract/batch", json={
+        "texts": ["Dice the onion", "Boil the pasta", "Whisk the eggs"]
+    })
+    assert response.status_code == 200
+
+
+def test_budget_overrun_fails(client, recipe_ids):
+    with pytest.raises(QueryBudgetExceeded):
+        assert_query_budget(client, "get", "/api/v1/recipes/", budget=0)
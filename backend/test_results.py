@@ -0,0 +1,63 @@
+"""Test that result records keep the extract_actions format (app.nlp.results)"""
+import uuid
+
+import pytest
+
+from app.nlp import ActionExtractor, ActionMatcher
+
+
+def _id(name: str) -> uuid.UUID:
+    return uuid.uuid5(uuid.NAMESPACE_URL, name)
+
+
+def _action(name: str, matched_text: str, confidence: float, start: int, end: int) -> dict:
+    return {
+        "action_id": str(_id(name)),
+        "matched_text": matched_text,
+        "confidence": confidence,
+        "position": {"start": start, "end": end},
+    }
+
+
+# Recorded from the dict-building extractor before result records; every
+# step takes the fast path, so the results don't depend on the model
+EXPECTED = {
+    "Dice the onion.": [_action("dice", "dice", 0.85, 0, 4)],
+    "Whisk the eggs, then fold in the flour.": [
+        _action("whisk", "whisk", 0.85, 0, 5),
+        _action("fold", "fold", 0.6, 21, 25),
+    ],
+    "Chop the parsley and garnish the soup.": [
+        _action("chop", "chop", 0.85, 0, 4),
+        _action("garnish", "garnish", 0.75, 21, 28),
+    ],
+    "Peel and mince the garlic.": [
+        _action("mince", "mince", 0.75, 9, 14),
+        _action("peel", "peel", 0.7, 0, 4),
+    ],
+    "Sauté the shallots in butter.": [_action("sauté", "sauté", 0.85, 0, 5)],
+    "Grate the cheese over the pasta.": [_action("grate", "grate", 0.85, 0, 5)],
+}
+
+
+@pytest.fixture(scope="module")
+def extractor(spacy_model, taxonomy_actions):
+    # UUID IDs, as when the matcher is built from the database
+    actions = [dict(action, id=_id(action["canonical_name"])) for action in taxonomy_actions]
+    return ActionExtractor(ActionMatcher(actions), spacy_model, cache_size=0)
+
+
+def test_dicts_match_the_previous_format(extractor):
+    for text, expected in EXPECTED.items():
+        assert extractor.extract_actions(text) == expected, text
+        assert extractor.extract(text).to_dicts() == expected, text
+
+
+def test_ids_and_confidences_agree_with_the_dicts(extractor):
+    extractions = extractor.extract_many(list(EXPECTED))
+
+    for extraction, expected in zip(extractions, EXPECTED.values()):
+        assert extraction.ids() == [action["action_id"] for action in expected]
+        assert extraction.confidences() == {action["action_id"]: action["confidence"] for action in expected}
+        assert all(isinstance(action_id, str) for action_id in extraction.ids())
+        assert all(type(match.confidence) is float for match in extraction.matches)
@@ -0,0 +1,79 @@
+"""Test confidence scoring of extracted actions (app.nlp.scoring)"""
+import pytest
+import spacy
+
+from app.nlp import ActionExtractor, ActionMatcher
+from app.nlp.scoring import DEFAULT_WEIGHTS, ConfidenceScorer, parse_weights
+
+
+@pytest.fixture(scope="module")
+def nlp():
+    """Tokenizer and sentencizer only: scoring without a dependency parse"""
+    pipeline = spacy.blank("en")
+    pipeline.add_pipe("sentencizer")
+    return pipeline
+
+
+def _score(scorer, nlp, text: str, index: int, edits: int = 0):
+    doc = nlp(text)
+    sent = doc[index].sent
+    return scorer.score(doc[index], sent, scorer.sentence_features(sent), parsed=False, edits=edits)
+
+
+def test_parse_weights_overrides_defaults():
+    weights = parse_weights("base:0.5, direct_object:0.3")
+
+    assert weights["base"] == 0.5
+    assert weights["direct_object"] == 0.3
+    assert weights["cooking_context"] == DEFAULT_WEIGHTS["cooking_context"]
+
+
+def test_parse_weights_rejects_unknown_feature():
+    with pytest.raises(ValueError):
+        parse_weights("base:0.5,colour:1")
+
+
+def test_score_adds_weighted_features(nlp):
+    scorer = ConfidenceScorer()
+
+    # base + direct object + sentence initial
+    confidence, contributions = _score(scorer, nlp, "Dice the onion.", 0)
+    assert confidence == pytest.approx(0.85)
+    assert contributions is None
+
+    # ...plus cooking context, clipped to 1
+    confidence, _ = _score(scorer, nlp, "Dice the onion in a bowl.", 0)
+    assert confidence == 1.0
+
+    # Not sentence initial, no object: base only
+    confidence, _ = _score(scorer, nlp, "Then simmer.", 1)
+    assert confidence == pytest.approx(0.6)
+
+
+def test_fuzzy_edits_lower_the_score(nlp):
+    scorer = ConfidenceScorer()
+
+    exact, _ = _score(scorer, nlp, "Dice the onion.", 0)
+    fuzzy, _ = _score(scorer, nlp, "Dice the onion.", 0, edits=2)
+
+    assert fuzzy == pytest.approx(exact - 0.2)
+
+
+def test_debug_reports_contributions(nlp):
+    scorer = ConfidenceScorer(debug=True)
+
+    confidence, contributions = _score(scorer, nlp, "Dice the onion.", 0)
+
+    assert set(contributions) == set(DEFAULT_WEIGHTS)
+    assert sum(contributions.values()) == pytest.approx(confidence)
+
+
+def test_threshold_drops_low_confidence_actions(spacy_model, taxonomy_actions):
+    matcher = ActionMatcher(taxonomy_actions)
+    text = "Dice the onion."
+
+    lenient = ActionExtractor(matcher, spacy_model, cache_size=0, scorer=ConfidenceScorer(threshold=0.5))
+    strict = ActionExtractor(matcher, spacy_model, cache_size=0, scorer=ConfidenceScorer(threshold=0.99))
+
+    assert [action["action_id"] for action in lenient.extract_actions(text)] == ["dice"]
+    assert strict.extract_actions(text) == []
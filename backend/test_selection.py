@@ -0,0 +1,76 @@
+"""Test image scoring and near-duplicate selection (app.images.selection)"""
+import numpy as np
+import pytest
+from PIL import Image
+
+from app.images.selection import (
+    ANALYSIS_SIZE, DUPLICATE_DISTANCE, TARGET_PIXELS, exposure_scores, hamming_distances,
+    perceptual_hashes, resolution_scores, select_best, sharpness_scores,
+)
+
+SIZE = ANALYSIS_SIZE
+
+
+def _texture(seed: int) -> np.ndarray:
+    """Smooth random texture in [0.2, 0.8]"""
+    coarse = np.random.default_rng(seed).random((8, 8))
+    image = np.kron(coarse, np.ones((SIZE // 8, SIZE // 8)))
+    return (0.2 + 0.6 * image).astype(np.float32)
+
+
+def test_perceptual_hash_ignores_brightness_but_not_content():
+    base = _texture(1)
+    hashes = perceptual_hashes(np.stack([base, base * 0.9 + 0.05, _texture(2)]))
+    distances = hamming_distances(hashes)
+
+    assert hashes.shape == (3, 64)
+    assert distances[0, 1] <= DUPLICATE_DISTANCE
+    assert distances[0, 2] > DUPLICATE_DISTANCE
+
+
+def test_hamming_distances():
+    hashes = np.array([[0, 0, 0, 0], [1, 0, 1, 0], [1, 1, 1, 1]], dtype=bool)
+
+    assert hamming_distances(hashes).tolist() == [[0, 2, 4], [2, 0, 2], [4, 2, 0]]
+
+
+def test_sharpness_and_exposure_scores():
+    flat = np.full((SIZE, SIZE), 0.5, dtype=np.float32)
+    checkers = (np.indices((SIZE, SIZE)).sum(axis=0) % 2).astype(np.float32) * 0.5 + 0.25
+    black = np.zeros((SIZE, SIZE), dtype=np.float32)
+
+    sharpness = sharpness_scores(np.stack([flat, _texture(1), checkers]))
+    exposure = exposure_scores(np.stack([flat, black, np.ones_like(flat)]))
+
+    assert sharpness[0] == 0 and sharpness[0] < sharpness[1] < sharpness[2]
+    assert exposure.tolist() == pytest.approx([1.0, 0.0, 0.0])
+
+
+def test_resolution_scores_are_capped():
+    scores = resolution_scores(np.array([[800, 500], [1600, 1000], [4000, 3000]]))
+
+    assert scores.tolist() == pytest.approx([400000 / TARGET_PIXELS, 1.0, 1.0])
+
+
+def _save(path, pixels: np.ndarray):
+    Image.fromarray((pixels * 255).astype(np.uint8)).save(path)
+    return path
+
+
+def test_select_best_skips_duplicates_and_flags_fallbacks(tmp_path):
+    dice = _save(tmp_path / "dice.png", _texture(1))
+    dice_blurry = _save(tmp_path / "dice-2.png", np.full((SIZE, SIZE), 0.5, dtype=np.float32))
+    chop_copy = _save(tmp_path / "chop.png", _texture(1) * 0.95)  # Same photo as dice
+    chop = _save(tmp_path / "chop-2.png", _texture(2) * 0.9)
+    mince_copy = _save(tmp_path / "mince.png", _texture(1) * 0.9)
+
+    chosen = select_best(
+        ["dice", "dice", "chop", "chop", "mince"],
+        [dice, dice_blurry, chop_copy, chop, mince_copy],
+    )
+
+    assert chosen["dice"]["path"] == dice and not chosen["dice"]["fallback"]
+    assert chosen["chop"]["path"] == chop and chosen["chop"]["duplicates"] == [2]
+    # Nothing but a duplicate: still reported, flagged
+    assert chosen["mince"]["index"] == 4 and chosen["mince"]["fallback"]
+    assert chosen["mince"]["duplicates"] == []
@@ -0,0 +1,127 @@
+"""Test technique sprite sheets (app.images.sprites) and the recipe images endpoint"""
+import pytest
+from PIL import Image
+
+from app.api.v1 import recipes
+from app.images.assets import ASSET_NAME, ASSETS_URL
+from app.images.sprites import build_atlas, load_atlas, save_atlas
+from app.models import CookingAction
+
+COLOURS = ["red", "green", "blue", "yellow", "purple"]
+
+
+@pytest.fixture
+def tiles(tmp_path):
+    """One flat-coloured source per tile, of varying sizes and aspect ratios"""
+    tiles = []
+    for index, colour in enumerate(COLOURS):
+        path = tmp_path / f"{colour}.png"
+        Image.new("RGB", (40 + 10 * index, 30 + 20 * index), colour).save(path)
+        tiles.append((colour, path))
+    return tiles
+
+
+def test_tiles_are_packed_row_by_row(tiles, tmp_path):
+    assets_dir = tmp_path / "assets"
+
+    atlas = build_atlas(tiles, assets_dir, formats=["webp", "jpeg"], tile_size=(20, 10), columns=2, max_rows=2)
+
+    assert (atlas["tile_width"], atlas["tile_height"]) == (20, 10)
+    assert atlas["tiles"] == {
+        "red": {"sheet": 0, "x": 0, "y": 0},
+        "green": {"sheet": 0, "x": 20, "y": 0},
+        "blue": {"sheet": 0, "x": 0, "y": 10},
+        "yellow": {"sheet": 0, "x": 20, "y": 10},
+        "purple": {"sheet": 1, "x": 0, "y": 0},
+    }
+    # The last sheet is only as large as its tiles need
+    assert [(sheet["width"], sheet["height"]) for sheet in atlas["sheets"]] == [(40, 20), (20, 10)]
+
+    sheet = atlas["sheets"][0]
+    with Image.open(assets_dir / sheet["urls"]["jpeg"].rsplit("/", 1)[-1]) as img:
+        assert img.size == (40, 20)
+        # Every tile is filled (cover crop) with its own image
+        for colour, tile in atlas["tiles"].items():
+            if tile["sheet"] == 0:
+                pixel = img.convert("RGB").getpixel((tile["x"] + 10, tile["y"] + 5))
+                expected = Image.new("RGB", (1, 1), colour).getpixel((0, 0))
+                assert all(abs(a - b) < 40 for a, b in zip(pixel, expected)), colour
+
+
+def test_sheets_have_content_hashed_names(tiles, tmp_path):
+    assets_dir = tmp_path / "assets"
+
+    atlas = build_atlas(tiles, assets_dir, formats=["webp", "jpeg"], tile_size=(20, 10), columns=2, max_rows=2)
+
+    urls = [url for sheet in atlas["sheets"] for url in sheet["urls"].values()]
+    assert len(set(urls)) == 4
+    for url in urls:
+        directory, filename = url.rsplit("/", 1)
+        assert directory == ASSETS_URL
+        assert ASSET_NAME.fullmatch(filename)
+        assert (assets_dir / filename).is_file()
+    assert sorted(path.name for path in assets_dir.iterdir()) == sorted(url.rsplit("/", 1)[-1] for url in urls)
+
+    # Same input, same names; different input, new names
+    assert build_atlas(tiles, assets_dir, tile_size=(20, 10), columns=2, max_rows=2) == atlas
+    reordered = build_atlas(tiles[::-1], assets_dir, tile_size=(20, 10), columns=2, max_rows=2)
+    assert reordered["sheets"][0]["urls"] != atlas["sheets"][0]["urls"]
+
+
+def test_save_and_load(tiles, tmp_path):
+    path = tmp_path / "sprites" / "atlas.json"
+    assert load_atlas(path) is None
+
+    atlas = build_atlas(tiles, tmp_path / "assets", tile_size=(20, 10))
+    save_atlas(atlas, path)
+
+    assert load_atlas(path) == atlas
+    assert [p.name for p in path.parent.iterdir()] == ["atlas.json"]
+
+
+@pytest.fixture
+def dice_atlas(db, monkeypatch):
+    """Give the dice action an image and serve an atlas containing it"""
+    action = db.query(CookingAction).filter(CookingAction.canonical_name == "dice").one()
+    image_url = action.image_url
+    action.image_url = "/static/images/techniques/dice.jpg"
+    db.commit()
+    atlas = {
+        "tile_width": 160,
+        "tile_height": 120,
+        "sheets": [{"width": 320, "height": 120, "urls": {"webp": f"{ASSETS_URL}/sheet.webp"}}],
+        "tiles": {"dice": {"sheet": 0, "x": 160, "y": 0}},
+    }
+    monkeypatch.setattr(recipes, "_atlas", atlas)
+    yield atlas
+    action.image_url = image_url
+    db.commit()
+
+
+def _create(client, steps) -> str:
+    response = client.post("/api/v1/recipes/", json={
+        "title": "Sprite recipe",
+        "steps": [{"step_number": number, "instruction_text": text} for number, text in enumerate(steps, 1)]
+    })
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+def test_recipe_images_lists_each_image_once_with_its_tile(client, action_ids, dice_atlas):
+    recipe_id = _create(client, ["Dice the onion.", "Whisk the eggs.", "Dice the carrots."])
+
+    response = client.get(f"/api/v1/recipes/{recipe_id}/images")
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["recipe_id"] == recipe_id
+    assert body["sprite_sheets"] == dice_atlas["sheets"]
+    dice = [image for image in body["images"] if image["canonical_name"] == "dice"]
+    assert len(dice) == 1
+    assert dice[0]["action_id"] == action_ids["dice"]
+    assert dice[0]["step_numbers"] == [1, 3]
+    assert dice[0]["sprite"] == {"sheet": 0, "x": 160, "y": 0, "width": 160, "height": 120}
+
+
+def test_recipe_images_of_a_missing_recipe(client):
+    assert client.get("/api/v1/recipes/missing/images").status_code == 404
@@ -0,0 +1,48 @@
+"""Test Cache-Control on fingerprinted static mounts (ImmutableStaticFiles)"""
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.images.assets import (
+    ASSET_NAME, ASSETS_URL, IMMUTABLE_CACHE_CONTROL, AssetPublisher, ImmutableStaticFiles
+)
+from app.images.store import BLOB_NAME, STORE_URL, ImageStore
+
+
+def _client(mounts) -> TestClient:
+    app = FastAPI()
+    for url, static_files in mounts:
+        app.mount(url, static_files)
+    return TestClient(app)
+
+
+def test_store_blobs_are_immutable_but_the_manifest_is_not(tmp_path):
+    source = tmp_path / "dice-pexels.jpg"
+    source.write_bytes(b"jpeg bytes")
+    store = ImageStore(str(tmp_path / "store"))
+    digest = store.add(source, "dice", "pexels")
+    store.save()
+    client = _client([(STORE_URL, ImmutableStaticFiles(directory=store.store_dir, fingerprinted=BLOB_NAME))])
+
+    blob = client.get(store.blob_url(digest))
+    manifest = client.get(f"{STORE_URL}/manifest.json")
+
+    assert blob.status_code == 200 and blob.headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+    assert manifest.status_code == 200 and manifest.headers["cache-control"] == "no-cache"
+    assert "etag" in manifest.headers
+
+
+def test_published_assets_are_immutable_but_the_manifest_is_not(tmp_path):
+    static_dir = tmp_path / "static"
+    (static_dir / "images" / "techniques").mkdir(parents=True)
+    (static_dir / "images" / "techniques" / "dice-pexels.jpg").write_bytes(b"jpeg bytes")
+    publisher = AssetPublisher(str(static_dir))
+    url = publisher.publish("/static/images/techniques/dice-pexels.jpg")
+    publisher.save()
+    client = _client([(ASSETS_URL, ImmutableStaticFiles(directory=publisher.assets_dir, fingerprinted=ASSET_NAME))])
+
+    asset = client.get(url)
+    manifest = client.get(f"{ASSETS_URL}/manifest.json")
+
+    assert asset.status_code == 200 and asset.headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+    assert manifest.status_code == 200 and manifest.headers["cache-control"] == "no-cache"
+    assert ASSET_NAME.fullmatch("technique-sprites.0123456789abcdef.webp")
@@ -19,6 +19,23 @@ export default function TechniqueImage({ action }: TechniqueImageProps) {
   const relativeUrl = action.thumbnail_url || action.image_url;
   const imageUrl = relativeUrl ? `${BACKEND_BASE}${relativeUrl}` : undefined;
 
+  // Let the browser pick a resized variant for the card width
+  const variants = action.image_variants || [];
+  const buildSrcSet = (format: string) =>
+    variants
+      .filter((v) => v.format === format)
+      .map((v) => `${BACKEND_BASE}${v.url} ${v.width}w`)
+      .join(', ');
+  const webpSrcSet = buildSrcSet('webp');
+  const jpegSrcSet = buildSrcSet('jpeg');
+  const sizes = '(min-width: 768px) 256px, 100vw';
+
+  // Intrinsic size and inline preview let the card lay out before the image arrives
+  const dimensions =
+    action.image_width && action.image_height
+      ? { width: action.image_width, height: action.image_height }
+      : {};
+
   if (!hasImage || imageError) {
     return (
       <div className="technique-placeholder bg-gray-100 border-2 border-dashed border-gray-300 rounded-md p-4 text-center">
@@ -37,22 +54,36 @@ export default function TechniqueImage({ action }: TechniqueImageProps) {
 
   return (
     <figure className="technique-image relative group">
-      {/* Loading skeleton */}
+      {/* Blurred preview, or a skeleton if there is none */}
       {!imageLoaded && (
-        <div className="absolute inset-0 bg-gray-200 animate-pulse rounded-md" />
+        action.image_placeholder ? (
+          <div
+            className="absolute inset-0 h-32 rounded-md bg-cover bg-center blur-sm"
+            style={{ backgroundImage: `url(${action.image_placeholder})` }}
+            aria-hidden="true"
+          />
+        ) : (
+          <div className="absolute inset-0 bg-gray-200 animate-pulse rounded-md" />
+        )
       )}
 
       {/* Image */}
-      <img
-        src={imageUrl}
-        alt={`${action.canonical_name} cooking technique demonstration`}
-        className={`w-full h-32 object-cover rounded-md transition-opacity duration-200 ${
-          imageLoaded ? 'opacity-100' : 'opacity-0'
-        }`}
-        onLoad={() => setImageLoaded(true)}
-        onError={() => setImageError(true)}
-        loading="lazy"
-      />
+      <picture>
+        {webpSrcSet && <source type="image/webp" srcSet={webpSrcSet} sizes={sizes} />}
+        <img
+          src={imageUrl}
+          srcSet={jpegSrcSet || undefined}
+          sizes={jpegSrcSet ? sizes : undefined}
+          {...dimensions}
+          alt={`${action.canonical_name} cooking technique demonstration`}
+          className={`w-full h-32 object-cover rounded-md transition-opacity duration-200 ${
+            imageLoaded ? 'opacity-100' : 'opacity-0'
+          }`}
+          onLoad={() => setImageLoaded(true)}
+          onError={() => setImageError(true)}
+          loading="lazy"
+        />
+      </picture>
 
       {/* Overlay with technique name */}
       <figcaption className="absolute bottom-0 left-0 right-0 bg-gradient-to-t from-black/70 to-transparent p-2 text-white text-sm font-medium capitalize">
@@ -2,7 +2,7 @@
  * Recipe API service
  */
 import { apiClient } from './api';
-import type { Recipe, RecipeCreateRequest } from '../types/recipe';
+import type { Recipe, RecipeCreateRequest, RecipeImages } from '../types/recipe';
 
 const recipeService = {
   async getRecipe(id: string): Promise<Recipe> {
@@ -10,6 +10,11 @@ const recipeService = {
     return data;
   },
 
+  async getRecipeImages(id: string): Promise<RecipeImages> {
+    const { data } = await apiClient.get<RecipeImages>(`/recipes/${id}/images`);
+    return data;
+  },
+
   async listRecipes(skip = 0, limit = 100): Promise<Recipe[]> {
     const { data } = await apiClient.get<Recipe[]>('/recipes/', {
       params: { skip, limit },
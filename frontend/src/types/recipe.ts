@@ -18,6 +18,13 @@ export interface RecipeStep {
   extracted_actions: ExtractedAction[];
 }
 
+export interface ImageVariant {
+  url: string;
+  width: number;
+  height: number;
+  format: 'webp' | 'jpeg';
+}
+
 export interface ExtractedAction {
   id: string;
   canonical_name: string;
@@ -25,11 +32,48 @@ export interface ExtractedAction {
   category: string;
   image_url?: string;
   thumbnail_url?: string;
+  image_variants?: ImageVariant[];
+  image_width?: number;
+  image_height?: number;
+  image_placeholder?: string; // data: URI preview shown while loading
   attribution?: string;
   license?: string;
   confidence: number;
 }
 
+export interface SpriteTile {
+  sheet: number;
+  x: number;
+  y: number;
+  width: number;
+  height: number;
+}
+
+export interface SpriteSheet {
+  width: number;
+  height: number;
+  urls: Partial<Record<'webp' | 'jpeg', string>>;
+}
+
+export interface RecipeImage {
+  action_id: string;
+  canonical_name: string;
+  image_url?: string;
+  thumbnail_url?: string;
+  image_variants: ImageVariant[];
+  image_width?: number;
+  image_height?: number;
+  image_placeholder?: string;
+  step_numbers: number[];
+  sprite?: SpriteTile;
+}
+
+export interface RecipeImages {
+  recipe_id: string;
+  images: RecipeImage[];
+  sprite_sheets: SpriteSheet[];
+}
+
 export interface RecipeCreateRequest {
   title: string;
   description?: string;